@@ -13,7 +13,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 try:
-    from src.app import main as app_main
+    from src.history import run_stats_command
     from src import __version__, __description__
     
 except ImportError as e:
@@ -41,15 +41,36 @@ def main():
             elif sys.argv[1] in ['--help', '-h']:
                 show_version_info()
                 print("Uso: python main.py [opções]")
+                print("     python main.py stats [--db ARQUIVO] [--since HORAS]")
+                print("     python main.py simulate [--duration S] [--interval S ...]")
                 print()
                 print("Opções:")
                 print("  -v, --version    Mostra a versão do programa")
                 print("  -h, --help       Mostra esta mensagem de ajuda")
                 print()
+                print("Comandos:")
+                print("  stats            Agregados do histórico de sessões (cliques por hora,")
+                print("                   percentis de latência e sequências sem botão)")
+                print("  simulate         Tela simulada sem servidor X: latência do aparecimento")
+                print("                   ao clique, botões perdidos e cliques errados")
+                print()
                 print("Para usar o programa, execute sem argumentos para abrir a interface gráfica.")
                 return
+            elif sys.argv[1] == 'stats':
+                sys.exit(run_stats_command(sys.argv[2:]))
+            elif sys.argv[1] == 'simulate':
+                # Sem a interface: a simulação roda sem servidor X
+                from src.simulation import run_simulate_command
+                sys.exit(run_simulate_command(sys.argv[2:]))
         
         # Executar aplicação principal
+        try:
+            from src.app import main as app_main
+        except ImportError as e:
+            print(f"❌ Erro ao importar módulos: {e}")
+            print("💡 Certifique-se de que todas as dependências estão instaladas:")
+            print("   pip install -r requirements.txt")
+            sys.exit(1)
         app_main()
         
     except KeyboardInterrupt:
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Detecção de Botões
+Mede o tempo do pipeline de detecção em frames sintéticos para diferentes
+resoluções e modos, verificando que todos os modos retornam o mesmo resultado
+
+Uso:
+    python scripts/benchmark_detection.py [--resolution 3840x2160] [--frames 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Adicionar src ao path para importações
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+import detector as detector_module  # noqa: E402
+from detector import BlueButtonDetector  # noqa: E402
+from resolution_adapter import get_resolution_adapter  # noqa: E402
+
+
+def make_frame(
+    rng: np.random.Generator, width: int, height: int, buttons: int = 3, decoys: int = 40
+) -> np.ndarray:
+    """
+    Gera um frame BGR sintético com botões azuis e regiões coloridas aleatórias
+
+    Args:
+        rng: Gerador de números aleatórios
+        width, height: Dimensões do frame
+        buttons: Número de botões azuis com formato típico
+        decoys: Número de retângulos aleatórios (azuis ou não)
+
+    Returns:
+        Imagem BGR
+    """
+    frame = np.full((height, width, 3), 235, dtype=np.uint8)
+    hsv_colors = [(115, 200, 220), (108, 120, 200), (30, 200, 200), (0, 0, 120)]
+    colors = [cv2.cvtColor(np.uint8([[c]]), cv2.COLOR_HSV2BGR)[0, 0] for c in hsv_colors]
+
+    scale = width / 1920
+    for _ in range(decoys):
+        w = int(rng.integers(5, 600 * scale))
+        h = int(rng.integers(5, 200 * scale))
+        x = int(rng.integers(0, width - w))
+        y = int(rng.integers(0, height - h))
+        frame[y : y + h, x : x + w] = colors[int(rng.integers(0, len(colors)))]
+
+    for _ in range(buttons):
+        w = int(rng.integers(80, 250) * scale)
+        h = int(rng.integers(30, 60) * scale)
+        x = int(rng.integers(width * 0.1, width * 0.9 - w))
+        y = int(rng.integers(height * 0.1, height * 0.9 - h))
+        frame[y : y + h, x : x + w] = colors[0]
+
+    return frame
+
+
+def make_sequence(
+    rng: np.random.Generator, width: int, height: int, count: int
+) -> List[np.ndarray]:
+    """
+    Gera uma sequência de frames em que cada frame altera uma pequena região
+
+    Simula telas reais, onde entre dois ciclos normalmente muda só uma barra
+    de progresso ou uma linha de texto.
+
+    Args:
+        rng: Gerador de números aleatórios
+        width, height: Dimensões dos frames
+        count: Número de frames
+
+    Returns:
+        Lista de imagens BGR
+    """
+    frames = [make_frame(rng, width, height)]
+    for _ in range(count - 1):
+        frame = frames[-1].copy()
+        w = int(rng.integers(20, width // 8))
+        h = int(rng.integers(10, height // 20))
+        x = int(rng.integers(0, width - w))
+        y = int(rng.integers(0, height - h))
+        frame[y : y + h, x : x + w] = rng.integers(0, 256, 3, dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+
+def run_mode(
+    name: str,
+    setup: Callable[[], None],
+    frames: List[np.ndarray],
+    config: Dict[str, Any],
+) -> Tuple[float, List[Any]]:
+    """
+    Executa a detecção em todos os frames com um modo configurado
+
+    Args:
+        name: Nome do modo (apenas para exibição)
+        setup: Função que configura o modo antes da execução
+        frames: Frames sintéticos
+        config: Configuração adaptada para a resolução dos frames
+
+    Returns:
+        Tupla (tempo médio por frame em segundos, resultados)
+    """
+    setup()
+    detector = BlueButtonDetector()
+
+    # Aquecimento (pool de threads, caches do OpenCV)
+    detector.detect_in_image(frames[0], config)
+
+    results = []
+    start = time.perf_counter()
+    for frame in frames:
+        results.append(detector.detect_in_image(frame, config))
+    elapsed = (time.perf_counter() - start) / len(frames)
+
+    detector.shutdown()
+    print(f"  {name:<14} {elapsed * 1000:8.2f} ms/frame")
+    return elapsed, results
+
+
+def main() -> None:
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark da detecção de botões")
+    parser.add_argument("--resolution", default="3840x2160", help="Resolução dos frames (WxH)")
+    parser.add_argument("--frames", type=int, default=20, help="Número de frames sintéticos")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos frames sintéticos")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+    rng = np.random.default_rng(args.seed)
+    frames = make_sequence(rng, width, height, args.frames)
+    config = get_resolution_adapter().get_config_for_resolution(width, height)
+
+    tiling = detector_module.TILING_CONFIG
+
+    def single_pass() -> None:
+        tiling["enabled"] = False
+        tiling["incremental"] = False
+
+    def tiled() -> None:
+        tiling["enabled"] = True
+        tiling["incremental"] = False
+        tiling["min_frame_pixels"] = 0
+        tiling["max_workers"] = max(2, os.cpu_count() or 1)
+
+    def incremental() -> None:
+        tiling["enabled"] = False
+        tiling["incremental"] = True
+
+    modes = [("single-pass", single_pass), ("tiled", tiled), ("incremental", incremental)]
+
+    print(f"Benchmark: {args.frames} frames {width}x{height}, {os.cpu_count()} CPUs")
+    baseline_time, baseline_results = None, None
+    for name, setup in modes:
+        elapsed, results = run_mode(name, setup, frames, config)
+        if baseline_results is None:
+            baseline_time, baseline_results = elapsed, results
+            continue
+
+        status = "OK" if results == baseline_results else "DIFERENTE"
+        print(f"  {'':<14} speedup {baseline_time / elapsed:5.2f}x, resultados: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,12 +21,14 @@ except ImportError:
     tk = mock.MagicMock()
 
 try:
-    from .config import MESSAGES
+    from .config import MESSAGES, PERFORMANCE_CONFIG
     from .monitor import MonitoringManager
+    from .tracing import get_tracer
     from .ui import ModernUI
 except ImportError:
-    from config import MESSAGES
+    from config import MESSAGES, PERFORMANCE_CONFIG
     from monitor import MonitoringManager
+    from tracing import get_tracer
     from ui import ModernUI
 
 
@@ -49,8 +51,16 @@ class AutoClickerPro:
         # Configurar callbacks
         self._setup_callbacks()
 
-        # Timer para atualização de tempo
-        self._schedule_time_update()
+        # Endpoint de métricas (se ativo em METRICS_ENDPOINT)
+        self.monitor.start_metrics_server()
+
+        # Exportação do trace também por sinal (ex.: kill -USR1 <pid>)
+        tracer = get_tracer()
+        if tracer:
+            tracer.install_signal_handler()
+
+        # Timer único de atualização da UI (estado do monitor e tempo de sessão)
+        self._schedule_ui_poll()
 
     def _setup_callbacks(self) -> None:
         """Configura todos os callbacks entre componentes"""
@@ -59,6 +69,7 @@ class AutoClickerPro:
             start_callback=self._on_start_monitoring,
             stop_callback=self._on_stop_monitoring,
             interval_callback=self._on_interval_changed,
+            trace_export_callback=self._on_export_trace,
         )
 
         # Callbacks do monitor para a UI
@@ -97,6 +108,12 @@ class AutoClickerPro:
         """Callback para mudança de intervalo"""
         self.monitor.update_interval(interval)
 
+    def _on_export_trace(self) -> None:
+        """Callback para exportação do trace dos ciclos"""
+        tracer = get_tracer()
+        if tracer:
+            tracer.export()
+
     def _on_status_update(self, status: str, color: str) -> None:
         """Callback para atualização de status"""
         self.ui.update_status(status, color)
@@ -113,12 +130,24 @@ class AutoClickerPro:
         if "avg_detection_time" in stats:
             self.ui.update_avg_time(stats["avg_detection_time"])
 
+        if "cpu_budget" in stats:
+            self.ui.update_cpu_usage(stats["cpu_usage"], stats["cpu_budget"])
+
+        latency = stats.get("appear_to_click_latency")
+        if latency and latency["count"]:
+            self.ui.update_appear_to_click(latency["p50"], latency["p90"])
+
+        if stats.get("click_confirmation_rate") is not None:
+            self.ui.update_click_confirmation(stats["click_confirmation_rate"])
+
     def _schedule_ui_update(self, callback) -> None:
         """Agenda atualização na thread da UI"""
         self.root.after(0, callback)
 
-    def _schedule_time_update(self) -> None:
-        """Agenda próxima atualização do tempo de sessão"""
+    def _schedule_ui_poll(self) -> None:
+        """Entrega o estado publicado pelo monitor e agenda a próxima atualização"""
+        self.monitor.flush_ui_updates()
+
         if self.monitor.is_monitoring:
             session_time = self.monitor.get_session_time()
             minutes = int(session_time // 60)
@@ -127,13 +156,14 @@ class AutoClickerPro:
             self.ui.update_session_time(time_str)
 
         # Agendar próxima atualização
-        self.root.after(1000, self._schedule_time_update)
+        self.root.after(PERFORMANCE_CONFIG["ui_update_interval"], self._schedule_ui_poll)
 
     def _on_closing(self) -> None:
         """Callback para fechamento da aplicação"""
         # Parar monitoramento se estiver ativo
         if self.monitor.is_monitoring:
             self.monitor.stop_monitoring()
+        self.monitor.stop_metrics_server()
 
         # Fechar janela
         self.root.destroy()
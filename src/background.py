@@ -0,0 +1,304 @@
+"""
+Modelo de Fundo para Detecção
+Módulo responsável por aprender regiões coloridas que nunca mudam nem são
+clicadas (barras de tarefas, cabeçalhos, links) e removê-las das máscaras de cor
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Conditional imports for CI/test environments
+try:
+    if os.environ.get("CI_ENVIRONMENT") or os.environ.get("HEADLESS_MODE"):
+        # Mock GUI libraries in CI/test environments
+        import unittest.mock as mock
+
+        cv2 = mock.MagicMock()
+    else:
+        import cv2
+except ImportError:
+    # Fallback mocking if imports fail
+    import unittest.mock as mock
+
+    cv2 = mock.MagicMock()
+
+import numpy as np
+
+try:
+    from .config import BACKGROUND_MODEL
+    from .logs import logger
+except ImportError:
+    from config import BACKGROUND_MODEL
+    from logs import logger
+
+
+class BackgroundModel:
+    """
+    Modelo de fundo por células da máscara de cor de cada perfil
+
+    Uma célula vira fundo quando sua contagem de pixels da cor fica idêntica
+    por learn_frames frames seguidos. Qualquer mudança reduz a contagem pela
+    metade (abaixo do limiar), então a célula volta a ser analisada no mesmo
+    frame em que muda. Células de botões clicados nunca viram fundo.
+
+    O governador de CPU alterna a escala da detecção, então o modelo guarda um
+    estado por forma de frame (as max_shapes usadas mais recentemente) em vez
+    de descartar o aprendizado a cada troca.
+    """
+
+    def __init__(
+        self,
+        cell_size: Optional[int] = None,
+        learn_frames: Optional[int] = None,
+        max_shapes: Optional[int] = None,
+    ):
+        """
+        Inicializa o modelo
+
+        Args:
+            cell_size: Lado da célula em pixels (padrão: BACKGROUND_MODEL)
+            learn_frames: Frames idênticos até a célula virar fundo
+            max_shapes: Formas de frame (escalas) mantidas
+        """
+        self.cell_size = cell_size or BACKGROUND_MODEL["cell_size"]
+        self.learn_frames = learn_frames or BACKGROUND_MODEL["learn_frames"]
+        self.max_shapes = max_shapes or BACKGROUND_MODEL["max_shapes"]
+
+        # Estado de cada forma de frame, do usado há mais tempo ao atual
+        self._states: "OrderedDict[Tuple[int, int], Dict[str, Any]]" = OrderedDict()
+
+        # Estado da forma atual
+        self.frame_shape: Optional[Tuple[int, int]] = None
+        self.protected: Optional[np.ndarray] = None
+        self._layers: Dict[str, Dict[str, np.ndarray]] = {}
+        self._keep_masks: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.background_cells: Dict[str, int] = {}
+
+    def apply(self, profile: str, mask: np.ndarray) -> np.ndarray:
+        """
+        Atualiza o modelo com a máscara do frame e remove as células de fundo
+
+        Args:
+            profile: Nome do perfil de detecção
+            mask: Máscara de cor do frame inteiro (antes da morfologia)
+
+        Returns:
+            Máscara sem as regiões de fundo (a própria máscara se não há fundo)
+        """
+        self._ensure_shape(mask.shape[:2])
+        layer = self._get_layer(profile)
+
+        sums = self._cell_sums(mask)
+        counts = layer["counts"]
+
+        # Células com cor e contagem idêntica ao frame anterior
+        static = (sums > 0) & (sums == layer["sums"])
+        np.add(counts, 1, out=counts, where=static & (counts < self.learn_frames))
+        # Qualquer mudança derruba a célula para baixo do limiar
+        changed = ~static
+        counts[changed] = np.minimum(counts[changed] // 2, self.learn_frames - 1)
+        layer["sums"] = sums
+
+        background = (counts >= self.learn_frames) & ~self.protected
+        self.background_cells[profile] = int(np.count_nonzero(background))
+        if not self.background_cells[profile]:
+            return mask
+
+        return mask & self._get_keep_mask(profile, background)
+
+    def protect(self, bounds: Tuple[int, int, int, int]) -> None:
+        """
+        Impede que as células de um botão clicado virem fundo
+
+        A caixa é convertida para cada forma de frame guardada, então o botão
+        também fica protegido nas outras escalas da detecção.
+
+        Args:
+            bounds: Caixa (x, y, w, h) do botão em coordenadas do frame atual
+        """
+        if self.frame_shape is None:
+            return
+
+        height, width = self.frame_shape
+        x, y, w, h = bounds
+        size = self.cell_size
+        for (state_height, state_width), state in self._states.items():
+            fx, fy = state_width / width, state_height / height
+            rows = slice(max(0, int(y * fy) // size), int(np.ceil((y + h) * fy) - 1) // size + 1)
+            cols = slice(max(0, int(x * fx) // size), int(np.ceil((x + w) * fx) - 1) // size + 1)
+            state["protected"][rows, cols] = True
+            for layer in state["layers"].values():
+                layer["counts"][rows, cols] = 0
+
+    def reset(self) -> None:
+        """Descarta o modelo aprendido"""
+        self._states = OrderedDict()
+        self.frame_shape = None
+        self.protected = None
+        self._layers = {}
+        self._keep_masks = {}
+        self.background_cells = {}
+
+    def _ensure_shape(self, shape: Tuple[int, int]) -> None:
+        """Ativa o estado da forma do frame, criando-o na primeira vez"""
+        if shape == self.frame_shape:
+            return
+
+        state = self._states.pop(shape, None)
+        if state is None:
+            state = {
+                "protected": np.zeros(self._grid_shape(shape), dtype=bool),
+                "layers": {},
+                "keep_masks": {},
+                "background_cells": {},
+            }
+        self._states[shape] = state
+        while len(self._states) > self.max_shapes:
+            self._states.popitem(last=False)
+        self._activate(shape)
+
+    def _activate(self, shape: Tuple[int, int]) -> None:
+        """Aponta os atributos do estado atual para o estado guardado da forma"""
+        state = self._states[shape]
+        self.frame_shape = shape
+        self.protected = state["protected"]
+        self._layers = state["layers"]
+        self._keep_masks = state["keep_masks"]
+        self.background_cells = state["background_cells"]
+
+    def _grid_shape(self, shape: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+        """Número de células (linhas, colunas) para a forma informada (padrão: a atual)"""
+        height, width = shape or self.frame_shape
+        return -(-height // self.cell_size), -(-width // self.cell_size)
+
+    def _get_layer(self, profile: str) -> Dict[str, np.ndarray]:
+        """Retorna (criando se necessário) o estado do perfil"""
+        layer = self._layers.get(profile)
+        if layer is None:
+            grid = self._grid_shape()
+            layer = {
+                "counts": np.zeros(grid, dtype=np.uint16),
+                "sums": np.full(grid, -1, dtype=np.int64),
+            }
+            self._layers[profile] = layer
+        return layer
+
+    def _cell_sums(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Soma dos valores da máscara em cada célula, via imagem integral
+
+        Args:
+            mask: Máscara do frame inteiro
+
+        Returns:
+            Matriz (linhas, colunas) com a soma de cada célula
+        """
+        height, width = self.frame_shape
+        ys = np.append(np.arange(0, height, self.cell_size), height)
+        xs = np.append(np.arange(0, width, self.cell_size), width)
+
+        corners = np.asarray(cv2.integral(mask), dtype=np.int64)[ys][:, xs]
+        return corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+
+    def _get_keep_mask(self, profile: str, background: np.ndarray) -> np.ndarray:
+        """Máscara em pixels (0 no fundo, 255 no resto), reutilizada enquanto o fundo não muda"""
+        cached = self._keep_masks.get(profile)
+        if cached is not None and np.array_equal(cached[0], background):
+            return cached[1]
+
+        height, width = self.frame_shape
+        keep_cells = np.where(background, 0, 255).astype(np.uint8)
+        keep = np.repeat(np.repeat(keep_cells, self.cell_size, axis=0), self.cell_size, axis=1)
+        keep = np.ascontiguousarray(keep[:height, :width])
+        self._keep_masks[profile] = (background, keep)
+        return keep
+
+    def save(self, path: str) -> bool:
+        """
+        Salva o modelo em um arquivo .npz
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            True se salvou com sucesso
+        """
+        if self.frame_shape is None:
+            return False
+
+        # Formas na ordem de uso (a última é a atual)
+        arrays = {
+            "shapes": np.asarray(list(self._states), dtype=np.int64),
+            "cell_size": np.asarray(self.cell_size),
+        }
+        for index, state in enumerate(self._states.values()):
+            arrays[f"protected__{index}"] = state["protected"]
+            for profile, layer in state["layers"].items():
+                arrays[f"counts__{index}__{profile}"] = layer["counts"]
+                arrays[f"sums__{index}__{profile}"] = layer["sums"]
+
+        try:
+            with open(path, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao salvar modelo de fundo: {e}")
+            return False
+
+    def load(self, path: str) -> bool:
+        """
+        Carrega um modelo salvo (ignorado se o tamanho da célula mudou)
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            True se carregou com sucesso
+        """
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with np.load(path) as data:
+                if int(data["cell_size"]) != self.cell_size:
+                    return False
+
+                self.reset()
+                shapes = [tuple(int(v) for v in shape) for shape in data["shapes"]]
+                for index, shape in enumerate(shapes):
+                    self._states[shape] = {
+                        "protected": data[f"protected__{index}"].astype(bool),
+                        "layers": {},
+                        "keep_masks": {},
+                        "background_cells": {},
+                    }
+                for key in data.files:
+                    if key.startswith("counts__"):
+                        _, index, profile = key.split("__", 2)
+                        state = self._states[shapes[int(index)]]
+                        state["layers"][profile] = {
+                            "counts": np.minimum(data[key], self.learn_frames).astype(np.uint16),
+                            "sums": data[f"sums__{index}__{profile}"].astype(np.int64),
+                        }
+                while len(self._states) > self.max_shapes:
+                    self._states.popitem(last=False)
+                if shapes:
+                    self._activate(shapes[-1])
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao carregar modelo de fundo: {e}")
+            self.reset()
+            return False
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Retorna estatísticas do modelo
+
+        Returns:
+            Dicionário com o número de células de fundo e protegidas
+        """
+        return {
+            "background_cells": sum(self.background_cells.values()),
+            "protected_cells": int(self.protected.sum()) if self.protected is not None else 0,
+        }
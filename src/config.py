@@ -55,6 +55,15 @@ COLOR_DETECTION = {
     "min_blue_ratio": 0.3,  # Mínimo 30% de pixels azuis para ser considerado botão
 }
 
+# Pré-verificação rápida de presença de azul (antes do pipeline completo)
+PRESENCE_CHECK = {
+    "enabled": True,
+    # Passo da grade de amostragem = dimensão mínima do botão / divisor
+    "stride_divisor": 2,
+    # Mínimo de amostras azuis para executar o pipeline completo
+    "min_blue_samples": 1,
+}
+
 # Configurações de Detecção de Botão
 BUTTON_DETECTION = {
     # Filtros de área (base para 1920x1080)
@@ -74,6 +83,108 @@ BUTTON_DETECTION = {
     "score_weights": {"blue_ratio": 0.5, "position": 0.3, "size": 0.2},
 }
 
+# Perfis de detecção (avaliados no mesmo frame, com uma única conversão HSV)
+# Cada perfil define suas faixas de cor e pode sobrescrever, em "button_detection",
+# os limites de forma e os pesos de BUTTON_DETECTION. O melhor botão do frame é
+# escolhido pela maior prioridade e, dentro dela, pelo maior score.
+DETECTION_PROFILES = {
+    "blue": {
+        "enabled": True,
+        "priority": 3,
+        "color_ranges": COLOR_DETECTION["blue_ranges"],
+        "min_color_ratio": COLOR_DETECTION["min_blue_ratio"],
+    },
+    # Botões verdes ("Next", "Próximo")
+    "green": {
+        "enabled": False,
+        "priority": 2,
+        "color_ranges": [
+            {
+                "name": "standard_green",
+                "lower": np.array([40, 80, 80]),
+                "upper": np.array([85, 255, 255]),
+            },
+        ],
+        "min_color_ratio": 0.3,
+    },
+    # Botões cinza neutros ("OK"); pouca saturação e brilho intermediário
+    "grey": {
+        "enabled": False,
+        "priority": 1,
+        "color_ranges": [
+            {
+                "name": "neutral_grey",
+                "lower": np.array([0, 0, 90]),
+                "upper": np.array([180, 30, 200]),
+            },
+        ],
+        "min_color_ratio": 0.6,
+        "button_detection": {
+            "min_aspect_ratio": 1.5,
+            "score_weights": {"blue_ratio": 0.6, "position": 0.3, "size": 0.1},
+        },
+    },
+}
+
+# Configurações de Detecção em Blocos (tiles)
+TILING_CONFIG = {
+    # Divide o frame em blocos sobrepostos processados em paralelo
+    "enabled": False,
+    "min_frame_pixels": 2560 * 1440,  # Só divide frames a partir deste tamanho
+    "tile_scale": 4,  # Lado do bloco em múltiplos do tamanho máximo do botão
+    "max_workers": 0,  # Threads do pool (0 = número de CPUs)
+    "nms_iou_threshold": 0.9,  # Sobreposição para considerar caixas duplicadas
+    # Detecção incremental: reprocessa apenas blocos cujo checksum mudou
+    "incremental": False,
+    "incremental_tile_scale": 2,  # Blocos menores isolam melhor a área alterada
+}
+
+# Rastreamento de botões entre frames
+TRACKING_CONFIG = {
+    "enabled": False,
+    "iou_threshold": 0.3,  # IoU mínimo para associar candidato a um rastro
+    "max_missed_frames": 2,  # Frames sem associação antes de descartar o rastro
+    "confirm_frames": 1,  # Frames consecutivos antes de liberar o clique
+    # Região de verificação local ao redor do rastro (fração do tamanho do botão)
+    "search_margin": 0.5,
+    "full_scan_interval": 10,  # Varredura completa a cada N frames mesmo com rastro
+}
+
+# Caminho rápido por template de botões já detectados
+TEMPLATE_MATCHING = {
+    "enabled": False,
+    "min_detection_score": 0.6,  # Score mínimo para guardar o botão como template
+    "match_threshold": 0.9,  # Correlação normalizada mínima para aceitar o match
+    "scales": (1.0, 0.95, 1.05),  # Cópias escaladas (1.0 primeiro para sair cedo)
+    "search_margin": 0.5,  # Janela de busca (fração da largura/altura do botão)
+    "max_resolutions": 4,  # Resoluções mantidas no cache (LRU)
+    "max_templates_per_resolution": 4,
+    "full_scan_interval": 10,  # Varredura completa a cada N frames mesmo com match
+}
+
+# Modelo de fundo: ignora regiões coloridas que nunca mudam nem são clicadas
+# (aplicado na varredura do frame inteiro; os modos em blocos não usam o modelo)
+BACKGROUND_MODEL = {
+    "enabled": False,
+    "cell_size": 16,  # Lado da célula do modelo em pixels
+    "learn_frames": 30,  # Frames idênticos até a célula virar fundo
+    "max_shapes": 4,  # Formas de frame mantidas (o governador alterna a escala)
+    "model_file": "background_model.npz",  # Salvo ao parar o monitoramento ("" = não salva)
+}
+
+# Verificação opcional do texto do botão por OCR (pytesseract)
+OCR_VERIFICATION = {
+    "enabled": False,
+    "labels": ["Continue", "Continuar"],  # Rótulos aceitos (sem diferenciar acentos)
+    "language": "eng+por",
+    "tesseract_config": "--psm 7",  # Uma única linha de texto
+    "upscale": 2,  # Ampliação do recorte antes do OCR
+    # Cache dos resultados por hash perceptual do recorte do botão
+    "hash_size": 16,  # Grade do dHash (16 = 256 bits)
+    "cache_size": 256,
+    "allow_without_ocr": True,  # Sem Tesseract instalado, não bloqueia o clique
+}
+
 # Configurações de Adaptação de Resolução
 RESOLUTION_ADAPTATION = {
     # Resolução de referência para cálculos
@@ -109,6 +220,58 @@ MONITORING_CONFIG = {
     "emergency_zone_size": 20,  # Tamanho da zona de emergência em pixels
 }
 
+# Cliques em vários botões detectados no mesmo frame (sem workers de detecção)
+MULTI_TARGET = {
+    "enabled": False,
+    # Ordem dos cliques: "score", "top_to_bottom" ou "priority" (perfil, depois score)
+    "order": "priority",
+    "max_targets": 5,
+    "delay_between_clicks": 0.3,
+    # Confere o botão com uma captura só da sua região antes de cada clique seguinte
+    "verify_before_click": True,
+}
+
+# Latência do aparecimento ao clique e confirmação dos cliques
+CLICK_METRICS = {
+    # Confere a região do botão após post_click_delay (clique confirmado se ele sumiu)
+    "verify_after_click": True,
+}
+
+# Mapa de calor de cliques: varre primeiro as regiões onde botões já apareceram
+# (monitoramento de um alvo por ciclo, sem workers de detecção)
+HIT_PRIOR = {
+    "enabled": False,
+    "cell_size": 120,  # Lado da célula em pixels da resolução de referência
+    "decay": 0.95,  # Fator aplicado ao mapa inteiro a cada clique
+    "min_heat": 0.5,  # Calor mínimo para a célula ser varrida primeiro
+    "max_regions": 3,  # Regiões quentes varridas antes da tela inteira
+    "confident_score": 0.6,  # Score que encerra a busca sem varredura completa
+    "full_sweep_interval": 5,  # Varredura completa a cada N ciclos mesmo com acerto
+    "heatmap_file": "hit_heatmap.json",  # Salvo ao parar o monitoramento ("" = não salva)
+}
+
+# Agendamento preditivo: aprende o intervalo entre aparições do botão e varre
+# devagar até a janela prevista abrir (volta ao intervalo normal ao errar)
+PREDICTIVE_SCHEDULING = {
+    "enabled": False,
+    "min_samples": 5,  # Intervalos observados antes de começar a prever
+    "history_size": 50,  # Intervalos guardados (os mais recentes)
+    "window_quantiles": (0.1, 0.9),  # Quantis dos intervalos que delimitam a janela
+    "window_margin": 0.15,  # Alargamento da janela (fração de cada limite)
+    "idle_interval": 5.0,  # Intervalo de varredura antes da janela abrir (segundos)
+}
+
+# Governador de CPU: limita o uso de CPU do monitoramento a um orçamento
+CPU_BUDGET = {
+    "enabled": False,
+    "max_cpu_percent": 25.0,  # Percentual de um núcleo
+    "smoothing": 0.3,  # Peso da média móvel do custo por ciclo
+    # Escalas da detecção (pirâmide); desce um degrau quando o intervalo que cabe
+    # no orçamento passa de latency_tolerance vezes o intervalo pedido
+    "scales": (1.0, 0.75, 0.5),
+    "latency_tolerance": 2.0,
+}
+
 # Configurações de Debug
 DEBUG_CONFIG = {
     "save_images": False,
@@ -122,8 +285,94 @@ PERFORMANCE_CONFIG = {
     # Configurações de thread
     "daemon_threads": True,
     # Timeouts
-    "detection_timeout": 5.0,
+    "detection_timeout": 5.0,  # Espera máxima pelos workers de detecção ocupados
+    # Prazo de cada ciclo (watchdog); acima do maior bloqueio legítimo: espera
+    # pelos workers + captura + pausas do clique e da verificação pós-clique
+    "cycle_deadline": 15.0,
+    "restart_after_overruns": 3,  # Estouros seguidos até reiniciar captura e detector
     "ui_update_interval": 1000,  # ms
+    # Detecção em processos separados (0 = detecção na thread de monitoramento)
+    "detection_workers": 0,
+    "frame_ring_slots": 4,  # Slots do anel de frames em memória compartilhada
+    "worker_liveness_interval": 0.25,  # Verificação dos workers durante a espera (s)
+}
+
+# Estatísticas de latência (histograma logarítmico em memória fixa)
+LATENCY_STATS = {
+    "min_value": 1e-5,  # Menor duração distinguível (10 µs)
+    "max_value": 100.0,  # Maior duração distinguível (segundos)
+    "buckets_per_decade": 20,  # Erro relativo dos percentis ~6%
+    "slot_seconds": 10,  # Resolução das janelas deslizantes
+    "windows": {"1m": 60, "15m": 900},
+}
+
+# Profiler de operações (utils.profiler); desativado não tem custo, pois os
+# decoradores são aplicados na importação dos módulos
+PROFILING = {
+    "enabled": False,
+}
+
+# Trace de ciclos em formato Chrome trace-event (Perfetto / about://tracing)
+# Os trechos vêm das operações instrumentadas pelo profiler
+TRACING = {
+    "enabled": False,
+    "buffer_size": 20000,  # Trechos guardados no anel (os mais recentes)
+    "export_dir": "traces",
+    "signal": "SIGUSR1",  # Sinal que exporta o trace (kill -USR1 <pid>; não existe no Windows)
+}
+
+# Endpoint de métricas em formato texto do Prometheus (apenas leitura das
+# estatísticas já coletadas; um scrape nunca captura a tela)
+METRICS_ENDPOINT = {
+    "enabled": False,
+    "host": "127.0.0.1",
+    "port": 9464,
+    "unix_socket": None,  # Caminho de socket Unix (substitui host/porta)
+    "namespace": "continuador",
+    "latency_buckets": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+}
+
+# Log estruturado (JSON lines) gravado em lotes por uma thread própria
+LOGGING = {
+    "log_file": "auto_clicker.log",
+    "level": "INFO",  # DEBUG, INFO, WARNING ou ERROR
+    "console": True,  # Repete as mensagens no terminal
+    "max_size": 1024 * 1024,  # Bytes até rotacionar (durante a execução)
+    "backup_count": 3,  # Arquivos rotacionados mantidos (.1, .2, ...)
+    "batch_size": 256,  # Registros gravados por escrita
+    "queue_size": 10000,  # Registros pendentes (excedentes são descartados)
+}
+
+# Histórico de sessões em SQLite (ciclos e cliques, gravados em lote por uma
+# thread própria); consultado com `python main.py stats`
+HISTORY = {
+    "enabled": False,
+    "db_file": "history.db",
+    "batch_size": 500,  # Linhas por transação
+    "queue_size": 50000,  # Linhas pendentes (excedentes são descartadas)
+    "report_hours": 24,  # Horas listadas em "cliques por hora"
+}
+
+# Métricas brutas por ciclo (registros de largura fixa em um array estruturado
+# do NumPy mapeado em arquivo; analisadas com cycle_metrics.summarize_cycles)
+CYCLE_METRICS = {
+    "enabled": False,
+    "file": "cycle_metrics.bin",
+    "chunk_records": 65536,  # Registros acrescentados a cada extensão do arquivo
+    "rolling_window": 100,  # Ciclos por janela dos percentis móveis
+}
+
+# Gravação e replay das capturas (contêiner com blocos alterados comprimidos;
+# o replay substitui a captura de tela e os cliques não são executados)
+CAPTURE_RECORDING = {
+    "record": False,  # Grava os frames analisados durante o monitoramento
+    "output_dir": "recordings",
+    "replay_file": None,  # Gravação reproduzida no lugar da tela (None = tela real)
+    "realtime": True,  # Respeita os instantes gravados (False = o mais rápido possível)
+    "tile_size": 32,  # Lado dos blocos comparados entre frames (pixels)
+    "keyframe_interval": 300,  # Frames entre frames inteiros
+    "compression_level": 1,  # Nível do zlib (1 = mais rápido)
+    "queue_size": 16,  # Frames pendentes de gravação (excedentes são descartados)
 }
 
 # Mensagens do Sistema
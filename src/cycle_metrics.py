@@ -0,0 +1,264 @@
+"""
+Métricas por Ciclo em Arquivo Mapeado em Memória
+Módulo responsável por gravar um registro de largura fixa por ciclo em um
+array estruturado do NumPy mapeado em arquivo, e por analisá-lo sem cópias
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    from .config import CYCLE_METRICS
+except ImportError:
+    from config import CYCLE_METRICS
+
+# Registro de um ciclo (tempos em segundos; NaN = etapa não medida)
+CYCLE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),  # Início do ciclo (time.monotonic())
+        ("cycle", "<f4"),  # Duração total do ciclo
+        ("capture", "<f4"),  # Captura da tela
+        ("detect", "<f4"),  # Detecção sem a captura
+        ("click", "<f4"),  # Execução dos cliques
+        ("candidates", "<i4"),  # Candidatos válidos no frame (-1 = desconhecido)
+        ("score", "<f4"),  # Score do melhor candidato (NaN sem botão)
+        ("clicks", "u1"),  # Cliques executados no ciclo
+        ("interval", "<f4"),  # Espera antes deste ciclo
+    ]
+)
+
+STAGES = ("capture", "detect", "click")
+
+# Cabeçalho: assinatura, tamanho do registro e número de registros válidos
+MAGIC = b"CYCMETR1"
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("itemsize", "<u8"), ("count", "<u8")])
+HEADER_SIZE = 64
+
+
+class CycleMetricsFile:
+    """
+    Arquivo de registros por ciclo, crescendo em blocos de chunk_records
+
+    append escreve direto no mapeamento e só depois incrementa a contagem do
+    cabeçalho, então um leitor (ou um post-mortem após uma falha do processo)
+    nunca vê um registro pela metade. O arquivo é estendido com zeros um
+    bloco por vez, e o mapeamento é refeito apenas nessa hora.
+    """
+
+    def __init__(self, path: str = "", chunk_records: int = 0):
+        """
+        Abre (ou cria) o arquivo e continua após o último registro
+
+        Args:
+            path: Caminho do arquivo (padrão: CYCLE_METRICS)
+            chunk_records: Registros acrescentados a cada extensão do arquivo
+
+        Raises:
+            ValueError: Se o arquivo existe com outro formato
+        """
+        self.path = path or CYCLE_METRICS["file"]
+        self.chunk_records = chunk_records or CYCLE_METRICS["chunk_records"]
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER_SIZE:
+            with open(self.path, "wb") as f:
+                header = np.zeros(1, dtype=HEADER_DTYPE)
+                header["magic"] = MAGIC
+                header["itemsize"] = CYCLE_DTYPE.itemsize
+                f.write(header.tobytes().ljust(HEADER_SIZE, b"\0"))
+
+        self._header = np.memmap(self.path, dtype=HEADER_DTYPE, mode="r+", shape=(1,))
+        if self._header["magic"][0] != MAGIC or self._header["itemsize"][0] != CYCLE_DTYPE.itemsize:
+            raise ValueError(f"Formato de métricas incompatível: {self.path}")
+
+        self.count = int(self._header["count"][0])
+        self._records: Optional[np.memmap] = None
+        self._map_records()
+
+    @property
+    def capacity(self) -> int:
+        """Registros que cabem no arquivo sem estendê-lo"""
+        return len(self._records) if self._records is not None else 0
+
+    def _map_records(self, min_capacity: int = 0) -> None:
+        """Estende o arquivo em blocos até min_capacity e refaz o mapeamento"""
+        available = (os.path.getsize(self.path) - HEADER_SIZE) // CYCLE_DTYPE.itemsize
+        capacity = max(available, self.count)
+        while capacity < max(min_capacity, 1):
+            capacity += self.chunk_records
+
+        if capacity > available:
+            if self._records is not None:
+                self._records.flush()
+                self._records = None
+            with open(self.path, "r+b") as f:
+                f.truncate(HEADER_SIZE + capacity * CYCLE_DTYPE.itemsize)
+
+        self._records = np.memmap(
+            self.path, dtype=CYCLE_DTYPE, mode="r+", offset=HEADER_SIZE, shape=(capacity,)
+        )
+
+    def append(
+        self,
+        timestamp: float,
+        cycle: float,
+        capture: float = float("nan"),
+        detect: float = float("nan"),
+        click: float = float("nan"),
+        candidates: int = -1,
+        score: float = float("nan"),
+        clicks: int = 0,
+        interval: float = float("nan"),
+    ) -> None:
+        """
+        Acrescenta o registro de um ciclo
+
+        Args:
+            timestamp: Início do ciclo (time.monotonic())
+            cycle: Duração total do ciclo em segundos
+            capture, detect, click: Tempo de cada etapa em segundos
+            candidates: Candidatos válidos no frame (-1 = desconhecido)
+            score: Score do melhor candidato (NaN sem botão)
+            clicks: Cliques executados no ciclo
+            interval: Espera antes deste ciclo em segundos
+        """
+        if self.count >= self.capacity:
+            self._map_records(self.count + 1)
+
+        self._records[self.count] = (
+            timestamp,
+            cycle,
+            capture,
+            detect,
+            click,
+            candidates,
+            score,
+            clicks,
+            interval,
+        )
+        self.count += 1
+        self._header["count"] = self.count
+
+    def flush(self) -> None:
+        """Grava as páginas alteradas no disco"""
+        if self._records is not None:
+            self._records.flush()
+            self._header.flush()
+
+    def close(self) -> None:
+        """Grava as páginas alteradas e libera o mapeamento"""
+        self.flush()
+        self._records = None
+
+
+def load_cycle_metrics(path: str = "") -> np.ndarray:
+    """
+    Carrega os registros válidos sem copiar (mapeamento somente leitura)
+
+    Args:
+        path: Caminho do arquivo (padrão: CYCLE_METRICS)
+
+    Returns:
+        Array estruturado com CYCLE_DTYPE (vazio se o arquivo não tem registros)
+
+    Raises:
+        ValueError: Se o arquivo tem outro formato
+    """
+    path = path or CYCLE_METRICS["file"]
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header["magic"][0] != MAGIC:
+        raise ValueError(f"Arquivo de métricas inválido: {path}")
+    if header["itemsize"][0] != CYCLE_DTYPE.itemsize:
+        raise ValueError(f"Formato de métricas incompatível: {path}")
+
+    count = int(header["count"][0])
+    if count == 0:
+        return np.zeros(0, dtype=CYCLE_DTYPE)
+    return np.memmap(path, dtype=CYCLE_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+
+def rolling_percentile(
+    values: np.ndarray, window: int, q: float, block_size: int = 65536
+) -> np.ndarray:
+    """
+    Percentil móvel sobre as últimas `window` amostras
+
+    As janelas são visões (sliding_window_view) processadas em blocos, então
+    a memória extra é limitada a block_size x window valores.
+
+    Args:
+        values: Série de valores (NaN são ignorados)
+        window: Tamanho da janela
+        q: Percentil entre 0 e 100
+        block_size: Janelas calculadas por vez
+
+    Returns:
+        Array com len(values) - window + 1 percentis (a posição i cobre
+        values[i:i + window])
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < window:
+        return np.zeros(0)
+
+    # nanpercentile é bem mais lento; só é usado se houver NaN
+    percentile = np.nanpercentile if np.isnan(values).any() else np.percentile
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    result = np.empty(len(windows))
+    for start in range(0, len(windows), block_size):
+        block = windows[start : start + block_size]
+        result[start : start + len(block)] = percentile(block, q, axis=1)
+    return result
+
+
+def stage_breakdown(records: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """
+    Participação de cada etapa no tempo dos ciclos
+
+    Args:
+        records: Array estruturado com CYCLE_DTYPE
+
+    Returns:
+        {etapa: {mean, p50, p99, share}} para captura, detecção, cliques e
+        "other" (restante do ciclo); share é a fração do tempo total de ciclo
+    """
+    cycle = records["cycle"].astype(np.float64)
+    total = float(np.nansum(cycle))
+    stages = {name: records[name].astype(np.float64) for name in STAGES}
+    stages["other"] = cycle - np.nansum(np.stack(list(stages.values())), axis=0)
+
+    breakdown = {}
+    for name, values in stages.items():
+        measured = values[~np.isnan(values)]
+        breakdown[name] = {
+            "mean": float(measured.mean()) if measured.size else 0.0,
+            "p50": float(np.percentile(measured, 50)) if measured.size else 0.0,
+            "p99": float(np.percentile(measured, 99)) if measured.size else 0.0,
+            "share": float(measured.sum()) / total if total > 0 else 0.0,
+        }
+    return breakdown
+
+
+def summarize_cycles(records: np.ndarray, window: int = 0) -> Dict[str, Any]:
+    """
+    Resumo de um arquivo de métricas para investigações de desempenho
+
+    Args:
+        records: Array estruturado com CYCLE_DTYPE
+        window: Janela dos percentis móveis de duração do ciclo (padrão: CYCLE_METRICS)
+
+    Returns:
+        Dicionário com contagens, etapas e o pior p99 móvel da duração do ciclo
+    """
+    window = window or CYCLE_METRICS["rolling_window"]
+    timestamps = records["timestamp"]
+    rolling_p99 = rolling_percentile(records["cycle"], window, 99)
+    return {
+        "cycles": len(records),
+        "clicks": int(records["clicks"].sum(dtype=np.int64)),
+        "found_cycles": int(np.count_nonzero(~np.isnan(records["score"]))),
+        "duration": float(timestamps[-1] - timestamps[0]) if len(records) else 0.0,
+        "stages": stage_breakdown(records),
+        "worst_rolling_p99": float(rolling_p99.max()) if rolling_p99.size else 0.0,
+        "worst_rolling_p99_at": int(rolling_p99.argmax()) if rolling_p99.size else -1,
+    }
@@ -5,6 +5,8 @@ Módulo responsável pela detecção visual de botões azuis na tela
 
 import os
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 # Conditional imports for CI/test environments
@@ -26,11 +28,57 @@ except ImportError:
 import numpy as np
 
 try:
-    from .config import COLOR_DETECTION, DEBUG_CONFIG
+    from .background import BackgroundModel
+    from .config import (
+        BACKGROUND_MODEL,
+        COLOR_DETECTION,
+        DEBUG_CONFIG,
+        OCR_VERIFICATION,
+        PRESENCE_CHECK,
+        TEMPLATE_MATCHING,
+        TILING_CONFIG,
+        TRACKING_CONFIG,
+    )
+    from .ocr import ButtonTextVerifier
+    from .recording import CaptureRecorder, CaptureReplay
     from .resolution_adapter import get_resolution_adapter
+    from .templates import TemplateCache
+    from .tiling import (
+        compute_tiles,
+        map_tiles_to_cells,
+        non_max_suppression,
+        touches_inner_border,
+    )
+    from .tracking import ButtonTracker
+    from .utils import logger, profiler
 except ImportError:
-    from config import COLOR_DETECTION, DEBUG_CONFIG
+    from background import BackgroundModel
+    from config import (
+        BACKGROUND_MODEL,
+        COLOR_DETECTION,
+        DEBUG_CONFIG,
+        OCR_VERIFICATION,
+        PRESENCE_CHECK,
+        TEMPLATE_MATCHING,
+        TILING_CONFIG,
+        TRACKING_CONFIG,
+    )
+    from ocr import ButtonTextVerifier
+    from recording import CaptureRecorder, CaptureReplay
     from resolution_adapter import get_resolution_adapter
+    from templates import TemplateCache
+    from tiling import (
+        compute_tiles,
+        map_tiles_to_cells,
+        non_max_suppression,
+        touches_inner_border,
+    )
+    from tracking import ButtonTracker
+    from utils import logger, profiler
+
+ColorRanges = List[Tuple[np.ndarray, np.ndarray]]
+ProfileContours = Dict[str, List[np.ndarray]]
+TileContours = List[Tuple[str, np.ndarray, Tuple[int, int, int, int]]]
 
 
 class BlueButtonDetector:
@@ -38,19 +86,97 @@ class BlueButtonDetector:
     Detector inteligente de botões azuis na tela
 
     Utiliza análise de cor HSV e filtros de forma para identificar
-    botões azuis típicos de interfaces "Continue"
+    botões azuis típicos de interfaces "Continue". Outros perfis de cor
+    (DETECTION_PROFILES) são avaliados na mesma captura e conversão HSV.
     """
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(
+        self,
+        debug_mode: bool = False,
+        frame_source: Optional[CaptureReplay] = None,
+        recorder: Optional[CaptureRecorder] = None,
+    ):
         """
         Inicializa o detector
 
         Args:
             debug_mode: Se True, salva imagens de debug
+            frame_source: Replay usado no lugar da captura de tela
+            recorder: Gravador dos frames capturados da tela inteira
         """
         self.debug_mode = debug_mode
+        self.frame_source = frame_source
+        self.recorder = recorder
+        self._replay_config: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
         self.detection_count = 0
         self.successful_detections = 0
+        self.tiled_detections = 0
+
+        # Estatísticas da pré-verificação de presença
+        self.precheck_rejects = 0
+        self.precheck_time = 0.0
+        self.precheck_time_saved = 0.0
+        self._pipeline_time_avg: Optional[float] = None
+
+        # Rastreamento entre frames (verificação local ao redor do botão travado)
+        self.tracker: Optional[ButtonTracker] = (
+            ButtonTracker() if TRACKING_CONFIG["enabled"] else None
+        )
+        self.local_rechecks = 0
+        self.full_scans = 0
+        self._frames_since_full_scan = 0
+
+        # Templates de botões já detectados (caminho rápido por correlação)
+        self.template_cache: Optional[TemplateCache] = (
+            TemplateCache() if TEMPLATE_MATCHING["enabled"] else None
+        )
+        self.template_hits = 0
+        self.template_misses = 0
+
+        # Modelo de fundo (regiões coloridas estáticas removidas antes dos contornos)
+        self.background_model: Optional[BackgroundModel] = None
+        if BACKGROUND_MODEL["enabled"]:
+            self.background_model = BackgroundModel()
+            if BACKGROUND_MODEL["model_file"]:
+                self.background_model.load(BACKGROUND_MODEL["model_file"])
+
+        # Verificação opcional do rótulo do botão por OCR (com cache)
+        self.text_verifier: Optional[ButtonTextVerifier] = (
+            ButtonTextVerifier() if OCR_VERIFICATION["enabled"] else None
+        )
+
+        # Buscas restritas a regiões (ex.: regiões quentes do mapa de cliques)
+        self.region_scans = 0
+
+        # Escala da detecção em detect_button (reduzida pelo governador de CPU)
+        self.detection_scale = 1.0
+        self._scaled_configs: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+        # Verificações locais de alvos antes do clique
+        self.target_verifications = 0
+        self.target_verification_failures = 0
+
+        # Resultados por perfil de detecção (melhor candidato do último frame)
+        self.profile_detections: Dict[str, int] = {}
+        self.last_profile_results: Dict[str, Dict[str, Any]] = {}
+
+        # Tempo acumulado em capturas de tela (etapas por ciclo no monitor)
+        self.capture_seconds = 0.0
+
+        # Último frame analisado: candidatos válidos e candidato escolhido
+        self.last_candidate_count = 0
+        self.last_detection: Optional[Dict[str, Any]] = None
+
+        # Pool de threads para detecção em blocos (criado sob demanda)
+        self._tile_executor: Optional[ThreadPoolExecutor] = None
+
+        # Cache da detecção incremental (checksums e contornos por bloco)
+        self._incremental_key: Optional[Tuple[Any, ...]] = None
+        self._incremental_layout: Dict[str, Any] = {}
+        self._cell_checksums: List[Optional[int]] = []
+        self._tile_contours: List[Optional[TileContours]] = []
+        self.incremental_tiles_total = 0
+        self.incremental_tiles_processed = 0
 
         # Inicializar adaptador de resolução
         self.resolution_adapter = get_resolution_adapter()
@@ -64,8 +190,66 @@ class BlueButtonDetector:
         debug_dir = DEBUG_CONFIG["debug_dir"]
         if not os.path.exists(debug_dir):
             os.makedirs(debug_dir)
-            print(f"Diretório de debug criado: {debug_dir}")
+            logger.info(f"Diretório de debug criado: {debug_dir}")
 
+    @profiler.profile()
+    def capture_frame(
+        self,
+        out: Optional[np.ndarray] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ) -> np.ndarray:
+        """
+        Captura a tela e converte para BGR
+
+        Args:
+            out: Buffer BGR opcional onde a imagem será escrita (ex.: slot de
+                memória compartilhada), evitando uma cópia extra
+            region: Região (x, y, w, h) a capturar (padrão: tela inteira)
+
+        Returns:
+            Imagem BGR da tela
+        """
+        start = time.perf_counter()
+        if self.frame_source is not None:
+            frame = self.frame_source.read(region)
+            if out is not None and out.shape == frame.shape:
+                np.copyto(out, frame)
+                frame = out
+        else:
+            if region is not None:
+                screenshot = pyautogui.screenshot(region=region)
+            else:
+                screenshot = pyautogui.screenshot()
+            if out is not None:
+                frame = cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR, dst=out)
+            else:
+                frame = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+        self.capture_seconds += time.perf_counter() - start
+
+        # Só a tela inteira é gravada; capturas de região são recortes no replay
+        if self.recorder is not None and region is None:
+            self.recorder.add(frame)
+        return frame
+
+    def get_adapted_config(self) -> Dict[str, Any]:
+        """
+        Configuração adaptada para a resolução analisada
+
+        Durante um replay usa a resolução da gravação em vez da tela atual.
+
+        Returns:
+            Dicionário com parâmetros adaptados para a resolução
+        """
+        resolution = self.frame_source.resolution if self.frame_source is not None else None
+        if resolution is None:
+            return self.resolution_adapter.get_adapted_config()
+
+        if self._replay_config is None or self._replay_config[0] != resolution:
+            config = self.resolution_adapter.get_config_for_resolution(*resolution)
+            self._replay_config = (resolution, config)
+        return self._replay_config[1]
+
+    @profiler.profile()
     def detect_button(self) -> Optional[Tuple[int, int, int, int]]:
         """
         Detecta botão azul na tela
@@ -74,97 +258,970 @@ class BlueButtonDetector:
             Tupla (center_x, center_y, width, height) se encontrado, None caso contrário
         """
         try:
-            self.detection_count += 1
-
             # Obter configuração adaptada para resolução atual
-            config = self.resolution_adapter.get_adapted_config()
+            config = self.get_adapted_config()
 
             # Capturar screenshot
-            screenshot = pyautogui.screenshot()
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            img = self.capture_frame()
 
-            # Encontrar candidatos a botão
-            candidates = self._find_button_candidates(img, config)
+            if self.detection_scale < 1.0:
+                return self._detect_scaled(img)
+            return self.detect_in_image(img, config)
 
-            # Criar imagem de debug se necessário
-            debug_img = img.copy() if self.debug_mode else None
+        except EOFError:
+            # Fim do replay (o monitor encerra ao ver frame_source.finished)
+            return None
+        except Exception as e:
+            logger.error(f"Erro na detecção: {e}")
+            return None
+
+    def set_detection_scale(self, scale: float) -> None:
+        """
+        Define a escala em que detect_button analisa a tela
 
-            # Processar candidatos
-            valid_candidates = self._process_candidates(candidates, img, debug_img, config)
+        Args:
+            scale: Fator de redução do frame (1.0 = resolução nativa)
+        """
+        if scale != self.detection_scale:
+            self.detection_scale = scale
+            # Rastros guardam caixas na escala anterior
+            self.reset_tracking()
 
-            # Retornar melhor candidato
-            if valid_candidates:
-                best_candidate = max(valid_candidates, key=lambda c: c["score"])
-                self.successful_detections += 1
+    @profiler.profile()
+    def _detect_scaled(self, img: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Detecta em uma cópia reduzida do frame e devolve coordenadas da tela
 
-                # Salvar debug image com resultado
-                if debug_img is not None:
-                    self._save_debug_image(debug_img, best_candidate, "detection")
+        Os limites de tamanho vêm da configuração adaptada para a resolução
+        reduzida, então o botão é filtrado como em uma tela menor.
 
-                center_x, center_y = best_candidate["center"]
-                x, y, w, h = best_candidate["bounds"]
-                return (center_x, center_y, w, h)
+        Args:
+            img: Imagem BGR da tela na resolução nativa
 
-            # Salvar debug image mesmo sem detecção
+        Returns:
+            Tupla (center_x, center_y, width, height) se encontrado, None caso contrário
+        """
+        scale = self.detection_scale
+        height, width = img.shape[:2]
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+        config = self._scaled_configs.get(size)
+        if config is None:
+            config = self.resolution_adapter.get_config_for_resolution(*size)
+            self._scaled_configs = {size: config}
+
+        # INTER_LINEAR: INTER_AREA custa mais que a própria detecção em fatores não inteiros
+        small = cv2.resize(img, size, interpolation=cv2.INTER_LINEAR)
+        result = self.detect_in_image(small, config)
+        if result is None:
+            return None
+        return tuple(int(round(value / scale)) for value in result)
+
+    @profiler.profile()
+    def detect_in_image(
+        self, img: np.ndarray, config: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Detecta o botão de maior prioridade em uma imagem já capturada
+
+        Todos os perfis de detecção são avaliados sobre a mesma imagem; o
+        melhor candidato de cada perfil fica em last_profile_results.
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada (usa a resolução atual se omitida)
+
+        Returns:
+            Tupla (center_x, center_y, width, height) se encontrado, None caso contrário
+        """
+        self.detection_count += 1
+
+        if config is None:
+            config = self.get_adapted_config()
+
+        # Criar imagem de debug se necessário
+        debug_img = img.copy() if self.debug_mode else None
+
+        # Verificação local ao redor do botão rastreado (None = varredura completa)
+        valid_candidates = self._recheck_tracked_region(img, config, debug_img)
+
+        # Caminho rápido por template antes do pipeline HSV
+        if valid_candidates is None:
+            valid_candidates = self._match_templates(img, config, debug_img)
+
+        if valid_candidates is None:
+            valid_candidates = self._scan_full_frame(img, config, debug_img)
+            self._remember_template(img, config, valid_candidates)
+
+        self._record_profile_results(valid_candidates)
+
+        # Escolher melhor candidato (confirmado pelo rastreador, se ativo)
+        if self.tracker is not None:
+            best_candidate = self.tracker.update(valid_candidates)
+        elif valid_candidates:
+            best_candidate = max(valid_candidates, key=self._candidate_rank)
+        else:
+            best_candidate = None
+
+        # Confirmar o rótulo do botão antes de liberar o clique
+        if best_candidate and not self._verify_text(img, best_candidate):
+            best_candidate = None
+
+        self.last_candidate_count = len(valid_candidates)
+        self.last_detection = best_candidate
+
+        # Retornar melhor candidato
+        if best_candidate:
+            self.successful_detections += 1
+
+            # Salvar debug image com resultado
             if debug_img is not None:
-                self._save_debug_image(debug_img, None, "no_detection")
+                self._save_debug_image(debug_img, best_candidate, "detection")
+
+            center_x, center_y = best_candidate["center"]
+            x, y, w, h = best_candidate["bounds"]
+            return (center_x, center_y, w, h)
+
+        # Salvar debug image mesmo sem detecção
+        if debug_img is not None:
+            self._save_debug_image(debug_img, None, "no_detection")
+
+        return None
+
+    @profiler.profile()
+    def detect_all(
+        self, img: Optional[np.ndarray] = None, config: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Detecta todos os botões válidos de um único frame
+
+        Sempre executa a varredura completa (sem rastreamento nem templates),
+        pois os caminhos rápidos só procuram o botão já conhecido.
+
+        Args:
+            img: Imagem BGR da tela (captura a tela se omitida)
+            config: Configuração adaptada (usa a resolução atual se omitida)
+
+        Returns:
+            Lista de candidatos (center, bounds, score, profile, priority, ...)
+            ordenada por prioridade do perfil e score
+        """
+        try:
+            if config is None:
+                config = self.get_adapted_config()
+            if img is None:
+                img = self.capture_frame()
+        except EOFError:
+            return []
+        except Exception as e:
+            logger.error(f"Erro na detecção: {e}")
+            return []
+
+        self.detection_count += 1
+        debug_img = img.copy() if self.debug_mode else None
+
+        candidates = self._scan_full_frame(img, config, debug_img)
+        self._record_profile_results(candidates)
+        candidates.sort(key=self._candidate_rank, reverse=True)
+        candidates = [c for c in candidates if self._verify_text(img, c)]
+
+        self.last_candidate_count = len(candidates)
+        self.last_detection = candidates[0] if candidates else None
+        if candidates:
+            self.successful_detections += 1
+
+        if debug_img is not None:
+            best = candidates[0] if candidates else None
+            self._save_debug_image(debug_img, best, "detection_all" if best else "no_detection")
 
+        return candidates
+
+    @profiler.profile()
+    def detect_in_regions(
+        self,
+        img: np.ndarray,
+        regions: List[Tuple[int, int, int, int]],
+        config: Optional[Dict[str, Any]] = None,
+        min_score: float = 0.0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Procura botões apenas nas regiões informadas, na ordem dada
+
+        A busca termina na primeira região com um candidato de score >= min_score.
+        As regiões devem ter folga suficiente para conter botões inteiros.
+
+        A busca não conta como detecção: quem chama encerra o ciclo com
+        finish_region_detection ou segue para a varredura de detect_in_image.
+
+        Args:
+            img: Imagem BGR da tela
+            regions: Regiões (x, y, w, h) em ordem de prioridade
+            config: Configuração adaptada (usa a resolução atual se omitida)
+            min_score: Score que encerra a busca antecipadamente
+
+        Returns:
+            Melhor candidato encontrado (confiante ou não), ou None
+        """
+        if config is None:
+            config = self.get_adapted_config()
+
+        self.region_scans += 1
+        margin = self._tile_border_margin()
+
+        best_candidate = None
+        self.last_candidate_count = 0
+        for region in regions:
+            contours = self._merge_tile_contours(
+                [self._find_contours_in_tile(img, region, margin, config["profiles"])]
+            )
+            candidates = [
+                c
+                for c in self._process_profiles(contours, img, None, config)
+                if self._verify_text(img, c)
+            ]
+            if not candidates:
+                continue
+
+            self.last_candidate_count += len(candidates)
+            if best_candidate is not None:
+                candidates.append(best_candidate)
+            best_candidate = max(candidates, key=self._candidate_rank)
+            if best_candidate["score"] >= min_score:
+                break
+
+        return best_candidate
+
+    def finish_region_detection(
+        self, candidate: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Encerra um ciclo resolvido pela busca em regiões
+
+        Conta a detecção uma única vez e passa o resultado pelo rastreador, como
+        detect_in_image: com o rastreamento ativo, só rastros confirmados liberam
+        o clique.
+
+        Args:
+            candidate: Resultado de detect_in_regions (None se nada foi encontrado)
+
+        Returns:
+            Tupla (center_x, center_y, width, height) se liberado, None caso contrário
+        """
+        self.detection_count += 1
+        candidates = [candidate] if candidate is not None else []
+        self._record_profile_results(candidates)
+
+        if self.tracker is not None:
+            candidate = self.tracker.update(candidates)
+
+        self.last_detection = candidate
+        if candidate is None:
             return None
 
+        self.successful_detections += 1
+        x, y, w, h = candidate["bounds"]
+        return (*candidate["center"], w, h)
+
+    def region_padding(self, config: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Folga (x, y) para que uma região expandida contenha botões inteiros
+
+        Args:
+            config: Configuração adaptada para a resolução atual
+
+        Returns:
+            Maior botão aceito entre os perfis mais a margem da morfologia
+        """
+        return self._tile_overlap(config)
+
+    @profiler.profile()
+    def verify_candidate(
+        self, candidate: Dict[str, Any], config: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Confere se um botão detectado continua no lugar
+
+        Captura apenas a região do botão e mede a proporção da cor do seu
+        perfil, sem repetir a varredura da tela inteira.
+
+        Args:
+            candidate: Candidato retornado por detect_all
+            config: Configuração adaptada (usa a resolução atual se omitida)
+
+        Returns:
+            True se a região ainda tem a cor do perfil
+        """
+        self.target_verifications += 1
+        if self.button_present(candidate["bounds"], candidate["profile"], config):
+            return True
+
+        self.target_verification_failures += 1
+        return False
+
+    def button_present(
+        self,
+        bounds: Tuple[int, int, int, int],
+        profile_name: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Indica se a região de um botão ainda tem a cor do seu perfil
+
+        Usado antes do clique (verify_candidate) e depois dele, para saber se
+        o botão clicado sumiu.
+
+        Args:
+            bounds: Caixa (x, y, w, h) do botão
+            profile_name: Perfil do botão (padrão: o primeiro perfil habilitado)
+            config: Configuração adaptada (usa a resolução atual se omitida)
+
+        Returns:
+            True se a região tem a proporção mínima da cor do perfil
+        """
+        if config is None:
+            config = self.get_adapted_config()
+
+        profile = self._get_profile(config, profile_name)
+        if profile is None and profile_name is None and config["profiles"]:
+            profile = config["profiles"][0]
+        if profile is None:
+            return False
+
+        try:
+            region = self.capture_frame(region=bounds)
         except Exception as e:
-            print(f"Erro na detecção: {e}")
+            logger.error(f"Erro na verificação do botão: {e}")
+            return False
+
+        height, width = region.shape[:2]
+        color_ratio = self._calculate_color_ratio(
+            region, 0, 0, width, height, profile["color_ranges"]
+        )
+        return color_ratio >= profile["min_color_ratio"]
+
+    @profiler.profile()
+    def _verify_text(self, img: np.ndarray, candidate: Dict[str, Any]) -> bool:
+        """Confere o rótulo do candidato por OCR (sempre True com a verificação desativada)"""
+        if self.text_verifier is None:
+            return True
+        return self.text_verifier.verify(img, candidate)
+
+    @staticmethod
+    def _candidate_rank(candidate: Dict[str, Any]) -> Tuple[int, float]:
+        """Chave de ordenação dos candidatos: prioridade do perfil e depois score"""
+        return candidate.get("priority", 0), candidate["score"]
+
+    def _record_profile_results(self, candidates: List[Dict[str, Any]]) -> None:
+        """Guarda o melhor candidato de cada perfil e atualiza as contagens por perfil"""
+        results: Dict[str, Dict[str, Any]] = {}
+        for candidate in candidates:
+            profile = candidate["profile"]
+            best = results.get(profile)
+            if best is None or candidate["score"] > best["score"]:
+                results[profile] = candidate
+
+        for profile in results:
+            self.profile_detections[profile] = self.profile_detections.get(profile, 0) + 1
+        self.last_profile_results = results
+
+    @staticmethod
+    def _get_profile(config: Dict[str, Any], name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Retorna a configuração adaptada do perfil habilitado com o nome informado"""
+        for profile in config["profiles"]:
+            if profile["name"] == name:
+                return profile
+        return None
+
+    @profiler.profile()
+    def _scan_full_frame(
+        self, img: np.ndarray, config: Dict[str, Any], debug_img: Optional[np.ndarray]
+    ) -> List[Dict[str, Any]]:
+        """
+        Executa o pipeline completo (pré-verificação, máscara, contornos e filtros)
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+            debug_img: Imagem para debug (opcional)
+
+        Returns:
+            Lista de candidatos válidos com seus scores
+        """
+        self.full_scans += 1
+        self._frames_since_full_scan = 0
+
+        if not config["profiles"] or not self._passes_presence_check(img, config):
+            return []
+
+        pipeline_start = time.perf_counter()
+
+        # Encontrar candidatos a botão (contornos por perfil)
+        contours, hsv = self._find_button_candidates(img, config)
+
+        # Processar candidatos
+        valid_candidates = self._process_profiles(contours, img, debug_img, config, hsv)
+
+        self._update_pipeline_time(time.perf_counter() - pipeline_start)
+        return valid_candidates
+
+    @profiler.profile()
+    def _recheck_tracked_region(
+        self, img: np.ndarray, config: Dict[str, Any], debug_img: Optional[np.ndarray]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Procura o botão rastreado apenas em uma região ao redor da última posição
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+            debug_img: Imagem para debug (opcional)
+
+        Returns:
+            Candidatos da região se o rastro continua, ou None quando é preciso
+            uma varredura completa (sem rastro, rastro perdido ou intervalo atingido)
+        """
+        if self.tracker is None or self.tracker.locked_track is None:
+            return None
+        if self._frames_since_full_scan >= TRACKING_CONFIG["full_scan_interval"]:
+            return None
+
+        track = self.tracker.locked_track
+        profile = self._get_profile(config, track.candidate["profile"])
+        if profile is None:
+            return None
+
+        margin = self._tile_border_margin()
+        frame_size = (img.shape[1], img.shape[0])
+        region = self.tracker.search_region(track, frame_size, min_margin=2 * margin)
+
+        # Apenas o perfil do botão rastreado é verificado na região
+        tile_contours = self._find_contours_in_tile(img, region, margin, [profile])
+        contours = [contour for _, contour, _ in tile_contours]
+        candidates = self._process_candidates(contours, img, debug_img, profile)
+
+        if not self.tracker.matches_track(track, candidates):
             return None
 
-    def _find_button_candidates(self, img: np.ndarray, config: Dict[str, Any]) -> List[np.ndarray]:
+        self.local_rechecks += 1
+        self._frames_since_full_scan += 1
+        return candidates
+
+    @profiler.profile()
+    def _match_templates(
+        self, img: np.ndarray, config: Dict[str, Any], debug_img: Optional[np.ndarray]
+    ) -> Optional[List[Dict[str, Any]]]:
         """
-        Encontra contornos que podem ser botões azuis
+        Procura botões já conhecidos por correlação normalizada
 
         Args:
             img: Imagem BGR da tela
             config: Configuração adaptada para a resolução atual
+            debug_img: Imagem para debug (opcional)
 
         Returns:
-            Lista de contornos candidatos
+            Lista com o candidato do template encontrado, ou None para seguir
+            para o pipeline completo
         """
-        # Converter para HSV
+        if self.template_cache is None or not len(self.template_cache):
+            return None
+        if self._frames_since_full_scan >= TEMPLATE_MATCHING["full_scan_interval"]:
+            return None
+
+        match = self.template_cache.match(config["resolution"], img)
+        template, candidate = match if match is not None else (None, None)
+        if candidate is not None:
+            # O matching é em tons de cinza: confirmar a cor do perfil do template
+            profile = self._get_profile(config, candidate["profile"])
+            if profile is None:
+                candidate = None
+            else:
+                candidate["color_ratio"] = self._calculate_color_ratio(
+                    img, *candidate["bounds"], profile["color_ranges"]
+                )
+                if candidate["color_ratio"] < profile["min_color_ratio"]:
+                    candidate = None
+
+        if candidate is None:
+            self.template_misses += 1
+            return None
+
+        self.template_cache.confirm(template, candidate["bounds"])
+        self.template_hits += 1
+        self._frames_since_full_scan += 1
+        if debug_img is not None:
+            self._draw_debug_candidate(debug_img, candidate, 1)
+        return [candidate]
+
+    def _remember_template(
+        self, img: np.ndarray, config: Dict[str, Any], candidates: List[Dict[str, Any]]
+    ) -> None:
+        """Guarda o melhor candidato confiável da varredura completa como template"""
+        if self.template_cache is None or not candidates:
+            return
+
+        best = max(candidates, key=self._candidate_rank)
+        if best["score"] >= TEMPLATE_MATCHING["min_detection_score"]:
+            self.template_cache.add(config["resolution"], img, best)
+
+    def register_click(self, bounds: Tuple[int, int, int, int]) -> None:
+        """
+        Informa ao detector que um botão foi clicado
+
+        Descarta os rastros (um novo botão no mesmo lugar deve ser confirmado
+        de novo) e impede que a região vire fundo.
+
+        Args:
+            bounds: Caixa (x, y, w, h) do botão clicado
+        """
+        self.reset_tracking()
+        if self.background_model is not None:
+            # O modelo acompanha o frame analisado (reduzido pelo governador)
+            self.background_model.protect(
+                tuple(int(value * self.detection_scale) for value in bounds)
+            )
+
+    def reset_tracking(self) -> None:
+        """Descarta os rastros atuais (ex.: após um clique no botão rastreado)"""
+        if self.tracker is not None:
+            self.tracker.reset()
+
+    @profiler.profile()
+    def _passes_presence_check(self, img: np.ndarray, config: Dict[str, Any]) -> bool:
+        """
+        Amostra o frame em uma grade esparsa e verifica se há pixels de algum perfil
+
+        O passo da grade é uma fração da menor dimensão mínima entre os perfis,
+        então todo botão válido contém várias amostras. Frames sem amostras nas
+        cores dos perfis pulam a conversão HSV completa, a morfologia e a busca
+        de contornos.
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+
+        Returns:
+            True se o pipeline completo deve ser executado
+        """
+        if not PRESENCE_CHECK["enabled"]:
+            return True
+
+        start = time.perf_counter()
+
+        profiles = config["profiles"]
+        divisor = PRESENCE_CHECK["stride_divisor"]
+        stride_x = max(1, min(p["min_width"] for p in profiles) // divisor)
+        stride_y = max(1, min(p["min_height"] for p in profiles) // divisor)
+        samples = np.ascontiguousarray(img[stride_y // 2 :: stride_y, stride_x // 2 :: stride_x])
+
+        samples_hsv = cv2.cvtColor(samples, cv2.COLOR_BGR2HSV)
+        color_ranges = [r for p in profiles for r in p["color_ranges"]]
+        color_samples = cv2.countNonZero(self._color_mask(samples_hsv, color_ranges))
+
+        elapsed = time.perf_counter() - start
+        self.precheck_time += elapsed
+
+        if color_samples >= PRESENCE_CHECK["min_blue_samples"]:
+            return True
+
+        self.precheck_rejects += 1
+        if self._pipeline_time_avg is not None:
+            self.precheck_time_saved += max(0.0, self._pipeline_time_avg - elapsed)
+        return False
+
+    def _update_pipeline_time(self, elapsed: float) -> None:
+        """Atualiza a média móvel exponencial do tempo do pipeline completo"""
+        if self._pipeline_time_avg is None:
+            self._pipeline_time_avg = elapsed
+        else:
+            self._pipeline_time_avg = 0.9 * self._pipeline_time_avg + 0.1 * elapsed
+
+    def register_result(self, found: bool) -> None:
+        """
+        Contabiliza uma detecção executada fora deste detector (ex.: em um worker)
+
+        Args:
+            found: Se um botão foi encontrado
+        """
+        self.detection_count += 1
+        if found:
+            self.successful_detections += 1
+
+    @profiler.profile()
+    def _find_button_candidates(
+        self, img: np.ndarray, config: Dict[str, Any]
+    ) -> Tuple[ProfileContours, Optional[np.ndarray]]:
+        """
+        Encontra contornos que podem ser botões de cada perfil
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+
+        Returns:
+            Tupla (contornos por perfil, imagem HSV do frame inteiro ou None
+            quando o frame foi processado em blocos)
+        """
+        if TILING_CONFIG["incremental"]:
+            return self._find_candidates_incremental(img, config), None
+
+        if self._should_use_tiles(img):
+            self.tiled_detections += 1
+            return self._find_candidates_tiled(img, config), None
+
         hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+        contours = self._extract_contours(hsv, config["profiles"], use_background=True)
+        return contours, hsv
 
-        # Criar máscaras para diferentes tons de azul
-        masks = []
-        for blue_range in COLOR_DETECTION["blue_ranges"]:
-            mask = cv2.inRange(hsv, blue_range["lower"], blue_range["upper"])
-            masks.append(mask)
+    def _extract_contours(
+        self,
+        hsv: np.ndarray,
+        profiles: List[Dict[str, Any]],
+        offset: Tuple[int, int] = (0, 0),
+        use_background: bool = False,
+    ) -> ProfileContours:
+        """
+        Aplica a máscara de cor de cada perfil, morfologia e extrai contornos externos
 
-        # Combinar todas as máscaras
-        combined_mask = masks[0]
-        for mask in masks[1:]:
-            combined_mask = cv2.bitwise_or(combined_mask, mask)
+        Args:
+            hsv: Imagem HSV (frame inteiro ou bloco), convertida uma única vez
+            profiles: Perfis de detecção a avaliar
+            offset: Deslocamento somado aos contornos (origem do bloco no frame)
+            use_background: Atualiza o modelo de fundo e remove suas regiões
+                (apenas para o frame inteiro)
 
-        # Remover ruído com operações morfológicas
+        Returns:
+            Contornos em coordenadas do frame, por nome de perfil
+        """
         kernel = np.ones(COLOR_DETECTION["morphology_kernel_size"], np.uint8)
-        combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_OPEN, kernel)
-        combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_CLOSE, kernel)
 
-        # Encontrar contornos
-        contours, _ = cv2.findContours(combined_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        contours_by_profile = {}
+        for profile in profiles:
+            mask = self._color_mask(hsv, profile["color_ranges"])
+
+            # Remover regiões estáticas aprendidas antes da busca de contornos
+            if use_background and self.background_model is not None:
+                mask = self.background_model.apply(profile["name"], mask)
+
+            # Remover ruído com operações morfológicas
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+
+            # Encontrar contornos
+            contours, _ = cv2.findContours(
+                mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=offset
+            )
+            contours_by_profile[profile["name"]] = list(contours)
+
+        return contours_by_profile
+
+    @staticmethod
+    def _color_mask(hsv: np.ndarray, color_ranges: ColorRanges) -> np.ndarray:
+        """
+        Combina as máscaras das faixas de cor
+
+        Args:
+            hsv: Imagem HSV
+            color_ranges: Faixas (lower, upper) em uint8
+
+        Returns:
+            Máscara binária com os pixels dentro de alguma faixa
+        """
+        combined_mask = None
+        for lower, upper in color_ranges:
+            mask = cv2.inRange(hsv, lower, upper)
+            if combined_mask is None:
+                combined_mask = mask
+            else:
+                combined_mask = cv2.bitwise_or(combined_mask, mask)
+        return combined_mask
+
+    def _should_use_tiles(self, img: np.ndarray) -> bool:
+        """Indica se o frame deve ser processado em blocos paralelos"""
+        if not TILING_CONFIG["enabled"] or self._tile_worker_count() < 2:
+            return False
+
+        height, width = img.shape[:2]
+        return width * height >= TILING_CONFIG["min_frame_pixels"]
+
+    @staticmethod
+    def _tile_worker_count() -> int:
+        """Número de threads da detecção em blocos"""
+        return TILING_CONFIG["max_workers"] or os.cpu_count() or 1
+
+    @staticmethod
+    def _tile_border_margin() -> int:
+        """
+        Distância da borda do bloco afetada pela morfologia
+
+        Abertura seguida de fechamento propaga a borda do bloco por
+        4 * raio do kernel pixels; um pixel extra garante a conectividade.
+        """
+        radius = max(COLOR_DETECTION["morphology_kernel_size"]) // 2
+        return 4 * radius + 1
+
+    def _get_tile_executor(self) -> ThreadPoolExecutor:
+        """Retorna o pool de threads da detecção em blocos, criando se necessário"""
+        if self._tile_executor is None:
+            self._tile_executor = ThreadPoolExecutor(
+                max_workers=self._tile_worker_count(), thread_name_prefix="tile-detector"
+            )
+        return self._tile_executor
+
+    def _find_candidates_tiled(self, img: np.ndarray, config: Dict[str, Any]) -> ProfileContours:
+        """
+        Encontra contornos dividindo o frame em blocos sobrepostos processados em paralelo
+
+        A sobreposição é maior que o botão máximo, então todo botão válido cabe
+        inteiro em algum bloco; contornos que encostam em bordas internas são
+        descartados e duplicatas entre blocos são removidas por NMS.
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+
+        Returns:
+            Contornos candidatos em coordenadas do frame, por perfil
+        """
+        margin = self._tile_border_margin()
+        profiles = config["profiles"]
+        tiles = self._compute_tile_layout(img, config, TILING_CONFIG["tile_scale"])
+
+        executor = self._get_tile_executor()
+        tile_results = executor.map(
+            lambda tile: self._find_contours_in_tile(img, tile, margin, profiles), tiles
+        )
+
+        return self._merge_tile_contours(tile_results)
 
-        return contours
+    def _compute_tile_layout(
+        self, img: np.ndarray, config: Dict[str, Any], tile_scale: int
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Calcula os blocos sobrepostos para o frame e a configuração atuais
+
+        A sobreposição cobre o maior botão válido (entre todos os perfis) mais
+        a margem da morfologia.
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+            tile_scale: Lado do bloco em múltiplos do tamanho máximo do botão
+
+        Returns:
+            Lista de blocos (x, y, w, h)
+        """
+        height, width = img.shape[:2]
+        max_width, max_height = self._max_button_size(config)
+        overlap_x, overlap_y = self._tile_overlap(config)
+        tile_width = max(max_width * tile_scale, 2 * overlap_x)
+        tile_height = max(max_height * tile_scale, 2 * overlap_y)
+
+        return compute_tiles(width, height, tile_width, tile_height, overlap_x, overlap_y)
+
+    def _tile_overlap(self, config: Dict[str, Any]) -> Tuple[int, int]:
+        """Sobreposição (x, y) entre blocos vizinhos"""
+        margin = self._tile_border_margin()
+        max_width, max_height = self._max_button_size(config)
+        return max_width + 2 * margin, max_height + 2 * margin
+
+    @staticmethod
+    def _max_button_size(config: Dict[str, Any]) -> Tuple[int, int]:
+        """Maior largura e altura de botão aceitas entre os perfis"""
+        profiles = config["profiles"] or [config]
+        return max(p["max_width"] for p in profiles), max(p["max_height"] for p in profiles)
+
+    def _merge_tile_contours(self, tile_results: Any) -> ProfileContours:
+        """
+        Combina os contornos de todos os blocos removendo duplicatas por NMS
+
+        Args:
+            tile_results: Iterável com a lista de (perfil, contorno, caixa) de cada bloco
+
+        Returns:
+            Contornos em coordenadas do frame, por perfil
+        """
+        grouped: Dict[str, Tuple[List[np.ndarray], List[Tuple[int, int, int, int]]]] = {}
+        for tile_contours in tile_results:
+            for profile, contour, bounds in tile_contours:
+                contours, boxes = grouped.setdefault(profile, ([], []))
+                contours.append(contour)
+                boxes.append(bounds)
+
+        # Remover o mesmo contorno encontrado em blocos vizinhos (por perfil)
+        merged = {}
+        for profile, (contours, boxes) in grouped.items():
+            scores = [w * h for _, _, w, h in boxes]
+            keep = non_max_suppression(boxes, scores, TILING_CONFIG["nms_iou_threshold"])
+            merged[profile] = [contours[i] for i in sorted(keep)]
+        return merged
+
+    def _find_candidates_incremental(
+        self, img: np.ndarray, config: Dict[str, Any]
+    ) -> ProfileContours:
+        """
+        Encontra contornos reprocessando apenas os blocos que mudaram
+
+        Os contornos de um bloco dependem só dos pixels do próprio bloco, então
+        blocos com checksum inalterado reutilizam os contornos do frame anterior.
+        Os checksums são calculados em uma grade de células sem sobreposição,
+        para que cada pixel seja lido apenas uma vez.
+
+        Args:
+            img: Imagem BGR da tela
+            config: Configuração adaptada para a resolução atual
+
+        Returns:
+            Contornos candidatos em coordenadas do frame, por perfil
+        """
+        layout = self._get_incremental_layout(img, config)
+        tiles = layout["tiles"]
+        margin = self._tile_border_margin()
+        profiles = config["profiles"]
+
+        # Células alteradas desde o frame anterior
+        changed_cells = set()
+        for index, (x, y, w, h) in enumerate(layout["cells"]):
+            checksum = zlib.crc32(np.ascontiguousarray(img[y : y + h, x : x + w]))
+            if checksum != self._cell_checksums[index]:
+                self._cell_checksums[index] = checksum
+                changed_cells.add(index)
+
+        dirty = [
+            index
+            for index, cells in enumerate(layout["tile_cells"])
+            if self._tile_contours[index] is None or not changed_cells.isdisjoint(cells)
+        ]
+
+        if dirty:
+            if len(dirty) > 1 and self._tile_worker_count() > 1:
+                executor = self._get_tile_executor()
+                results = executor.map(
+                    lambda index: self._find_contours_in_tile(img, tiles[index], margin, profiles),
+                    dirty,
+                )
+            else:
+                results = (
+                    self._find_contours_in_tile(img, tiles[i], margin, profiles) for i in dirty
+                )
+
+            for index, tile_contours in zip(dirty, results):
+                self._tile_contours[index] = tile_contours
+
+        self.incremental_tiles_total += len(tiles)
+        self.incremental_tiles_processed += len(dirty)
+
+        return self._merge_tile_contours(self._tile_contours)
+
+    def _get_incremental_layout(self, img: np.ndarray, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Retorna a grade de blocos e células da detecção incremental
+
+        A grade é recriada (e o cache descartado) quando a forma do frame,
+        o tamanho máximo do botão ou os perfis ativos mudam.
+        """
+        key = (
+            img.shape,
+            self._max_button_size(config),
+            tuple(p["name"] for p in config["profiles"]),
+        )
+        if key != self._incremental_key:
+            height, width = img.shape[:2]
+            tiles = self._compute_tile_layout(img, config, TILING_CONFIG["incremental_tile_scale"])
+            overlap_x, overlap_y = self._tile_overlap(config)
+            cells = compute_tiles(width, height, overlap_x, overlap_y, 0, 0)
+
+            self._incremental_key = key
+            self._incremental_layout = {
+                "tiles": tiles,
+                "cells": cells,
+                "tile_cells": map_tiles_to_cells(tiles, cells),
+            }
+            self._cell_checksums = [None] * len(cells)
+            self._tile_contours = [None] * len(tiles)
+
+        return self._incremental_layout
+
+    def _find_contours_in_tile(
+        self,
+        img: np.ndarray,
+        tile: Tuple[int, int, int, int],
+        margin: int,
+        profiles: List[Dict[str, Any]],
+    ) -> TileContours:
+        """
+        Extrai os contornos completos de um bloco para todos os perfis
+
+        Args:
+            img: Imagem BGR do frame inteiro
+            tile: Bloco (x, y, w, h)
+            margin: Distância mínima das bordas internas do bloco
+            profiles: Perfis de detecção a avaliar
+
+        Returns:
+            Lista de tuplas (perfil, contorno, caixa delimitadora) em coordenadas do frame
+        """
+        x, y, w, h = tile
+        frame_size = (img.shape[1], img.shape[0])
+
+        # Uma conversão HSV por bloco, compartilhada entre os perfis
+        hsv = cv2.cvtColor(img[y : y + h, x : x + w], cv2.COLOR_BGR2HSV)
+
+        results = []
+        for profile, contours in self._extract_contours(hsv, profiles, offset=(x, y)).items():
+            for contour in contours:
+                bounds = cv2.boundingRect(contour)
+                if not touches_inner_border(bounds, tile, frame_size, margin):
+                    results.append((profile, contour, bounds))
+        return results
+
+    @profiler.profile()
+    def _process_profiles(
+        self,
+        contours: ProfileContours,
+        img: np.ndarray,
+        debug_img: Optional[np.ndarray],
+        config: Dict[str, Any],
+        hsv: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Processa os contornos de cada perfil com seus próprios limites e pesos
+
+        Args:
+            contours: Contornos por perfil
+            img: Imagem original
+            debug_img: Imagem para debug (opcional)
+            config: Configuração adaptada para a resolução atual
+            hsv: Imagem HSV do frame inteiro, se já convertida
+
+        Returns:
+            Lista de candidatos válidos de todos os perfis
+        """
+        valid_candidates = []
+        for profile in config["profiles"]:
+            valid_candidates.extend(
+                self._process_candidates(
+                    contours.get(profile["name"], []), img, debug_img, profile, hsv
+                )
+            )
+        return valid_candidates
 
     def _process_candidates(
         self,
         contours: List[np.ndarray],
         img: np.ndarray,
         debug_img: Optional[np.ndarray],
-        config: Dict[str, Any],
+        profile: Dict[str, Any],
+        hsv: Optional[np.ndarray] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Processa contornos para encontrar botões válidos
+        Processa contornos de um perfil para encontrar botões válidos
 
         Args:
             contours: Lista de contornos encontrados
             img: Imagem original
             debug_img: Imagem para debug (opcional)
-            config: Configuração adaptada para a resolução atual
+            profile: Configuração adaptada do perfil de detecção
+            hsv: Imagem HSV do frame inteiro, se já convertida
 
         Returns:
             Lista de candidatos válidos com seus scores
@@ -176,31 +1233,33 @@ class BlueButtonDetector:
             area = cv2.contourArea(contour)
 
             # Filtro inicial por área usando configuração adaptada
-            if not (config["min_area"] < area < config["max_area"]):
+            if not (profile["min_area"] < area < profile["max_area"]):
                 continue
 
             # Obter retângulo delimitador
             x, y, w, h = cv2.boundingRect(contour)
 
             # Aplicar filtros de dimensão e forma
-            if not self._is_valid_button_shape(x, y, w, h, img.shape, config):
+            if not self._is_valid_button_shape(x, y, w, h, img.shape, profile):
                 continue
 
-            # Verificar se a região realmente contém um botão azul
-            blue_ratio = self._calculate_blue_ratio(img, x, y, w, h)
-            if blue_ratio < COLOR_DETECTION["min_blue_ratio"]:
+            # Verificar se a região realmente contém a cor do perfil
+            color_ratio = self._calculate_color_ratio(img, x, y, w, h, profile["color_ranges"], hsv)
+            if color_ratio < profile["min_color_ratio"]:
                 continue
 
             # Calcular score do candidato
-            score = self._calculate_candidate_score(x, y, w, h, blue_ratio, img.shape, config)
+            score = self._calculate_candidate_score(x, y, w, h, color_ratio, img.shape, profile)
 
             # Criar candidato válido
             candidate = {
                 "center": (x + w // 2, y + h // 2),
                 "bounds": (x, y, w, h),
                 "score": score,
-                "blue_ratio": blue_ratio,
+                "color_ratio": color_ratio,
                 "area": area,
+                "profile": profile["name"],
+                "priority": profile["priority"],
             }
 
             valid_candidates.append(candidate)
@@ -255,35 +1314,39 @@ class BlueButtonDetector:
 
         return True
 
-    def _calculate_blue_ratio(self, img: np.ndarray, x: int, y: int, w: int, h: int) -> float:
+    def _calculate_color_ratio(
+        self,
+        img: np.ndarray,
+        x: int,
+        y: int,
+        w: int,
+        h: int,
+        color_ranges: ColorRanges,
+        hsv: Optional[np.ndarray] = None,
+    ) -> float:
         """
-        Calcula a proporção de pixels azuis na região do botão
+        Calcula a proporção de pixels da cor do perfil na região do botão
 
         Args:
             img: Imagem BGR
             x, y, w, h: Coordenadas e dimensões da região
+            color_ranges: Faixas de cor do perfil
+            hsv: Imagem HSV do frame inteiro (evita converter a região novamente)
 
         Returns:
-            Proporção de pixels azuis (0.0 a 1.0)
+            Proporção de pixels da cor (0.0 a 1.0)
         """
-        # Extrair região do botão
-        button_region = img[y : y + h, x : x + w]
-
-        # Converter para HSV
-        button_hsv = cv2.cvtColor(button_region, cv2.COLOR_BGR2HSV)
-
-        # Criar máscaras para tons de azul
-        blue_pixels = np.zeros((h, w), dtype=np.uint8)
-
-        for blue_range in COLOR_DETECTION["blue_ranges"]:
-            mask = cv2.inRange(button_hsv, blue_range["lower"], blue_range["upper"])
-            blue_pixels = cv2.bitwise_or(blue_pixels, mask)
+        # Extrair região do botão em HSV
+        if hsv is not None:
+            button_hsv = hsv[y : y + h, x : x + w]
+        else:
+            button_hsv = cv2.cvtColor(img[y : y + h, x : x + w], cv2.COLOR_BGR2HSV)
 
         # Calcular proporção
         total_pixels = w * h
-        blue_pixel_count = np.sum(blue_pixels > 0)
+        color_pixel_count = cv2.countNonZero(self._color_mask(button_hsv, color_ranges))
 
-        return blue_pixel_count / total_pixels if total_pixels > 0 else 0.0
+        return color_pixel_count / total_pixels if total_pixels > 0 else 0.0
 
     def _calculate_candidate_score(
         self,
@@ -291,7 +1354,7 @@ class BlueButtonDetector:
         y: int,
         w: int,
         h: int,
-        blue_ratio: float,
+        color_ratio: float,
         img_shape: Tuple[int, int, int],
         config: Dict[str, Any],
     ) -> float:
@@ -300,9 +1363,9 @@ class BlueButtonDetector:
 
         Args:
             x, y, w, h: Coordenadas e dimensões
-            blue_ratio: Proporção de pixels azuis
+            color_ratio: Proporção de pixels da cor do perfil
             img_shape: Forma da imagem
-            config: Configuração adaptada para a resolução atual
+            config: Configuração adaptada do perfil
 
         Returns:
             Score do candidato (0.0 a 1.0)
@@ -310,8 +1373,8 @@ class BlueButtonDetector:
         img_height = img_shape[0]
         weights = config["score_weights"]
 
-        # Score baseado na proporção de azul
-        blue_score = blue_ratio
+        # Score baseado na proporção da cor do perfil
+        color_score = color_ratio
 
         # Score baseado na posição (preferir parte inferior da tela)
         position_score = y / img_height
@@ -319,9 +1382,9 @@ class BlueButtonDetector:
         # Score baseado no tamanho (normalizado)
         size_score = min((w * h) / 5000, 1.0)
 
-        # Score total ponderado
+        # Score total ponderado ("blue_ratio" é o peso da proporção de cor)
         total_score = (
-            blue_score * weights["blue_ratio"]
+            color_score * weights["blue_ratio"]
             + position_score * weights["position"]
             + size_score * weights["size"]
         )
@@ -386,7 +1449,7 @@ class BlueButtonDetector:
         filepath = os.path.join(DEBUG_CONFIG["debug_dir"], filename)
 
         cv2.imwrite(filepath, debug_img)
-        print(f"Debug image saved: {filepath}")
+        logger.info(f"Debug image saved: {filepath}")
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -405,6 +1468,31 @@ class BlueButtonDetector:
             "total_detections": self.detection_count,
             "successful_detections": self.successful_detections,
             "success_rate": success_rate,
+            "tiled_detections": self.tiled_detections,
+            "incremental_tile_ratio": (
+                self.incremental_tiles_processed / self.incremental_tiles_total
+                if self.incremental_tiles_total > 0
+                else 0.0
+            ),
+            "precheck_rejects": self.precheck_rejects,
+            "precheck_reject_rate": (
+                self.precheck_rejects / self.detection_count * 100
+                if self.detection_count > 0
+                else 0
+            ),
+            "precheck_time": self.precheck_time,
+            "precheck_time_saved": self.precheck_time_saved,
+            "local_rechecks": self.local_rechecks,
+            "full_scans": self.full_scans,
+            "template_hits": self.template_hits,
+            "template_misses": self.template_misses,
+            "profile_detections": dict(self.profile_detections),
+            "region_scans": self.region_scans,
+            "target_verifications": self.target_verifications,
+            "target_verification_failures": self.target_verification_failures,
+            **(self.tracker.get_statistics() if self.tracker is not None else {}),
+            **(self.text_verifier.get_statistics() if self.text_verifier is not None else {}),
+            **(self.background_model.get_statistics() if self.background_model is not None else {}),
             "debug_mode": self.debug_mode,
         }
 
@@ -412,3 +1500,26 @@ class BlueButtonDetector:
         """Reseta as estatísticas do detector"""
         self.detection_count = 0
         self.successful_detections = 0
+        self.tiled_detections = 0
+        self.incremental_tiles_total = 0
+        self.incremental_tiles_processed = 0
+        self.precheck_rejects = 0
+        self.precheck_time = 0.0
+        self.precheck_time_saved = 0.0
+        self.local_rechecks = 0
+        self.full_scans = 0
+        self.template_hits = 0
+        self.template_misses = 0
+        self.profile_detections = {}
+        self.target_verifications = 0
+        self.target_verification_failures = 0
+        self.region_scans = 0
+
+    def shutdown(self) -> None:
+        """Libera recursos do detector (pool de threads e modelo de fundo salvo)"""
+        if self._tile_executor is not None:
+            self._tile_executor.shutdown(wait=False)
+            self._tile_executor = None
+
+        if self.background_model is not None and BACKGROUND_MODEL["model_file"]:
+            self.background_model.save(BACKGROUND_MODEL["model_file"])
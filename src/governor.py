@@ -0,0 +1,140 @@
+"""
+Governador de Orçamento de CPU
+Módulo responsável por manter o uso de CPU do monitoramento abaixo de um
+orçamento, ajustando o intervalo entre ciclos e a escala da detecção
+"""
+
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    from .config import CPU_BUDGET, MONITORING_CONFIG
+except ImportError:
+    from config import CPU_BUDGET, MONITORING_CONFIG
+
+
+class CpuGovernor:
+    """
+    Governador que ajusta o ritmo do monitoramento ao orçamento de CPU
+
+    O tempo de CPU de cada ciclo (média móvel exponencial) define o período
+    mínimo entre ciclos que cabe no orçamento. O intervalo escolhido é o menor
+    que respeita esse período; quando ele passaria de latency_tolerance vezes
+    o intervalo pedido, a detecção desce um degrau da pirâmide de escalas
+    (menos pixels por ciclo) e volta a subir quando a escala maior cabe no
+    orçamento com o intervalo pedido.
+    """
+
+    def __init__(self, budget_percent: float = 0.0, scales: Optional[Sequence[float]] = None):
+        """
+        Inicializa o governador
+
+        Args:
+            budget_percent: Uso máximo de CPU, em percentual de um núcleo
+                (padrão: CPU_BUDGET)
+            scales: Degraus de escala da detecção, do maior para o menor
+                ((1.0,) = apenas o intervalo é ajustado)
+        """
+        self.budget_percent = budget_percent or CPU_BUDGET["max_cpu_percent"]
+        self.scales = tuple(scales or CPU_BUDGET["scales"])
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta as medições (ex.: ao iniciar uma nova sessão)"""
+        self.scale_index = 0
+        self.cycle_cpu: Optional[float] = None
+        self.cycle_wall: Optional[float] = None
+        self.cpu_usage: Optional[float] = None
+        self.interval = 0.0
+        self.scale_changes = 0
+
+        self._last_sample: Optional[Tuple[float, float]] = None
+
+    @property
+    def scale(self) -> float:
+        """Escala atual da detecção (1.0 = resolução nativa)"""
+        return self.scales[self.scale_index]
+
+    def record_cycle(self, cpu_time: float, wall_time: float) -> None:
+        """
+        Registra o custo de um ciclo e o uso de CPU desde o ciclo anterior
+
+        Args:
+            cpu_time: Tempo de CPU do processo gasto no ciclo, em segundos
+            wall_time: Duração do ciclo, em segundos
+        """
+        alpha = CPU_BUDGET["smoothing"]
+        self.cycle_cpu = self._smooth(self.cycle_cpu, cpu_time, alpha)
+        self.cycle_wall = self._smooth(self.cycle_wall, wall_time, alpha)
+
+        # Uso real: CPU do processo / tempo decorrido (ciclo + espera)
+        sample = (time.process_time(), time.monotonic())
+        if self._last_sample is not None:
+            elapsed = sample[1] - self._last_sample[1]
+            if elapsed > 0:
+                usage = (sample[0] - self._last_sample[0]) / elapsed * 100
+                self.cpu_usage = self._smooth(self.cpu_usage, usage, alpha)
+        self._last_sample = sample
+
+    def next_interval(self, base_interval: float) -> float:
+        """
+        Calcula a espera até o próximo ciclo dentro do orçamento
+
+        Args:
+            base_interval: Intervalo pedido (slider ou agendamento preditivo)
+
+        Returns:
+            Segundos até o próximo ciclo (nunca menos que base_interval)
+        """
+        if self.cycle_cpu is None:
+            self.interval = base_interval
+            return base_interval
+
+        self.interval = max(base_interval, self._required_interval(self.cycle_cpu))
+        self._adjust_scale(base_interval)
+        return self.interval
+
+    def _required_interval(self, cycle_cpu: float) -> float:
+        """Espera mínima após um ciclo com o custo informado para caber no orçamento"""
+        period = cycle_cpu / (self.budget_percent / 100)
+        return min(MONITORING_CONFIG["max_interval"], max(0.0, period - self.cycle_wall))
+
+    def _adjust_scale(self, base_interval: float) -> None:
+        """Desce ou sobe um degrau de escala conforme a latência que o orçamento permite"""
+        tolerance = base_interval * CPU_BUDGET["latency_tolerance"]
+
+        if self.interval > tolerance and self.scale_index < len(self.scales) - 1:
+            self._set_scale_index(self.scale_index + 1)
+        elif self.scale_index > 0:
+            # Custo estimado na escala maior (proporcional ao número de pixels)
+            ratio = (self.scales[self.scale_index - 1] / self.scale) ** 2
+            if self._required_interval(self.cycle_cpu * ratio) <= base_interval:
+                self._set_scale_index(self.scale_index - 1)
+
+    def _set_scale_index(self, index: int) -> None:
+        """Troca a escala e ajusta a estimativa de custo por ciclo"""
+        ratio = (self.scales[index] / self.scale) ** 2
+        self.cycle_cpu *= ratio
+        self.scale_index = index
+        self.scale_changes += 1
+
+    @staticmethod
+    def _smooth(current: Optional[float], value: float, alpha: float) -> float:
+        """Média móvel exponencial (o primeiro valor inicializa a média)"""
+        return value if current is None else current + alpha * (value - current)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do governador
+
+        Returns:
+            Dicionário com orçamento, uso real, intervalo e escala atuais
+        """
+        return {
+            "cpu_budget": self.budget_percent,
+            "cpu_usage": self.cpu_usage or 0.0,
+            "cpu_per_cycle": self.cycle_cpu or 0.0,
+            "governed_interval": self.interval,
+            "detection_scale": self.scale,
+            "scale_changes": self.scale_changes,
+        }
@@ -0,0 +1,168 @@
+"""
+Mapa de Calor de Cliques
+Módulo responsável por guardar onde os botões costumam aparecer, em
+coordenadas da resolução de referência, para varrer essas regiões primeiro
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+try:
+    from .config import HIT_PRIOR, RESOLUTION_ADAPTATION
+    from .logs import logger
+except ImportError:
+    from config import HIT_PRIOR, RESOLUTION_ADAPTATION
+    from logs import logger
+
+
+class HitHeatmap:
+    """
+    Mapa de calor com decaimento das posições clicadas
+
+    A grade cobre a resolução de referência; posições da tela são convertidas
+    pelos fatores de escala do ResolutionAdapter, então o histórico continua
+    válido quando a resolução muda
+    """
+
+    def __init__(self, cell_size: int = 0, decay: float = 0.0):
+        """
+        Inicializa o mapa
+
+        Args:
+            cell_size: Lado da célula em pixels da resolução de referência
+                (padrão: HIT_PRIOR)
+            decay: Fator aplicado a todo o mapa a cada novo clique
+        """
+        self.cell_size = cell_size or HIT_PRIOR["cell_size"]
+        self.decay = decay or HIT_PRIOR["decay"]
+
+        ref_width = RESOLUTION_ADAPTATION["reference_width"]
+        ref_height = RESOLUTION_ADAPTATION["reference_height"]
+        rows = -(-ref_height // self.cell_size)
+        cols = -(-ref_width // self.cell_size)
+        self.heat = np.zeros((rows, cols), dtype=np.float64)
+
+    def record_hit(self, x: int, y: int, scale_factors: Dict[str, float]) -> None:
+        """
+        Registra um clique
+
+        Args:
+            x, y: Posição do clique na tela
+            scale_factors: Fatores de escala da resolução atual ({"x", "y"})
+        """
+        row, col = self._cell_of(x / scale_factors["x"], y / scale_factors["y"])
+        self.heat *= self.decay
+        self.heat[row, col] += 1.0
+
+    def hot_regions(
+        self,
+        frame_size: Tuple[int, int],
+        scale_factors: Dict[str, float],
+        padding: Tuple[int, int],
+        max_regions: int = 0,
+        min_heat: float = 0.0,
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Retorna as regiões da tela mais prováveis, da mais quente para a mais fria
+
+        Args:
+            frame_size: Dimensões da tela (width, height)
+            scale_factors: Fatores de escala da resolução atual
+            padding: Expansão (x, y) em pixels da tela, para que botões que
+                tocam a célula caibam inteiros na região
+            max_regions: Número máximo de regiões (padrão: HIT_PRIOR)
+            min_heat: Calor mínimo da célula (padrão: HIT_PRIOR)
+
+        Returns:
+            Lista de regiões (x, y, w, h) limitadas à tela
+        """
+        max_regions = max_regions or HIT_PRIOR["max_regions"]
+        min_heat = min_heat or HIT_PRIOR["min_heat"]
+
+        flat = self.heat.ravel()
+        order = np.argsort(-flat, kind="stable")[:max_regions]
+
+        frame_width, frame_height = frame_size
+        pad_x, pad_y = padding
+        regions = []
+        for index in order:
+            if flat[index] < min_heat:
+                break
+            row, col = divmod(int(index), self.heat.shape[1])
+
+            # Célula em pixels da tela, expandida pelo padding
+            x0 = int(col * self.cell_size * scale_factors["x"]) - pad_x
+            y0 = int(row * self.cell_size * scale_factors["y"]) - pad_y
+            x1 = int((col + 1) * self.cell_size * scale_factors["x"]) + pad_x
+            y1 = int((row + 1) * self.cell_size * scale_factors["y"]) + pad_y
+
+            x0, y0 = max(0, x0), max(0, y0)
+            x1, y1 = min(frame_width, x1), min(frame_height, y1)
+            if x1 > x0 and y1 > y0:
+                regions.append((x0, y0, x1 - x0, y1 - y0))
+        return regions
+
+    def _cell_of(self, ref_x: float, ref_y: float) -> Tuple[int, int]:
+        """Célula (linha, coluna) de uma posição na resolução de referência"""
+        rows, cols = self.heat.shape
+        row = min(rows - 1, max(0, int(ref_y // self.cell_size)))
+        col = min(cols - 1, max(0, int(ref_x // self.cell_size)))
+        return row, col
+
+    def save(self, path: str) -> bool:
+        """
+        Salva o mapa em JSON
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            True se salvou com sucesso
+        """
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"cell_size": self.cell_size, "heat": self.heat.tolist()}, f)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao salvar mapa de calor: {e}")
+            return False
+
+    def load(self, path: str) -> bool:
+        """
+        Carrega um mapa salvo (ignorado se a grade mudou)
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            True se carregou com sucesso
+        """
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            heat = np.asarray(data["heat"], dtype=np.float64)
+            if data["cell_size"] != self.cell_size or heat.shape != self.heat.shape:
+                return False
+            self.heat = heat
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao carregar mapa de calor: {e}")
+            return False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do mapa
+
+        Returns:
+            Dicionário com o número de células aquecidas e o calor máximo
+        """
+        return {
+            "heatmap_cells": int(np.count_nonzero(self.heat >= HIT_PRIOR["min_heat"])),
+            "heatmap_max": float(self.heat.max()),
+        }
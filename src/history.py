@@ -0,0 +1,451 @@
+"""
+Histórico Persistente de Sessões
+Módulo responsável por gravar ciclos e cliques em SQLite, em transações em
+lote a partir de uma thread própria, e por calcular agregados do histórico
+"""
+
+import argparse
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .config import HISTORY
+    from .logs import logger
+except ImportError:
+    from config import HISTORY
+    from logs import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL,
+    resolution TEXT
+);
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    latency REAL,
+    candidates INTEGER,
+    found INTEGER NOT NULL,
+    x INTEGER, y INTEGER, w INTEGER, h INTEGER,
+    score REAL,
+    profile TEXT,
+    resolution TEXT
+);
+CREATE TABLE IF NOT EXISTS clicks (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    x INTEGER, y INTEGER, w INTEGER, h INTEGER,
+    score REAL,
+    profile TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_ts ON cycles (ts);
+CREATE INDEX IF NOT EXISTS idx_cycles_session_ts ON cycles (session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_clicks_ts ON clicks (ts);
+CREATE INDEX IF NOT EXISTS idx_clicks_session_ts ON clicks (session_id, ts);
+"""
+
+# Marcador que encerra a thread de escrita
+_STOP = object()
+
+Box = Optional[Tuple[int, int, int, int]]
+
+
+def _box_columns(box: Box) -> Tuple[Optional[int], ...]:
+    """Colunas (x, y, w, h) de uma caixa opcional"""
+    return tuple(int(v) for v in box) if box is not None else (None, None, None, None)
+
+
+class SessionHistory:
+    """
+    Gravador do histórico de sessões em SQLite
+
+    record_cycle/record_click só enfileiram a linha; a thread de escrita, com
+    a sua própria conexão, grava o que estiver pendente (até batch_size
+    linhas) em uma única transação. O id da sessão é atribuído pela thread de
+    escrita, então o laço de detecção nunca espera pelo disco.
+    """
+
+    def __init__(self, db_file: str = ""):
+        """
+        Inicializa o gravador
+
+        Args:
+            db_file: Caminho do banco SQLite (padrão: HISTORY)
+        """
+        self.db_file = db_file or HISTORY["db_file"]
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=HISTORY["queue_size"])
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.transactions = 0
+
+    def start_session(self, resolution: str = "") -> None:
+        """
+        Abre uma sessão; os ciclos e cliques seguintes pertencem a ela
+
+        Args:
+            resolution: Resolução da tela ("WxH")
+        """
+        self._enqueue(("session_start", (time.time(), resolution or None)))
+
+    def end_session(self) -> None:
+        """Fecha a sessão atual"""
+        self._enqueue(("session_end", (time.time(),)))
+
+    def record_cycle(
+        self,
+        timestamp: float,
+        latency: Optional[float],
+        candidates: Optional[int],
+        box: Box = None,
+        score: Optional[float] = None,
+        profile: Optional[str] = None,
+        resolution: Optional[str] = None,
+    ) -> None:
+        """
+        Registra o resultado de um ciclo de detecção
+
+        Args:
+            timestamp: Instante da captura (time.time())
+            latency: Duração da detecção em segundos
+            candidates: Candidatos válidos no frame (None se desconhecido)
+            box: Caixa (x, y, w, h) escolhida na tela, ou None sem botão
+            score: Score do candidato escolhido
+            profile: Perfil do candidato escolhido
+            resolution: Resolução da tela ("WxH")
+        """
+        row = (timestamp, latency, candidates, int(box is not None), *_box_columns(box))
+        self._enqueue(("cycle", row + (score, profile, resolution)))
+
+    def record_click(
+        self,
+        timestamp: float,
+        box: Box,
+        score: Optional[float] = None,
+        profile: Optional[str] = None,
+    ) -> None:
+        """
+        Registra um clique
+
+        Args:
+            timestamp: Instante do clique (time.time())
+            box: Caixa (x, y, w, h) do botão clicado
+            score: Score do candidato clicado
+            profile: Perfil do candidato clicado
+        """
+        self._enqueue(("click", (timestamp, *_box_columns(box), score, profile)))
+
+    def _enqueue(self, item: Tuple[str, Tuple[Any, ...]]) -> None:
+        """Enfileira uma linha sem esperar (descarta se a fila estiver cheia)"""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.rows_dropped += 1
+
+    def _start(self) -> None:
+        """Inicia a thread de escrita (na primeira linha)"""
+        with self._thread_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self) -> None:
+        """Laço da thread de escrita"""
+        try:
+            conn = connect(self.db_file)
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao abrir o histórico {self.db_file}: {e}")
+            conn = None
+        session_id: Optional[int] = None
+
+        while True:
+            batch, markers = self._next_batch()
+
+            if batch and conn is not None:
+                session_id = self._write_batch(conn, batch, session_id)
+
+            for marker in markers:
+                if marker is _STOP:
+                    if conn is not None:
+                        conn.close()
+                    return
+                marker.set()
+
+    def _next_batch(self) -> Tuple[List[Tuple[str, Tuple[Any, ...]]], List[Any]]:
+        """
+        Espera o próximo item e junta os que já estão na fila
+
+        O lote termina em batch_size linhas ou no primeiro marcador (flush ou
+        parada), para que o marcador só seja atendido depois das linhas anteriores.
+
+        Returns:
+            Tupla (linhas, marcadores)
+        """
+        batch: List[Tuple[str, Tuple[Any, ...]]] = []
+        markers: List[Any] = []
+
+        item = self._queue.get()
+        while True:
+            if isinstance(item, tuple):
+                batch.append(item)
+            else:
+                markers.append(item)
+            if len(batch) >= HISTORY["batch_size"] or markers:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, markers
+
+    def _write_batch(
+        self,
+        conn: sqlite3.Connection,
+        batch: List[Tuple[str, Tuple[Any, ...]]],
+        session_id: Optional[int],
+    ) -> Optional[int]:
+        """Grava um lote em uma transação e retorna o id da sessão atual"""
+        try:
+            with conn:
+                for kind, row in batch:
+                    if kind == "session_start":
+                        session_id = conn.execute(
+                            "INSERT INTO sessions (started, resolution) VALUES (?, ?)", row
+                        ).lastrowid
+                        continue
+                    if kind == "session_end":
+                        if session_id is not None:
+                            conn.execute(
+                                "UPDATE sessions SET ended = ? WHERE id = ?", (*row, session_id)
+                            )
+                        session_id = None
+                        continue
+                    if session_id is None:
+                        # Linhas fora de uma sessão aberta
+                        session_id = conn.execute(
+                            "INSERT INTO sessions (started) VALUES (?)", row[:1]
+                        ).lastrowid
+                    if kind == "cycle":
+                        conn.execute(
+                            "INSERT INTO cycles (session_id, ts, latency, candidates, found,"
+                            " x, y, w, h, score, profile, resolution)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (session_id, *row),
+                        )
+                    else:
+                        conn.execute(
+                            "INSERT INTO clicks (session_id, ts, x, y, w, h, score, profile)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (session_id, *row),
+                        )
+            self.rows_written += len(batch)
+            self.transactions += 1
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar histórico: {e}")
+            self.rows_dropped += len(batch)
+        return session_id
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Espera a gravação das linhas já enfileiradas
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            True se tudo foi gravado dentro do prazo
+        """
+        if self._thread is None:
+            return True
+
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Grava o que estiver pendente e encerra a thread de escrita"""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+
+        self._queue.put(_STOP)
+        thread.join(timeout=5.0)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do gravador
+
+        Returns:
+            Dicionário com linhas gravadas, descartadas e transações
+        """
+        return {
+            "history_rows": self.rows_written,
+            "history_dropped": self.rows_dropped,
+            "history_transactions": self.transactions,
+        }
+
+
+def connect(db_file: str) -> sqlite3.Connection:
+    """
+    Abre o banco do histórico e cria as tabelas e índices
+
+    Args:
+        db_file: Caminho do banco SQLite
+
+    Returns:
+        Conexão SQLite (WAL: leituras não bloqueiam a thread de escrita)
+    """
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def summarize(db_file: str = "", since: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Calcula agregados do histórico
+
+    Args:
+        db_file: Caminho do banco SQLite (padrão: HISTORY)
+        since: Considera apenas linhas a partir deste instante (time.time())
+
+    Returns:
+        Dicionário com sessões, ciclos, cliques, cliques por hora, percentis
+        de latência e sequências de ciclos sem botão
+    """
+    conn = connect(db_file or HISTORY["db_file"])
+    since = since or 0.0
+    try:
+        # Tempo ativo: do primeiro ao último ciclo de cada sessão
+        sessions, active_seconds = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(last_ts - first_ts), 0) FROM"
+            " (SELECT MIN(ts) AS first_ts, MAX(ts) AS last_ts FROM cycles"
+            " WHERE ts >= ? GROUP BY session_id)",
+            (since,),
+        ).fetchone()
+        cycles, found = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(found), 0) FROM cycles WHERE ts >= ?", (since,)
+        ).fetchone()
+        clicks = conn.execute("SELECT COUNT(*) FROM clicks WHERE ts >= ?", (since,)).fetchone()[0]
+
+        hourly = conn.execute(
+            "SELECT CAST(ts / 3600 AS INTEGER) AS hour, COUNT(*) FROM clicks WHERE ts >= ?"
+            " GROUP BY hour ORDER BY hour DESC LIMIT ?",
+            (since, HISTORY["report_hours"]),
+        ).fetchall()
+
+        latencies = np.fromiter(
+            (
+                row[0]
+                for row in conn.execute(
+                    "SELECT latency FROM cycles WHERE ts >= ? AND latency IS NOT NULL", (since,)
+                )
+            ),
+            dtype=np.float64,
+        )
+
+        # Sequências sem botão: ciclos com found = 0 entre dois ciclos com botão
+        streaks = [
+            row[0]
+            for row in conn.execute(
+                "SELECT COUNT(*) FROM (SELECT session_id, found,"
+                " SUM(found) OVER (PARTITION BY session_id ORDER BY ts, id) AS streak"
+                " FROM cycles WHERE ts >= ?) WHERE found = 0 GROUP BY session_id, streak",
+                (since,),
+            )
+        ]
+    finally:
+        conn.close()
+
+    hours = active_seconds / 3600
+    return {
+        "sessions": sessions,
+        "active_hours": hours,
+        "cycles": cycles,
+        "found_cycles": found,
+        "clicks": clicks,
+        "clicks_per_hour": clicks / hours if hours > 0 else 0.0,
+        "hourly_clicks": [(hour * 3600, count) for hour, count in reversed(hourly)],
+        "latency": {
+            f"p{q}": float(np.percentile(latencies, q)) if latencies.size else 0.0
+            for q in (50, 90, 99)
+        },
+        "miss_streaks": len(streaks),
+        "longest_miss_streak": max(streaks, default=0),
+        "mean_miss_streak": float(np.mean(streaks)) if streaks else 0.0,
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """
+    Imprime os agregados de summarize() no terminal
+
+    Args:
+        summary: Dicionário retornado por summarize()
+    """
+    latency = summary["latency"]
+    print("📊 Histórico de sessões")
+    print(f"   Sessões: {summary['sessions']} ({summary['active_hours']:.1f}h ativas)")
+    print(f"   Ciclos: {summary['cycles']} ({summary['found_cycles']} com botão)")
+    print(f"   Cliques: {summary['clicks']} ({summary['clicks_per_hour']:.1f}/h)")
+    print(
+        f"   Latência: p50 {latency['p50'] * 1000:.1f}ms | "
+        f"p90 {latency['p90'] * 1000:.1f}ms | p99 {latency['p99'] * 1000:.1f}ms"
+    )
+    print(
+        f"   Sequências sem botão: {summary['miss_streaks']} "
+        f"(maior {summary['longest_miss_streak']} ciclos, "
+        f"média {summary['mean_miss_streak']:.1f})"
+    )
+
+    if summary["hourly_clicks"]:
+        print("   Cliques por hora:")
+        for start, count in summary["hourly_clicks"]:
+            print(f"     {datetime.fromtimestamp(start):%Y-%m-%d %H:00}  {count}")
+
+
+def run_stats_command(args: Sequence[str]) -> int:
+    """
+    Comando `main.py stats [--db ARQUIVO] [--since HORAS]`
+
+    Args:
+        args: Argumentos após "stats"
+
+    Returns:
+        Código de saída
+    """
+    parser = argparse.ArgumentParser(prog="main.py stats", description="Agregados do histórico")
+    parser.add_argument("--db", default=HISTORY["db_file"], help="banco SQLite do histórico")
+    parser.add_argument("--since", type=float, help="apenas as últimas N horas")
+    options = parser.parse_args(list(args))
+
+    since = time.time() - options.since * 3600 if options.since else None
+    try:
+        print_summary(summarize(options.db, since))
+    except sqlite3.Error as e:
+        print(f"❌ Erro ao ler o histórico {options.db}: {e}")
+        return 1
+    return 0
@@ -0,0 +1,246 @@
+"""
+Estatísticas de Latência em Memória Fixa
+Módulo responsável por histogramas logarítmicos de durações com percentis,
+máximo e vazão em janelas deslizantes (ex.: 1 min e 15 min)
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .config import LATENCY_STATS
+except ImportError:
+    from config import LATENCY_STATS
+
+
+class LogHistogram:
+    """
+    Geometria de um histograma com baldes logarítmicos
+
+    Cada década entre min_value e max_value é dividida em buckets_per_decade
+    baldes; valores fora da faixa caem no primeiro ou no último balde. O erro
+    relativo dos percentis é limitado pela largura do balde (~6% com 20
+    baldes por década).
+    """
+
+    def __init__(
+        self,
+        min_value: float = 0.0,
+        max_value: float = 0.0,
+        buckets_per_decade: int = 0,
+    ):
+        """
+        Inicializa a geometria dos baldes
+
+        Args:
+            min_value: Menor valor distinguível, em segundos (padrão: LATENCY_STATS)
+            max_value: Maior valor distinguível, em segundos
+            buckets_per_decade: Baldes por fator de 10
+        """
+        self.min_value = min_value or LATENCY_STATS["min_value"]
+        self.max_value = max_value or LATENCY_STATS["max_value"]
+        self.buckets_per_decade = buckets_per_decade or LATENCY_STATS["buckets_per_decade"]
+
+        self._log_min = math.log10(self.min_value)
+        decades = math.log10(self.max_value) - self._log_min
+        self.size = int(math.ceil(decades * self.buckets_per_decade)) + 1
+
+        # Valor representativo de cada balde (média geométrica das bordas)
+        self.edges = 10 ** (self._log_min + np.arange(self.size + 1) / self.buckets_per_decade)
+        self.midpoints = np.sqrt(self.edges[:-1] * self.edges[1:])
+
+    def bucket_of(self, value: float) -> int:
+        """
+        Índice do balde de um valor
+
+        Args:
+            value: Duração em segundos
+
+        Returns:
+            Índice entre 0 e size - 1
+        """
+        if value <= self.min_value:
+            return 0
+        index = int((math.log10(value) - self._log_min) * self.buckets_per_decade)
+        return min(index, self.size - 1)
+
+    def percentile(self, counts: np.ndarray, q: float, max_value: float) -> float:
+        """
+        Estima um percentil a partir das contagens por balde
+
+        Args:
+            counts: Contagens por balde
+            q: Percentil entre 0 e 100
+            max_value: Maior valor observado (limita a estimativa)
+
+        Returns:
+            Valor estimado do percentil (0.0 se não há amostras)
+        """
+        total = int(counts.sum())
+        if total == 0:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * total))
+        index = int(np.searchsorted(np.cumsum(counts), rank))
+        return float(min(self.midpoints[index], max_value))
+
+
+class LatencyStats:
+    """
+    Estatísticas de durações com memória fixa e atualização O(1)
+
+    Além do histograma da sessão inteira, mantém um anel de histogramas por
+    fatia de tempo (slot_seconds); uma janela deslizante soma as fatias que
+    cobrem o seu intervalo. Leituras e escritas usam um lock, então a UI lê
+    instantâneos consistentes enquanto a thread de monitoramento grava.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(
+        self,
+        windows: Optional[Dict[str, float]] = None,
+        slot_seconds: float = 0.0,
+        histogram: Optional[LogHistogram] = None,
+    ):
+        """
+        Inicializa as estatísticas
+
+        Args:
+            windows: Janelas deslizantes {nome: segundos} (padrão: LATENCY_STATS)
+            slot_seconds: Duração de cada fatia do anel
+            histogram: Geometria dos baldes (padrão: LogHistogram())
+        """
+        self.windows = dict(windows or LATENCY_STATS["windows"])
+        self.slot_seconds = slot_seconds or LATENCY_STATS["slot_seconds"]
+        self.histogram = histogram or LogHistogram()
+
+        slots = int(math.ceil(max(self.windows.values()) / self.slot_seconds)) + 1
+        self._slot_counts = np.zeros((slots, self.histogram.size), dtype=np.int64)
+        self._slot_max = np.zeros(slots, dtype=np.float64)
+        self._slot_ids = np.full(slots, -1, dtype=np.int64)
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta todas as amostras"""
+        with self._lock:
+            self._slot_counts[:] = 0
+            self._slot_max[:] = 0.0
+            self._slot_ids[:] = -1
+            self._counts = np.zeros(self.histogram.size, dtype=np.int64)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+            self._start = time.monotonic()
+
+    def record(self, value: float, now: Optional[float] = None) -> None:
+        """
+        Registra uma duração
+
+        Args:
+            value: Duração em segundos
+            now: Instante monotônico da amostra (padrão: time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        slot = int(now // self.slot_seconds)
+        row = slot % len(self._slot_ids)
+        bucket = self.histogram.bucket_of(value)
+
+        with self._lock:
+            # Fatia reaproveitada: descarta o conteúdo antigo
+            if self._slot_ids[row] != slot:
+                self._slot_ids[row] = slot
+                self._slot_counts[row] = 0
+                self._slot_max[row] = 0.0
+
+            self._slot_counts[row, bucket] += 1
+            if value > self._slot_max[row]:
+                self._slot_max[row] = value
+
+            self._counts[bucket] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    @property
+    def mean(self) -> float:
+        """Duração média da sessão"""
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Retorna um instantâneo consistente das estatísticas
+
+        Args:
+            now: Instante monotônico de referência (padrão: time.monotonic())
+
+        Returns:
+            Dicionário com count, mean, p50, p90, p99, max e throughput
+            (amostras/s) da sessão e, em "windows", os mesmos valores por janela
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            counts = self._counts.copy()
+            slot_counts = self._slot_counts.copy()
+            slot_max = self._slot_max.copy()
+            slot_ids = self._slot_ids.copy()
+            count, total, max_value, start = self.count, self.total, self.max, self._start
+
+        summary = self._summarize(counts, max_value, now - start)
+        summary["mean"] = total / count if count else 0.0
+
+        current_slot = int(now // self.slot_seconds)
+        summary["windows"] = {}
+        for name, seconds in self.windows.items():
+            first_slot = current_slot - int(math.ceil(seconds / self.slot_seconds)) + 1
+            rows = (slot_ids >= first_slot) & (slot_ids <= current_slot)
+            window_max = float(slot_max[rows].max()) if rows.any() else 0.0
+            summary["windows"][name] = self._summarize(
+                slot_counts[rows].sum(axis=0), window_max, min(seconds, now - start)
+            )
+        return summary
+
+    def cumulative_buckets(
+        self, bounds: Sequence[float]
+    ) -> Tuple[List[Tuple[float, int]], float, int]:
+        """
+        Contagens acumuladas da sessão em limites fixos (formato Prometheus)
+
+        Cada balde logarítmico é atribuído ao primeiro limite que cobre a sua
+        borda superior, então as contagens têm o erro da largura do balde.
+
+        Args:
+            bounds: Limites superiores em segundos, em ordem crescente
+
+        Returns:
+            Tupla ([(limite, contagem acumulada), ...], soma, contagem total)
+        """
+        with self._lock:
+            counts = self._counts.copy()
+            count, total = self.count, self.total
+
+        cumulative = np.cumsum(counts)
+        upper_edges = self.histogram.edges[1:]
+        buckets = []
+        for bound in bounds:
+            index = int(np.searchsorted(upper_edges, bound, side="right"))
+            buckets.append((bound, int(cumulative[index - 1]) if index > 0 else 0))
+        return buckets, total, count
+
+    def _summarize(self, counts: np.ndarray, max_value: float, elapsed: float) -> Dict[str, Any]:
+        """Percentis, máximo e vazão de um conjunto de contagens"""
+        count = int(counts.sum())
+        summary: Dict[str, Any] = {
+            "count": count,
+            "max": max_value,
+            "throughput": count / elapsed if elapsed > 0 else 0.0,
+        }
+        for q in self.PERCENTILES:
+            summary[f"p{q}"] = self.histogram.percentile(counts, q, max_value)
+        return summary
@@ -0,0 +1,281 @@
+"""
+Log Estruturado Assíncrono
+Módulo responsável por gravar registros JSON lines em lotes, a partir de uma
+thread própria, com filtro de nível e rotação por tamanho durante a execução
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+try:
+    from .config import LOGGING
+except ImportError:
+    from config import LOGGING
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+# Marcador que encerra a thread de escrita
+_STOP = object()
+
+Record = Tuple[float, int, str, Dict[str, Any], str]
+
+
+class Logger:
+    """
+    Logger estruturado com escrita em segundo plano
+
+    debug/info/warning/error só enfileiram o registro; a thread de escrita
+    grava o que estiver pendente (até batch_size registros) em uma única
+    escrita, com o arquivo mantido aberto, e rotaciona quando ele passa de
+    max_size. Um nível desativado retorna na primeira comparação, sem formatar
+    nada; mensagens caras de montar podem ser protegidas com is_enabled_for.
+    """
+
+    def __init__(
+        self,
+        log_file: str = "",
+        level: Optional[str] = None,
+        max_size: Optional[int] = None,
+        backup_count: Optional[int] = None,
+        console: Optional[bool] = None,
+    ):
+        """
+        Inicializa o logger
+
+        Args:
+            log_file: Arquivo de log (padrão: LOGGING)
+            level: Nível mínimo gravado (DEBUG, INFO, WARNING ou ERROR)
+            max_size: Tamanho máximo do arquivo em bytes antes de rotacionar
+            backup_count: Arquivos rotacionados mantidos (0 descarta o arquivo cheio)
+            console: Repete as mensagens no terminal
+        """
+        self.log_file = log_file or LOGGING["log_file"]
+        self.max_size = LOGGING["max_size"] if max_size is None else max_size
+        self.backup_count = LOGGING["backup_count"] if backup_count is None else backup_count
+        self.console = LOGGING["console"] if console is None else console
+        self.set_level(LOGGING["level"] if level is None else level)
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=LOGGING["queue_size"])
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._closed = False
+
+        self.records_written = 0
+        self.records_dropped = 0
+        self.rotations = 0
+
+    def set_level(self, level: str) -> None:
+        """
+        Define o nível mínimo gravado
+
+        Args:
+            level: DEBUG, INFO, WARNING ou ERROR
+        """
+        self.level = LEVELS[level.upper()]
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Indica se registros do nível informado são gravados"""
+        return level >= self.level
+
+    def debug(self, message: str, **fields: Any) -> None:
+        """Log de depuração"""
+        if self.level <= DEBUG:
+            self._enqueue(DEBUG, message, fields)
+
+    def info(self, message: str, **fields: Any) -> None:
+        """Log de informação"""
+        if self.level <= INFO:
+            self._enqueue(INFO, message, fields)
+
+    def warning(self, message: str, **fields: Any) -> None:
+        """Log de aviso"""
+        if self.level <= WARNING:
+            self._enqueue(WARNING, message, fields)
+
+    def error(self, message: str, **fields: Any) -> None:
+        """Log de erro"""
+        if self.level <= ERROR:
+            self._enqueue(ERROR, message, fields)
+
+    def _enqueue(self, level: int, message: str, fields: Dict[str, Any]) -> None:
+        """Enfileira um registro sem esperar (descarta se a fila estiver cheia)"""
+        record = (time.time(), level, message, fields, threading.current_thread().name)
+        if self._thread is None and not self._start():
+            # Logger já encerrado (ex.: close do atexit): grava direto, sem nova thread
+            with self._thread_lock:
+                self._write_batch([record])
+                self._close_file()
+            return
+
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.records_dropped += 1
+
+    def _start(self) -> bool:
+        """
+        Inicia a thread de escrita (no primeiro registro)
+
+        Returns:
+            False se o logger já foi encerrado e a thread não deve voltar
+        """
+        with self._thread_lock:
+            if self._closed:
+                return False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            return True
+
+    def _run(self) -> None:
+        """Laço da thread de escrita"""
+        while True:
+            batch: List[Record] = []
+            markers: List[Any] = []
+
+            item = self._queue.get()
+            while True:
+                if isinstance(item, tuple):
+                    batch.append(item)
+                else:
+                    markers.append(item)
+                if len(batch) >= LOGGING["batch_size"] or markers:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+
+            for marker in markers:
+                if marker is _STOP:
+                    self._close_file()
+                    return
+                marker.set()
+
+    def _write_batch(self, batch: List[Record]) -> None:
+        """Grava um lote de registros em uma única escrita"""
+        if self.console:
+            for _, _, message, _, _ in batch:
+                print(message)
+
+        try:
+            if self._file is None:
+                self._file = open(self.log_file, "a", encoding="utf-8")
+            elif self._file.tell() >= self.max_size:
+                self._rotate()
+                self._file = open(self.log_file, "a", encoding="utf-8")
+
+            self._file.write("".join(self._format(record) for record in batch))
+            self._file.flush()
+            self.records_written += len(batch)
+        except Exception as e:
+            print(f"Erro ao escrever log: {e}")
+            self._close_file()
+
+    @staticmethod
+    def _format(record: Record) -> str:
+        """Converte um registro em uma linha JSON"""
+        timestamp, level, message, fields, thread_name = record
+        entry = {
+            "ts": datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+            "level": LEVEL_NAMES[level],
+            "thread": thread_name,
+            "msg": message,
+            **fields,
+        }
+        return json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+    def _rotate(self) -> None:
+        """Renomeia log -> log.1 -> log.2 ... (o arquivo é reaberto em seguida)"""
+        self._close_file()
+        if self.backup_count <= 0:
+            # Sem backups: o arquivo cheio é descartado
+            os.remove(self.log_file)
+            self.rotations += 1
+            return
+
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.log_file}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file}.{index + 1}")
+        os.replace(self.log_file, f"{self.log_file}.1")
+        self.rotations += 1
+
+    def _close_file(self) -> None:
+        """Fecha o arquivo (reaberto no próximo lote)"""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """
+        Espera a gravação dos registros já enfileirados
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            True se tudo foi gravado dentro do prazo
+        """
+        if self._thread is None:
+            return True
+
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """
+        Grava o que estiver pendente e encerra a thread de escrita
+
+        Registros posteriores (ex.: durante o encerramento do interpretador)
+        são gravados diretamente, sem iniciar outra thread.
+        """
+        with self._thread_lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+
+            self._queue.put(_STOP)
+            thread.join(timeout=2.0)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do logger
+
+        Returns:
+            Dicionário com registros gravados, descartados e rotações
+        """
+        return {
+            "log_records": self.records_written,
+            "log_dropped": self.records_dropped,
+            "log_rotations": self.rotations,
+        }
+
+
+# Instância global do logger
+logger = Logger()
@@ -0,0 +1,337 @@
+"""
+Endpoint de Métricas no Formato Prometheus
+Módulo responsável por formatar as estatísticas do monitoramento como texto
+do Prometheus e servi-las em HTTP local (porta TCP ou socket Unix)
+"""
+
+import os
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .config import METRICS_ENDPOINT
+    from .logs import logger
+except ImportError:
+    from config import METRICS_ENDPOINT
+    from logs import logger
+
+# Contadores: chave em get_statistics() -> (nome da métrica, descrição)
+COUNTERS = {
+    "click_count": ("clicks_total", "Cliques executados na sessão"),
+    "total_detections": ("detections_total", "Detecções executadas"),
+    "successful_detections": ("successful_detections_total", "Detecções com botão encontrado"),
+    "precheck_rejects": ("precheck_rejects_total", "Frames rejeitados pela pré-verificação"),
+    "prior_hits": ("prior_hits_total", "Acertos nas regiões quentes do mapa de cliques"),
+    "full_sweeps": ("full_sweeps_total", "Varreduras completas da tela"),
+    "local_rechecks": ("local_rechecks_total", "Reverificações na região rastreada"),
+    "full_scans": ("full_scans_total", "Varreduras completas do detector"),
+    "template_hits": ("template_hits_total", "Acertos de template"),
+    "template_misses": ("template_misses_total", "Falhas de template"),
+    "target_verification_failures": (
+        "target_verification_failures_total",
+        "Candidatos rejeitados na verificação do alvo",
+    ),
+    "ocr_rejections": ("ocr_rejections_total", "Candidatos rejeitados pelo OCR"),
+    "scans_saved": ("predicted_scans_skipped_total", "Varreduras evitadas pelo agendamento"),
+    "cycle_overruns": ("cycle_overruns_total", "Ciclos acima do tempo limite"),
+    "pipeline_restarts": ("pipeline_restarts_total", "Reinicializações da detecção"),
+    "click_verifications": ("click_verifications_total", "Cliques conferidos após o clique"),
+    "click_verification_failures": (
+        "click_verification_failures_total",
+        "Cliques após os quais o botão continuou visível",
+    ),
+}
+
+# Medidores: chave -> (nome, descrição, fator aplicado ao valor)
+GAUGES = {
+    "is_monitoring": ("monitoring", "1 se o monitoramento está ativo", 1.0),
+    "session_time": ("session_seconds", "Duração da sessão atual", 1.0),
+    "monitor_interval": ("monitor_interval_seconds", "Intervalo pedido entre ciclos", 1.0),
+    "current_interval": ("current_interval_seconds", "Intervalo efetivo até o próximo ciclo", 1.0),
+    "success_rate": ("detection_success_ratio", "Fração de detecções com botão", 0.01),
+    "precheck_reject_rate": (
+        "precheck_reject_ratio",
+        "Fração de frames rejeitados pela pré-verificação",
+        0.01,
+    ),
+    "incremental_tile_ratio": (
+        "tile_processed_ratio",
+        "Fração de blocos reprocessados na detecção incremental",
+        1.0,
+    ),
+    "ocr_cache_hit_rate": ("ocr_cache_hit_ratio", "Fração de consultas do OCR no cache", 1.0),
+    "prediction_accuracy": ("prediction_accuracy_ratio", "Acertos da janela prevista", 0.01),
+    "click_confirmation_rate": (
+        "click_confirmation_ratio",
+        "Fração dos cliques conferidos em que o botão sumiu",
+        0.01,
+    ),
+    "cpu_usage": ("cpu_usage_percent", "Uso de CPU do processo", 1.0),
+    "cpu_budget": ("cpu_budget_percent", "Orçamento de CPU", 1.0),
+    "detection_scale": ("detection_scale", "Escala atual da detecção", 1.0),
+    "seconds_since_success": (
+        "seconds_since_success",
+        "Segundos desde o último ciclo bem-sucedido",
+        1.0,
+    ),
+}
+
+
+def _escape(value: Any) -> str:
+    """Escapa o valor de um rótulo"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    """Formata um conjunto de rótulos ({} vazio vira string vazia)"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    """Formata um número no padrão do Prometheus"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Writer:
+    """Acumula as linhas do texto de exposição"""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.lines: List[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str) -> str:
+        """Escreve HELP/TYPE de uma família e retorna o nome completo"""
+        full_name = f"{self.namespace}_{name}"
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} {metric_type}")
+        return full_name
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Escreve uma amostra"""
+        self.lines.append(f"{name}{_labels(labels or {})} {_number(value)}")
+
+
+def _write_scalars(out: _Writer, stats: Dict[str, Any]) -> None:
+    """Escreve os contadores e medidores presentes nas estatísticas"""
+    for key, (name, help_text) in COUNTERS.items():
+        if stats.get(key) is not None:
+            out.sample(out.family(name, "counter", help_text), stats[key])
+
+    for key, (name, help_text, factor) in GAUGES.items():
+        if stats.get(key) is not None:
+            out.sample(out.family(name, "gauge", help_text), float(stats[key]) * factor)
+
+
+def _write_workers(out: _Writer, workers: Dict[str, Any]) -> None:
+    """Escreve os frames do pool de detecção por estado"""
+    name = out.family("worker_frames_total", "counter", "Frames do pool de detecção")
+    for state in ("submitted", "completed", "dropped"):
+        out.sample(name, workers[f"{state}_frames"], {"state": state})
+
+
+def _write_histograms(
+    out: _Writer, histograms: Dict[str, Tuple[List[Tuple[float, int]], float, int]]
+) -> None:
+    """Escreve os histogramas de duração (baldes acumulados, soma e contagem)"""
+    for hist_name, (buckets, total, count) in histograms.items():
+        name = out.family(hist_name, "histogram", "Duração em segundos")
+        for bound, cumulative in buckets:
+            out.sample(f"{name}_bucket", cumulative, {"le": _number(bound)})
+        out.sample(f"{name}_bucket", count, {"le": "+Inf"})
+        out.sample(f"{name}_sum", total)
+        out.sample(f"{name}_count", count)
+
+
+def _write_operations(out: _Writer, operations: Dict[str, Dict[str, Any]]) -> None:
+    """Escreve os quantis das operações instrumentadas pelo profiler"""
+    name = out.family("operation_seconds", "summary", "Duração das operações instrumentadas")
+    for operation, op_stats in operations.items():
+        for q in (50, 90, 99):
+            labels = {"operation": operation, "quantile": _number(q / 100)}
+            out.sample(name, op_stats[f"p{q}"], labels)
+        out.sample(f"{name}_sum", op_stats["total"], {"operation": operation})
+        out.sample(f"{name}_count", op_stats["count"], {"operation": operation})
+
+
+def _write_resolution(out: _Writer, resolution: Dict[str, Any]) -> None:
+    """Escreve a resolução atual, a de referência e os fatores de escala"""
+    width, height = resolution["current_resolution"].split("x")
+    name = out.family("screen_resolution_info", "gauge", "Resolução atual e de referência")
+    labels = {
+        "current": resolution["current_resolution"],
+        "reference": resolution["reference_resolution"],
+    }
+    if resolution.get("dpi_scaling") is not None:
+        labels["dpi_scaling"] = str(resolution["dpi_scaling"]).lower()
+    out.sample(name, 1, labels)
+    out.sample(out.family("screen_width_pixels", "gauge", "Largura da tela"), int(width))
+    out.sample(out.family("screen_height_pixels", "gauge", "Altura da tela"), int(height))
+    name = out.family("resolution_scale_factor", "gauge", "Escala em relação à referência")
+    for axis in ("x", "y"):
+        out.sample(name, resolution[f"scale_factor_{axis}"], {"axis": axis})
+
+
+def format_prometheus(
+    stats: Dict[str, Any],
+    histograms: Optional[Dict[str, Tuple[List[Tuple[float, int]], float, int]]] = None,
+    resolution: Optional[Dict[str, Any]] = None,
+    namespace: str = "",
+) -> str:
+    """
+    Formata as estatísticas como texto de exposição do Prometheus
+
+    Args:
+        stats: Dicionário de MonitoringManager.get_statistics()
+        histograms: {nome: (baldes acumulados, soma, contagem)} em segundos
+        resolution: Dicionário de ResolutionAdapter.get_resolution_info()
+        namespace: Prefixo das métricas (padrão: METRICS_ENDPOINT)
+
+    Returns:
+        Texto no formato 0.0.4
+    """
+    out = _Writer(namespace or METRICS_ENDPOINT["namespace"])
+
+    _write_scalars(out, stats)
+    if stats.get("workers"):
+        _write_workers(out, stats["workers"])
+    _write_histograms(out, histograms or {})
+    if stats.get("profiler"):
+        _write_operations(out, stats["profiler"])
+    if resolution and "current_resolution" in resolution:
+        _write_resolution(out, resolution)
+
+    return "\n".join(out.lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Responde GET /metrics com o texto gerado pelo provedor do servidor"""
+
+    # Cliente lento não prende a thread da requisição
+    timeout = 5
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        try:
+            body = self.server.provider().encode("utf-8")
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Conexões por socket Unix não têm (host, porta)
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Sem log por requisição (scrapes a cada poucos segundos)
+        pass
+
+
+class _TcpMetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixMetricsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """
+    Servidor HTTP local das métricas em uma thread própria
+
+    Cada scrape roda em uma thread de requisição e só lê estatísticas já
+    coletadas; o laço de detecção nunca espera pelo servidor.
+    """
+
+    def __init__(
+        self,
+        provider: Callable[[], str],
+        host: str = "",
+        port: Optional[int] = None,
+        unix_socket: Optional[str] = None,
+    ):
+        """
+        Inicializa o servidor
+
+        Args:
+            provider: Função que gera o texto das métricas
+            host: Endereço de escuta (padrão: METRICS_ENDPOINT)
+            port: Porta TCP (0 = porta livre escolhida pelo sistema)
+            unix_socket: Caminho de socket Unix (substitui host/porta)
+        """
+        self.provider = provider
+        self.host = host or METRICS_ENDPOINT["host"]
+        self.port = METRICS_ENDPOINT["port"] if port is None else port
+        self.unix_socket = unix_socket or METRICS_ENDPOINT["unix_socket"]
+
+        self._server: Optional[socketserver.BaseServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Optional[str]:
+        """Endereço em que o servidor está escutando"""
+        if self._server is None:
+            return None
+        if self.unix_socket:
+            return f"unix:{self.unix_socket}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> bool:
+        """
+        Abre o socket e inicia a thread do servidor
+
+        Returns:
+            True se o servidor está escutando
+        """
+        if self._server is not None:
+            return True
+
+        try:
+            if self.unix_socket:
+                if os.path.exists(self.unix_socket):
+                    os.unlink(self.unix_socket)
+                server = _UnixMetricsServer(self.unix_socket, _MetricsHandler)
+            else:
+                server = _TcpMetricsServer((self.host, self.port), _MetricsHandler)
+        except OSError as e:
+            logger.error(f"❌ Erro ao iniciar o endpoint de métricas: {e}")
+            return False
+
+        server.provider = self.provider
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"📈 Métricas disponíveis em {self.address}")
+        return True
+
+    def stop(self) -> None:
+        """Para o servidor e fecha o socket"""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self.unix_socket and os.path.exists(self.unix_socket):
+            os.unlink(self.unix_socket)
+
+        self._server = None
+        self._thread = None
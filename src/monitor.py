@@ -6,7 +6,7 @@ Módulo responsável pelo gerenciamento do monitoramento e cliques automáticos
 import os
 import threading
 import time
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Conditional imports for CI/test environments
 try:
@@ -22,11 +22,59 @@ except ImportError:
     pyautogui = mock.MagicMock()
 
 try:
-    from .config import MESSAGES, MONITORING_CONFIG
+    from .config import (
+        CAPTURE_RECORDING,
+        CLICK_METRICS,
+        CPU_BUDGET,
+        CYCLE_METRICS,
+        HISTORY,
+        HIT_PRIOR,
+        MESSAGES,
+        METRICS_ENDPOINT,
+        MONITORING_CONFIG,
+        MULTI_TARGET,
+        PERFORMANCE_CONFIG,
+        PREDICTIVE_SCHEDULING,
+    )
+    from .cycle_metrics import CycleMetricsFile
     from .detector import BlueButtonDetector
+    from .governor import CpuGovernor
+    from .heatmap import HitHeatmap
+    from .history import SessionHistory
+    from .latency import LatencyStats
+    from .metrics_server import MetricsServer, format_prometheus
+    from .recording import CaptureRecorder, CaptureReplay
+    from .scheduler import AppearancePredictor
+    from .utils import logger, profiler
+    from .watchdog import CycleWatchdog
+    from .workers import DetectionWorkerPool
 except ImportError:
-    from config import MESSAGES, MONITORING_CONFIG
+    from config import (
+        CAPTURE_RECORDING,
+        CLICK_METRICS,
+        CPU_BUDGET,
+        CYCLE_METRICS,
+        HISTORY,
+        HIT_PRIOR,
+        MESSAGES,
+        METRICS_ENDPOINT,
+        MONITORING_CONFIG,
+        MULTI_TARGET,
+        PERFORMANCE_CONFIG,
+        PREDICTIVE_SCHEDULING,
+    )
+    from cycle_metrics import CycleMetricsFile
     from detector import BlueButtonDetector
+    from governor import CpuGovernor
+    from heatmap import HitHeatmap
+    from history import SessionHistory
+    from latency import LatencyStats
+    from metrics_server import MetricsServer, format_prometheus
+    from recording import CaptureRecorder, CaptureReplay
+    from scheduler import AppearancePredictor
+    from utils import logger, profiler
+    from watchdog import CycleWatchdog
+    from workers import DetectionWorkerPool
 
 
 class MonitoringManager:
@@ -42,18 +90,93 @@ class MonitoringManager:
         self.is_monitoring = False
         self.monitor_thread: Optional[threading.Thread] = None
 
+        # Watchdog do prazo de cada ciclo (criado a cada sessão)
+        self.watchdog: Optional[CycleWatchdog] = None
+        self._restart_lock = threading.Lock()
+
         # Configurações
         self.monitor_interval = MONITORING_CONFIG["default_interval"]
+        self.current_interval = self.monitor_interval
+        self._last_wait = 0.0  # Espera real antes do ciclo atual (métricas por ciclo)
         self.debug_mode = False
+        self.detection_workers = PERFORMANCE_CONFIG["detection_workers"]
 
         # Estatísticas
         self.click_count = 0
         self.session_start_time: Optional[float] = None
-        self.detection_times = []
+        self.detection_latency = LatencyStats()
+        self.click_seconds = 0.0
+
+        # Latência até o clique: desde o primeiro frame com o botão e desde o
+        # aparecimento estimado (meio do caminho entre o último frame sem botão
+        # e o primeiro com ele)
+        self.first_seen_latency = LatencyStats()
+        self.appear_latency = LatencyStats()
+        self._last_frame_time = 0.0
+        self._last_empty_frame_time: Optional[float] = None
+        self._visible_since: Optional[float] = None
+        self._visible_clicked = False
+
+        # Verificação após o clique (o botão clicado deveria sumir)
+        self.click_verifications = 0
+        self.click_verification_failures = 0
 
         # Detector de botões
         self.detector: Optional[BlueButtonDetector] = None
 
+        # Replay de uma gravação no lugar da tela, ou gravação das capturas
+        self.frame_source: Optional[CaptureReplay] = None
+        self.capture_recorder: Optional[CaptureRecorder] = None
+
+        # Pool de processos de detecção (apenas se detection_workers > 0)
+        self.worker_pool: Optional[DetectionWorkerPool] = None
+        self.last_click_time = 0.0
+
+        # Mapa de calor de cliques (regiões quentes varridas primeiro)
+        self.heatmap: Optional[HitHeatmap] = None
+        if HIT_PRIOR["enabled"]:
+            self.heatmap = HitHeatmap()
+            if HIT_PRIOR["heatmap_file"]:
+                self.heatmap.load(HIT_PRIOR["heatmap_file"])
+        self.prior_hits = 0
+        self.full_sweeps = 0
+        self._cycles_since_sweep = 0
+
+        # Agendamento preditivo (varredura lenta até a janela prevista abrir)
+        self.predictor: Optional[AppearancePredictor] = None
+        if PREDICTIVE_SCHEDULING["enabled"]:
+            self.predictor = AppearancePredictor()
+
+        # Governador de CPU (intervalo e escala da detecção dentro do orçamento)
+        self.governor: Optional[CpuGovernor] = None
+        if CPU_BUDGET["enabled"]:
+            # A escala só se aplica a detect_button (um alvo, sem mapa de calor nem workers)
+            scalable = not (
+                MULTI_TARGET["enabled"] or HIT_PRIOR["enabled"] or self.detection_workers
+            )
+            self.governor = CpuGovernor(scales=None if scalable else (1.0,))
+
+        # Histórico persistente de ciclos e cliques (SQLite, gravado em segundo plano)
+        self.history: Optional[SessionHistory] = None
+        if HISTORY["enabled"]:
+            self.history = SessionHistory()
+
+        # Registros brutos por ciclo em arquivo mapeado em memória (post-mortem)
+        self.cycle_metrics: Optional[CycleMetricsFile] = None
+        if CYCLE_METRICS["enabled"]:
+            try:
+                self.cycle_metrics = CycleMetricsFile()
+            except (OSError, ValueError) as e:
+                logger.error(f"Erro ao abrir métricas por ciclo: {e}")
+
+        # Endpoint de métricas (iniciado pela aplicação com start_metrics_server)
+        self.metrics_server: Optional[MetricsServer] = None
+
+        # Estado mais recente para a UI (entregue pelo timer da UI em flush_ui_updates)
+        self._ui_lock = threading.Lock()
+        self._ui_state: Dict[str, Any] = {}
+        self._ui_delivered: Dict[str, Any] = {}
+
         # Callbacks para UI
         self.status_callback: Optional[Callable[[str, str], None]] = None
         self.click_callback: Optional[Callable[[int], None]] = None
@@ -104,8 +227,21 @@ class MonitoringManager:
             self.monitor_interval = interval
         self.debug_mode = debug_mode
 
+        # Fonte dos frames (replay ou tela, opcionalmente gravada)
+        try:
+            self._open_capture_backends()
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Erro ao abrir gravação de captura: {e}")
+            return False
+
         # Inicializar detector
-        self.detector = BlueButtonDetector(debug_mode=self.debug_mode)
+        self.detector = self._create_detector()
+
+        # Workers de detecção (os processos sobem com o primeiro frame)
+        if self.detection_workers > 0:
+            self.worker_pool = DetectionWorkerPool(
+                self.detection_workers, debug_mode=self.debug_mode
+            )
 
         # Resetar estatísticas
         self._reset_statistics()
@@ -113,18 +249,90 @@ class MonitoringManager:
         # Iniciar monitoramento
         self.is_monitoring = True
         self.session_start_time = time.time()
+        if self.history:
+            self.history.start_session(self._resolution_label())
 
         # Atualizar status
         self._update_status(MESSAGES["status"]["monitoring"], "#F18F01")  # warning color
 
-        # Iniciar thread de monitoramento
+        # Watchdog e thread de monitoramento
+        self.watchdog = CycleWatchdog(on_restart=self._restart_pipeline)
+        self.watchdog.start()
+        self._start_monitor_thread()
+
+        return True
+
+    def _open_capture_backends(self) -> None:
+        """Abre o replay ou o gravador de capturas conforme CAPTURE_RECORDING"""
+        if CAPTURE_RECORDING["replay_file"]:
+            self.frame_source = CaptureReplay(CAPTURE_RECORDING["replay_file"])
+            logger.info(f"🎞️ Reproduzindo gravação {CAPTURE_RECORDING['replay_file']}")
+        elif CAPTURE_RECORDING["record"]:
+            self.capture_recorder = CaptureRecorder(screen_resolution=tuple(pyautogui.size()))
+
+    def _close_capture_backends(self) -> None:
+        """Grava os frames pendentes e fecha o replay"""
+        if self.capture_recorder:
+            self.capture_recorder.close()
+            self.capture_recorder = None
+        if self.frame_source:
+            self.frame_source.close()
+            self.frame_source = None
+
+    def _create_detector(self) -> BlueButtonDetector:
+        """Cria um detector ligado à fonte de frames e ao gravador atuais"""
+        return BlueButtonDetector(
+            debug_mode=self.debug_mode,
+            frame_source=self.frame_source,
+            recorder=self.capture_recorder,
+        )
+
+    def _sleep(self, seconds: float) -> None:
+        """Espera entre ações; no replay o ritmo vem dos instantes gravados"""
+        if self.frame_source is None:
+            time.sleep(seconds)
+
+    def _start_monitor_thread(self) -> None:
+        """Cria e inicia a thread de monitoramento (substitui a atual, se houver)"""
+        # O primeiro ciclo da thread não espera
+        self._last_wait = 0.0
         self.monitor_thread = threading.Thread(
             target=self._monitor_worker,
             daemon=MONITORING_CONFIG.get("daemon_threads", True),
         )
         self.monitor_thread.start()
 
-        return True
+    def _is_abandoned_thread(self) -> bool:
+        """Indica se a thread chamadora foi substituída pelo watchdog"""
+        current = threading.current_thread()
+        return self.monitor_thread is not None and current is not self.monitor_thread
+
+    def _restart_pipeline(self) -> None:
+        """
+        Reinicia captura e detector após estouros seguidos do prazo do ciclo
+
+        Uma thread travada não pode ser interrompida em Python: ela é
+        abandonada (sai do laço e não clica ao voltar) e uma nova thread
+        assume com detector e workers novos.
+        """
+        with self._restart_lock:
+            if not self.is_monitoring:
+                return
+
+            logger.warning("🔄 Ciclos travados seguidos: reiniciando captura e detector")
+            old_detector, old_pool = self.detector, self.worker_pool
+
+            self.detector = self._create_detector()
+            if self.detection_workers > 0:
+                self.worker_pool = DetectionWorkerPool(
+                    self.detection_workers, debug_mode=self.debug_mode
+                )
+            self._start_monitor_thread()
+
+            if old_pool:
+                old_pool.stop()
+            if old_detector:
+                old_detector.shutdown()
 
     def stop_monitoring(self) -> None:
         """Para o monitoramento"""
@@ -133,6 +341,10 @@ class MonitoringManager:
 
         self.is_monitoring = False
 
+        # Sem reinicializações durante a parada
+        if self.watchdog:
+            self.watchdog.stop()
+
         # Aguardar thread terminar
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=1.0)
@@ -140,9 +352,26 @@ class MonitoringManager:
         # Atualizar status
         self._update_status(MESSAGES["status"]["stopped"], "#C73E1D")  # danger color
 
+        # Encerrar workers de detecção
+        if self.worker_pool:
+            self.worker_pool.stop()
+
+        if self.detector:
+            self.detector.shutdown()
+
+        if self.heatmap is not None and HIT_PRIOR["heatmap_file"]:
+            self.heatmap.save(HIT_PRIOR["heatmap_file"])
+
+        if self.history:
+            self.history.end_session()
+        if self.cycle_metrics:
+            self.cycle_metrics.flush()
+        self._close_capture_backends()
+
         # Limpar referências
         self.monitor_thread = None
         self.detector = None
+        self.worker_pool = None
 
     def _check_emergency_stop(self) -> bool:
         """
@@ -166,53 +395,356 @@ class MonitoringManager:
     def _monitor_worker(self) -> None:
         """Worker thread para o monitoramento contínuo"""
         try:
-            while self.is_monitoring:
-                self._monitoring_cycle()
-                time.sleep(self.monitor_interval)
+            while self.is_monitoring and not self._is_abandoned_thread():
+                if self.watchdog:
+                    self.watchdog.begin_cycle()
+                success = self._monitoring_cycle()
+
+                # Thread abandonada pelo watchdog durante o ciclo
+                if self._is_abandoned_thread():
+                    break
+                if self.watchdog:
+                    self.watchdog.end_cycle(success)
+
+                if self.frame_source is not None and self.frame_source.finished:
+                    logger.info("🎞️ Replay concluído")
+                    break
+                interval = self._next_interval()
+                wait_start = time.monotonic()
+                self._sleep(interval)
+                self._last_wait = time.monotonic() - wait_start
 
         except pyautogui.FailSafeException:
             # Parada de emergência acionada
             self._handle_emergency_stop()
         except Exception as e:
-            print(f"Erro no monitoramento: {e}")
+            logger.error(f"Erro no monitoramento: {e}")
         finally:
-            # Garantir que o monitoramento seja parado
-            if self.is_monitoring:
+            # Garantir que o monitoramento seja parado (threads abandonadas só saem)
+            if self.is_monitoring and not self._is_abandoned_thread():
                 self._schedule_ui_update(self.stop_monitoring)
 
-    def _monitoring_cycle(self) -> None:
-        """Executa um ciclo completo de monitoramento"""
+    @profiler.profile()
+    def _monitoring_cycle(self) -> bool:
+        """
+        Executa um ciclo completo de monitoramento
+
+        Returns:
+            True se o ciclo terminou sem erro
+        """
         if not self.detector:
-            return
+            return False
 
+        success = True
+        cycle_cpu_start = time.process_time()
+        cycle_start = time.monotonic()
+        # Contadores no início do ciclo (métricas por ciclo)
+        baseline = (self.detector.capture_seconds, self.click_seconds, self.click_count)
+
+        button_info = None
+        targets: List[Dict[str, Any]] = []
+        detection_time = float("nan")
+        capture_end: Optional[float] = None
         try:
             # Verificar parada de emergência ANTES de qualquer operação
             if self._check_emergency_stop():
                 self._handle_emergency_stop()
-                return
+                return True
+
+            button_info, targets, detection_time = self._run_detection()
+            # Capturas da verificação pós-clique não entram no estágio de captura
+            capture_end = self.detector.capture_seconds
+
+            outcome = self._act_on_detection(button_info, targets)
+            if outcome is not None:
+                return outcome
+
+            # Atualizar estatísticas
+            self._update_statistics()
 
-            # Medir tempo de detecção
-            detection_start = time.time()
+        except Exception as e:
+            logger.error(f"Erro no ciclo de monitoramento: {e}")
+            success = False
+
+        cycle_cpu = time.process_time() - cycle_cpu_start
+        cycle_wall = time.monotonic() - cycle_start
+        if self.predictor:
+            self.predictor.record_scan(cycle_cpu)
+        if self.governor:
+            self.governor.record_cycle(cycle_cpu, cycle_wall)
+
+        if self.cycle_metrics and self.detector:
+            self._record_cycle_metrics(
+                cycle_start, cycle_wall, baseline, capture_end, detection_time, button_info, targets
+            )
+        return success
+
+    def _run_detection(self) -> Tuple[Optional[tuple], List[Dict[str, Any]], float]:
+        """
+        Detecta botões no frame atual e registra o tempo e o histórico da detecção
+
+        Returns:
+            Tupla (button_info, alvos, tempo_de_detecção); o tempo é NaN na
+            detecção pelos workers, que registram o tempo de cada frame
+        """
+        if self.worker_pool:
+            # Detecção nos workers (tempos registrados por frame processado)
+            return self._detect_with_workers(), [], float("nan")
+
+        button_info = None
+        targets: List[Dict[str, Any]] = []
+
+        # Medir tempo de detecção
+        detection_start = time.time()
+        if MULTI_TARGET["enabled"]:
+            targets = self.detector.detect_all()
+        elif self.heatmap is not None:
+            button_info = self._detect_with_prior()
+        else:
             button_info = self.detector.detect_button()
-            detection_time = time.time() - detection_start
+        detection_time = time.time() - detection_start
+        self._observe_frame(detection_start, bool(button_info or targets))
+
+        # Armazenar tempo de detecção
+        self.detection_latency.record(detection_time)
+        if self.history:
+            self._record_cycle_history(detection_start, detection_time, button_info, targets)
+        return button_info, targets, detection_time
+
+    def _act_on_detection(
+        self, button_info: Optional[tuple], targets: List[Dict[str, Any]]
+    ) -> Optional[bool]:
+        """
+        Clica no botão (ou nos alvos) detectado no ciclo
 
-            # Armazenar tempo de detecção
-            self.detection_times.append(detection_time)
+        Returns:
+            Resultado do ciclo quando ele termina aqui (thread abandonada ou
+            parada de emergência), ou None para seguir com as estatísticas
+        """
+        if not (button_info or targets):
+            return None
 
-            if button_info:
-                # Verificar emergência antes do clique também
-                if self._check_emergency_stop():
-                    self._handle_emergency_stop()
-                    return
+        # Thread abandonada pelo watchdog (ou sessão parada) não clica com um frame antigo
+        if not self.is_monitoring or self._is_abandoned_thread():
+            return False
 
-                # Botão encontrado
-                self._handle_button_found(button_info)
+        # Verificar emergência antes do clique também
+        if self._check_emergency_stop():
+            self._handle_emergency_stop()
+            return True
 
-            # Atualizar estatísticas
-            self._update_statistics()
+        # Botão(ões) encontrado(s)
+        if targets:
+            self._handle_targets_found(targets)
+        else:
+            self._handle_button_found(button_info)
+        return None
+
+    def _record_cycle_metrics(
+        self,
+        cycle_start: float,
+        cycle_wall: float,
+        baseline: Tuple[float, float, int],
+        capture_end: Optional[float],
+        detection_time: float,
+        button_info: Optional[tuple],
+        targets: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Grava a linha do ciclo nas métricas por ciclo
+
+        Args:
+            cycle_start: Início do ciclo (time.monotonic())
+            cycle_wall: Duração do ciclo em segundos
+            baseline: (capture_seconds, click_seconds, click_count) no início do ciclo
+            capture_end: capture_seconds logo após a detecção (None se ela falhou)
+            detection_time: Tempo de detecção (NaN com workers)
+            button_info: Botão detectado
+            targets: Alvos detectados (modo multi-alvo)
+        """
+        capture_start, click_start, clicks_before = baseline
+        if capture_end is None:
+            capture_end = self.detector.capture_seconds
+        capture = capture_end - capture_start
+
+        if targets:
+            best = targets[0]
+        else:
+            best = self.detector.last_detection if button_info else None
+
+        self.cycle_metrics.append(
+            cycle_start,
+            cycle_wall,
+            capture=capture,
+            detect=detection_time - capture,
+            click=self.click_seconds - click_start,
+            candidates=-1 if self.worker_pool else self.detector.last_candidate_count,
+            score=best["score"] if best else float("nan"),
+            clicks=min(255, self.click_count - clicks_before),
+            interval=self._last_wait,
+        )
+
+    def _next_interval(self) -> float:
+        """
+        Calcula a espera até o próximo ciclo
+
+        Returns:
+            Intervalo do preditor (se ativo) ou o intervalo de monitoramento,
+            alongado pelo governador de CPU quando necessário
+        """
+        interval = self.monitor_interval
+        if self.predictor:
+            interval = self.predictor.next_interval(time.time(), interval)
 
+        if self.governor:
+            interval = self.governor.next_interval(interval)
+            if self.detector:
+                self.detector.set_detection_scale(self.governor.scale)
+
+        self.current_interval = interval
+        return interval
+
+    @profiler.profile()
+    def _detect_with_prior(self) -> Optional[tuple]:
+        """
+        Detecta começando pelas regiões quentes do mapa de cliques
+
+        Um acerto confiante nas regiões quentes encerra o ciclo sem varrer a
+        tela inteira. Sem acerto, a varredura completa só roda a cada
+        full_sweep_interval ciclos, quando botões em novas posições são
+        encontrados; um acerto pouco confiante é confirmado no mesmo frame.
+
+        Returns:
+            Tupla (center_x, center_y, width, height) se encontrado, None caso contrário
+        """
+        try:
+            config = self.detector.get_adapted_config()
+            img = self.detector.capture_frame()
         except Exception as e:
-            print(f"Erro no ciclo de monitoramento: {e}")
+            logger.error(f"Erro na detecção: {e}")
+            return None
+
+        self._cycles_since_sweep += 1
+        regions = self.heatmap.hot_regions(
+            (img.shape[1], img.shape[0]),
+            config["scale_factors"],
+            self.detector.region_padding(config),
+        )
+
+        if regions and self._cycles_since_sweep < HIT_PRIOR["full_sweep_interval"]:
+            candidate = self.detector.detect_in_regions(
+                img, regions, config, HIT_PRIOR["confident_score"]
+            )
+            if candidate is None:
+                return self.detector.finish_region_detection(None)
+            if candidate["score"] >= HIT_PRIOR["confident_score"]:
+                self.prior_hits += 1
+                return self.detector.finish_region_detection(candidate)
+
+        # Varredura completa (programada, sem regiões quentes ou acerto incerto);
+        # a busca nas regiões não contou, então o ciclo conta uma detecção só
+        self._cycles_since_sweep = 0
+        self.full_sweeps += 1
+        return self.detector.detect_in_image(img, config)
+
+    @profiler.profile()
+    def _detect_with_workers(self) -> Optional[tuple]:
+        """
+        Captura um frame direto no anel compartilhado e coleta resultados dos workers
+
+        O pipeline mantém até um frame em processamento por worker; só bloqueia
+        quando todos os workers estão ocupados.
+
+        Returns:
+            Tupla (center_x, center_y, width, height) do resultado mais recente
+            com botão, ou None
+        """
+        config = self.detector.get_adapted_config()
+        frame_time = time.time()
+
+        if not self.worker_pool.is_running:
+            # Primeiro frame define a forma do anel compartilhado
+            self.worker_pool.submit(self.detector.capture_frame(), frame_time, config)
+        else:
+            slot = self.worker_pool.acquire_slot(self.worker_pool.frame_shape)
+            if slot is not None:
+                view = self.worker_pool.slot_view(slot)
+                try:
+                    frame = self.detector.capture_frame(out=view)
+                except Exception:
+                    # Falha na captura (ou fim do replay): o slot volta ao anel
+                    self.worker_pool.release_slot(slot)
+                    raise
+                if frame is view:
+                    self.worker_pool.commit(slot, frame_time, config)
+                else:
+                    # Tamanho da captura mudou: o anel é recriado com a nova forma
+                    self.worker_pool.submit(frame, frame_time, config)
+
+        busy = self.worker_pool.in_flight >= self.worker_pool.num_workers
+        timeout = PERFORMANCE_CONFIG["detection_timeout"] if busy else 0.0
+        results = self.worker_pool.poll_results(timeout=timeout)
+
+        button_info = None
+        latest_seq = -1
+        for seq, frame_time, result, detection_time in sorted(results, key=lambda r: r[0]):
+            self.detection_latency.record(detection_time)
+            self._observe_frame(frame_time, result is not None)
+            self.detector.register_result(result is not None)
+            if self.history:
+                self._record_cycle_history(frame_time, detection_time, result, [], False)
+
+            # Ignorar frames capturados antes do último clique
+            if result is not None and frame_time > self.last_click_time and seq > latest_seq:
+                button_info = result
+                latest_seq = seq
+
+        return button_info
+
+    def _record_cycle_history(
+        self,
+        timestamp: float,
+        latency: float,
+        button_info: Optional[tuple],
+        targets: List[Dict[str, Any]],
+        from_detector: bool = True,
+    ) -> None:
+        """
+        Registra o resultado de um ciclo no histórico
+
+        Args:
+            timestamp: Instante da captura
+            latency: Duração da detecção em segundos
+            button_info: Tupla (center_x, center_y, width, height) ou None
+            targets: Candidatos de detect_all (modo multi-alvo)
+            from_detector: Se o frame foi analisado por self.detector (False para
+                resultados dos workers, sem candidatos nem score)
+        """
+        best = None
+        box = None
+        if targets:
+            best = targets[0]
+            box = best["bounds"]
+        elif button_info:
+            x, y, w, h = button_info
+            box = (x - w // 2, y - h // 2, w, h)
+            if from_detector:
+                best = self.detector.last_detection
+
+        self.history.record_cycle(
+            timestamp,
+            latency,
+            self.detector.last_candidate_count if from_detector else None,
+            box,
+            best["score"] if best else None,
+            best["profile"] if best else None,
+            self._resolution_label(),
+        )
+
+    def _resolution_label(self) -> Optional[str]:
+        """Resolução conhecida pelo adaptador ("WxH"), sem consultar a tela"""
+        resolution = self.detector.resolution_adapter.current_resolution if self.detector else None
+        return f"{resolution[0]}x{resolution[1]}" if resolution else None
 
     def _handle_button_found(self, button_info: tuple) -> None:
         """
@@ -227,72 +759,345 @@ class MonitoringManager:
         self._update_status(MESSAGES["status"]["button_found"], "#A23B72")  # success color
 
         # Executar clique
-        pyautogui.click(x, y)
+        bounds = (x - w // 2, y - h // 2, w, h)
+        candidate = self.detector.last_detection
+        self._click(x, y, bounds, candidate)
+
+        # Aguardar após o clique
+        self._sleep(MONITORING_CONFIG["post_click_delay"])
+        if not self._verify_click(bounds, candidate["profile"] if candidate else None):
+            self._end_visibility()
+
+        # Voltar para status de monitoramento
+        self._update_status(MESSAGES["status"]["monitoring"], "#F18F01")  # warning color
+
+    def _handle_targets_found(self, targets: List[Dict[str, Any]]) -> None:
+        """
+        Clica nos botões de um mesmo frame na ordem configurada
+
+        O primeiro alvo acabou de ser detectado; os seguintes são conferidos no
+        lugar (captura apenas da região do botão) antes do clique, já que o
+        clique anterior pode ter mudado a tela.
+
+        Args:
+            targets: Candidatos retornados por detect_all
+        """
+        ordered = self._order_targets(targets, MULTI_TARGET["order"])
+        ordered = ordered[: MULTI_TARGET["max_targets"]]
+
+        # Atualizar status
+        self._update_status(MESSAGES["status"]["button_found"], "#A23B72")  # success color
+
+        clicked: List[Dict[str, Any]] = []
+        for index, target in enumerate(ordered):
+            if index > 0:
+                self._sleep(MULTI_TARGET["delay_between_clicks"])
+
+                if not self.is_monitoring:
+                    return
+                if self._check_emergency_stop():
+                    self._handle_emergency_stop()
+                    return
+
+                if MULTI_TARGET["verify_before_click"] and not self.detector.verify_candidate(
+                    target
+                ):
+                    continue
+
+            self._click(*target["center"], target["bounds"], target)
+            clicked.append(target)
+
+        # Aguardar após a sequência de cliques
+        self._sleep(MONITORING_CONFIG["post_click_delay"])
+        still_visible = [self._verify_click(t["bounds"], t.get("profile")) for t in clicked]
+        if clicked and not any(still_visible):
+            self._end_visibility()
+
+        # Voltar para status de monitoramento
+        self._update_status(MESSAGES["status"]["monitoring"], "#F18F01")  # warning color
+
+    @staticmethod
+    def _order_targets(targets: List[Dict[str, Any]], order: str) -> List[Dict[str, Any]]:
+        """
+        Ordena os alvos de um frame para a sequência de cliques
+
+        Args:
+            targets: Candidatos com bounds, score e priority
+            order: "score", "top_to_bottom" ou "priority" (perfil e depois score)
+
+        Returns:
+            Nova lista ordenada
+        """
+        if order == "score":
+            return sorted(targets, key=lambda t: t["score"], reverse=True)
+        if order == "top_to_bottom":
+            return sorted(targets, key=lambda t: (t["bounds"][1], t["bounds"][0]))
+        return sorted(targets, key=lambda t: (t.get("priority", 0), t["score"]), reverse=True)
+
+    @profiler.profile()
+    def _click(
+        self,
+        x: int,
+        y: int,
+        bounds: Tuple[int, int, int, int],
+        candidate: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Executa um clique e atualiza o contador
+
+        Args:
+            x, y: Posição do clique
+            bounds: Caixa (x, y, w, h) do botão clicado
+            candidate: Candidato clicado (score e perfil para o histórico)
+        """
+        click_start = time.perf_counter()
+        # O clique chega à tela no início da chamada (o pyautogui espera PAUSE depois)
+        click_time = time.time()
+        # No replay o clique é só contabilizado (a tela é a gravação)
+        if self.frame_source is None:
+            pyautogui.click(x, y)
+        self.click_seconds += time.perf_counter() - click_start
+        self.last_click_time = time.time()
+        self._record_click_latency(click_time)
+
+        if self.history:
+            self.history.record_click(
+                self.last_click_time,
+                bounds,
+                candidate["score"] if candidate else None,
+                candidate["profile"] if candidate else None,
+            )
+
+        # Rastros descartados e região protegida do modelo de fundo
+        if self.detector:
+            self.detector.register_click(bounds)
+
+            if self.heatmap is not None:
+                config = self.detector.get_adapted_config()
+                self.heatmap.record_hit(x, y, config["scale_factors"])
 
         # Incrementar contador
         self.click_count += 1
         self._update_click_counter()
 
-        # Aguardar após o clique
-        time.sleep(MONITORING_CONFIG["post_click_delay"])
+    def _observe_frame(self, frame_time: float, found: bool) -> None:
+        """
+        Acompanha a sequência de frames com botão para a latência até o clique
 
-        # Voltar para status de monitoramento
-        self._update_status(MESSAGES["status"]["monitoring"], "#F18F01")  # warning color
+        O início de cada sequência é também a aparição registrada no preditor:
+        um botão visível por vários ciclos conta uma vez só.
+
+        Args:
+            frame_time: Instante da captura (time.time())
+            found: Se o frame tinha botão
+        """
+        # Resultados de workers fora de ordem não reabrem a sequência
+        if frame_time <= self._last_frame_time:
+            return
+        self._last_frame_time = frame_time
+
+        if not found:
+            self._last_empty_frame_time = frame_time
+            self._visible_since = None
+            self._visible_clicked = False
+        elif self._visible_since is None:
+            self._visible_since = frame_time
+            if self.predictor:
+                self.predictor.record_appearance(frame_time)
+
+    def _record_click_latency(self, click_time: float) -> None:
+        """
+        Registra a latência do primeiro clique de uma sequência de frames com botão
+
+        Cliques seguintes no mesmo botão (ainda visível) não contam; vários
+        alvos clicados a partir do primeiro frame contam cada um.
+        """
+        if self._visible_since is None:
+            return
+        if self._visible_clicked and self._last_frame_time != self._visible_since:
+            return
+        self._visible_clicked = True
+
+        self.first_seen_latency.record(click_time - self._visible_since)
+        appeared = self._visible_since
+        if self._last_empty_frame_time is not None:
+            appeared = (self._last_empty_frame_time + self._visible_since) / 2
+        self.appear_latency.record(click_time - appeared)
+
+    def _verify_click(self, bounds: Tuple[int, int, int, int], profile: Optional[str]) -> bool:
+        """
+        Confere se o botão clicado sumiu (captura só da sua região)
+
+        Args:
+            bounds: Caixa (x, y, w, h) do botão clicado
+            profile: Perfil do botão clicado
+
+        Returns:
+            True se o botão continua visível (False também sem verificação)
+        """
+        # No replay a tela gravada não reage ao clique
+        if not CLICK_METRICS["verify_after_click"] or not self.detector or self.frame_source:
+            return False
+
+        self.click_verifications += 1
+        if not self.detector.button_present(bounds, profile):
+            return False
+
+        self.click_verification_failures += 1
+        logger.warning("⚠️ Botão continua visível após o clique", box=list(bounds))
+        return True
+
+    def _end_visibility(self) -> None:
+        """
+        Encerra a sequência de frames com botão após um clique que o fez sumir
+
+        O frame que levou ao clique passa a ser o último sem o próximo botão:
+        um botão visto no frame seguinte conta como um novo aparecimento.
+        """
+        if self._visible_since is not None:
+            self._last_empty_frame_time = self._last_frame_time
+        self._visible_since = None
+        self._visible_clicked = False
 
     def _handle_emergency_stop(self) -> None:
         """Processa parada de emergência"""
-        self._schedule_ui_update(
-            lambda: self._update_status(MESSAGES["status"]["emergency_stop"], "#C73E1D")
-        )
-        self._schedule_ui_update(self.stop_monitoring)
+
+        def stop() -> None:
+            self.stop_monitoring()
+            # Publicado depois de "Sistema Parado" para continuar visível na UI
+            self._update_status(MESSAGES["status"]["emergency_stop"], "#C73E1D")
+
+        self._schedule_ui_update(stop)
 
     def _reset_statistics(self) -> None:
         """Reseta todas as estatísticas"""
         self.click_count = 0
-        self.detection_times = []
+        self.detection_latency.reset()
+        self.first_seen_latency.reset()
+        self.appear_latency.reset()
+        self._last_frame_time = 0.0
+        self._last_empty_frame_time = None
+        self._visible_since = None
+        self._visible_clicked = False
+        self.click_verifications = 0
+        self.click_verification_failures = 0
+        self.prior_hits = 0
+        self.full_sweeps = 0
+        self._cycles_since_sweep = 0
+        if self.predictor:
+            self.predictor.new_session()
+        if self.governor:
+            self.governor.reset()
         if self.detector:
             self.detector.reset_statistics()
         self._update_click_counter()
 
     def _update_statistics(self) -> None:
-        """Atualiza e envia estatísticas para a UI"""
+        """
+        Publica para a UI os contadores do ciclo
+
+        O dicionário completo (com os snapshots de latência) só é montado em
+        flush_ui_updates, no timer da UI, e apenas se algum contador mudou.
+        """
         if not self.detector or not self.stats_callback:
             return
 
-        # Obter estatísticas do detector
-        detector_stats = self.detector.get_statistics()
-
-        # Calcular estatísticas adicionais
-        avg_detection_time = (
-            sum(self.detection_times) / len(self.detection_times) if self.detection_times else 0
+        counters = (
+            self.click_count,
+            self.detection_latency.count,
+            self.detector.detection_count,
+            self.detector.successful_detections,
+            self.click_verifications,
+            self.click_verification_failures,
         )
+        self._publish_ui_state("stats", counters)
 
-        # Manter apenas os últimos 100 tempos para evitar uso excessivo de memória
-        if len(self.detection_times) > 100:
-            self.detection_times = self.detection_times[-100:]
+    def _build_ui_statistics(self) -> Optional[Dict[str, Any]]:
+        """
+        Monta as estatísticas exibidas pela UI
+
+        Returns:
+            Dicionário de estatísticas, ou None se não há detector
+        """
+        detector = self.detector
+        if not detector:
+            return None
+
+        # Obter estatísticas do detector
+        detector_stats = detector.get_statistics()
 
         # Preparar estatísticas completas
         stats = {
             "click_count": self.click_count,
-            "avg_detection_time": avg_detection_time,
+            "avg_detection_time": self.detection_latency.mean,
+            "detection_latency": self.detection_latency.snapshot(),
             "success_rate": detector_stats["success_rate"],
             "total_detections": detector_stats["total_detections"],
             "successful_detections": detector_stats["successful_detections"],
+            **self._click_statistics(),
         }
-
-        # Enviar para UI
-        if self.stats_callback:
-            self._schedule_ui_update(lambda: self.stats_callback(stats))
+        if self.worker_pool:
+            stats["workers"] = self.worker_pool.get_statistics()
+        if self.predictor:
+            stats.update(self.predictor.get_statistics())
+        if self.governor:
+            stats.update(self.governor.get_statistics())
+        return stats
 
     def _update_status(self, status: str, color: str) -> None:
         """Atualiza status na UI"""
-        if self.status_callback:
-            self._schedule_ui_update(lambda: self.status_callback(status, color))
+        self._publish_ui_state("status", (status, color))
 
     def _update_click_counter(self) -> None:
         """Atualiza contador de cliques na UI"""
-        if self.click_callback:
-            self._schedule_ui_update(lambda: self.click_callback(self.click_count))
+        self._publish_ui_state("click_count", self.click_count)
+
+    def _publish_ui_state(self, key: str, value: Any) -> None:
+        """
+        Publica o valor mais recente de um item da UI (substitui o anterior)
+
+        Args:
+            key: Item da UI ("status", "click_count" ou "stats")
+            value: Valor a exibir (para "stats", os contadores que indicam mudança)
+        """
+        with self._ui_lock:
+            self._ui_state[key] = value
+
+    @profiler.profile()
+    def flush_ui_updates(self) -> None:
+        """
+        Entrega aos callbacks da UI o estado mais recente publicado
+
+        Deve ser chamado na thread da UI por um timer fixo (ui_update_interval).
+        Vários ciclos entre duas chamadas resultam em uma única atualização, e
+        cada callback só é chamado se o seu valor mudou desde a última entrega.
+        As estatísticas são montadas aqui, uma vez por entrega.
+        """
+        with self._ui_lock:
+            state = dict(self._ui_state)
+
+        callbacks = {
+            "status": (self.status_callback, lambda cb, value: cb(*value)),
+            "click_count": (self.click_callback, lambda cb, value: cb(value)),
+            "stats": (self.stats_callback, lambda cb, value: self._deliver_stats(cb)),
+        }
+        for key, value in state.items():
+            if key in self._ui_delivered and self._ui_delivered[key] == value:
+                continue
+            self._ui_delivered[key] = value
+
+            callback, deliver = callbacks[key]
+            if callback:
+                try:
+                    deliver(callback, value)
+                except Exception as e:
+                    logger.error(f"Erro ao atualizar UI: {e}")
+
+    def _deliver_stats(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """Monta as estatísticas e as entrega ao callback da UI"""
+        stats = self._build_ui_statistics()
+        if stats is not None:
+            callback(stats)
 
     def _schedule_ui_update(self, callback: Callable) -> None:
         """
@@ -306,7 +1111,7 @@ class MonitoringManager:
             # para usar root.after() do Tkinter
             callback()
         except Exception as e:
-            print(f"Erro ao atualizar UI: {e}")
+            logger.error(f"Erro ao atualizar UI: {e}")
 
     def set_ui_scheduler(self, scheduler: Callable[[Callable], None]) -> None:
         """
@@ -349,16 +1154,87 @@ class MonitoringManager:
         """
         detector_stats = self.detector.get_statistics() if self.detector else {}
 
-        avg_detection_time = (
-            sum(self.detection_times) / len(self.detection_times) if self.detection_times else 0
-        )
-
         return {
             "is_monitoring": self.is_monitoring,
             "click_count": self.click_count,
             "session_time": self.get_session_time(),
             "monitor_interval": self.monitor_interval,
+            "current_interval": self.current_interval,
             "debug_mode": self.debug_mode,
-            "avg_detection_time": avg_detection_time,
+            "avg_detection_time": self.detection_latency.mean,
+            "detection_latency": self.detection_latency.snapshot(),
+            **self._click_statistics(),
+            "detection_workers": self.detection_workers,
+            "prior_hits": self.prior_hits,
+            "full_sweeps": self.full_sweeps,
             **detector_stats,
+            **(self.heatmap.get_statistics() if self.heatmap is not None else {}),
+            **(self.predictor.get_statistics() if self.predictor else {}),
+            **(self.governor.get_statistics() if self.governor else {}),
+            **(self.watchdog.get_statistics() if self.watchdog else {}),
+            **({"workers": self.worker_pool.get_statistics()} if self.worker_pool else {}),
+            **({"profiler": profiler.get_all_statistics()} if profiler.enabled else {}),
+            **(profiler.tracer.get_statistics() if profiler.tracer else {}),
+            **(self.history.get_statistics() if self.history else {}),
+            **(self.capture_recorder.get_statistics() if self.capture_recorder else {}),
+            **(self.frame_source.get_statistics() if self.frame_source else {}),
+        }
+
+    def _click_statistics(self) -> Dict[str, Any]:
+        """Latências até o clique e resultado das verificações após o clique"""
+        verified = self.click_verifications
+        return {
+            "appear_to_click_latency": self.appear_latency.snapshot(),
+            "first_seen_to_click_latency": self.first_seen_latency.snapshot(),
+            "click_verifications": verified,
+            "click_verification_failures": self.click_verification_failures,
+            "click_confirmation_rate": (
+                (verified - self.click_verification_failures) / verified * 100
+                if verified > 0
+                else None
+            ),
         }
+
+    def get_metrics_text(self) -> str:
+        """
+        Gera as métricas no formato texto do Prometheus
+
+        Usa apenas estatísticas já coletadas: não captura a tela nem consulta
+        o tamanho do monitor.
+
+        Returns:
+            Texto de exposição com contadores, histogramas e resolução
+        """
+        resolution = None
+        if self.detector is not None:
+            resolution = self.detector.resolution_adapter.get_resolution_info(refresh=False)
+
+        bounds = METRICS_ENDPOINT["latency_buckets"]
+        return format_prometheus(
+            self.get_statistics(),
+            histograms={
+                "detection_duration_seconds": self.detection_latency.cumulative_buckets(bounds),
+                "appear_to_click_seconds": self.appear_latency.cumulative_buckets(bounds),
+                "first_seen_to_click_seconds": self.first_seen_latency.cumulative_buckets(bounds),
+            },
+            resolution=resolution,
+        )
+
+    def start_metrics_server(self) -> bool:
+        """
+        Inicia o endpoint de métricas se METRICS_ENDPOINT estiver ativo
+
+        Returns:
+            True se o endpoint está escutando
+        """
+        if not METRICS_ENDPOINT["enabled"]:
+            return False
+        if self.metrics_server is None:
+            self.metrics_server = MetricsServer(self.get_metrics_text)
+        return self.metrics_server.start()
+
+    def stop_metrics_server(self) -> None:
+        """Para o endpoint de métricas"""
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
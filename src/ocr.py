@@ -0,0 +1,245 @@
+"""
+Verificação de Texto de Botões por OCR
+Módulo responsável por confirmar o rótulo do botão (ex.: "Continue") antes do
+clique, com cache LRU dos resultados indexado por hash perceptual do recorte
+"""
+
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pytesseract
+except ImportError:
+    # OCR é opcional: sem pytesseract a verificação fica indisponível
+    pytesseract = None
+
+try:
+    from .config import OCR_VERIFICATION
+    from .logs import logger
+except ImportError:
+    from config import OCR_VERIFICATION
+    from logs import logger
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza texto para comparação (minúsculas, sem acentos e sem pontuação)
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Texto normalizado com palavras separadas por um espaço
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    cleaned = "".join(c if c.isalnum() else " " for c in ascii_text.lower())
+    return " ".join(cleaned.split())
+
+
+def _to_gray(crop: np.ndarray) -> np.ndarray:
+    """Converte um recorte BGR para tons de cinza (float32)"""
+    if crop.ndim == 2:
+        return crop.astype(np.float32)
+    return crop[..., :3].astype(np.float32) @ np.array([0.114, 0.587, 0.299], np.float32)
+
+
+def perceptual_hash(
+    crop: np.ndarray, hash_size: int = 16, tolerance: float = 2.0
+) -> Optional[bytes]:
+    """
+    Calcula o hash de diferenças (dHash) de um recorte
+
+    O recorte é reduzido por média de blocos para (hash_size x hash_size + 1)
+    e cada bit indica se um bloco é mais claro que o vizinho da direita por
+    mais que a tolerância. Assim, regiões lisas do botão e pequenas variações
+    de compressão ou antialiasing não mudam o hash. Recortes menores que a
+    grade (rótulos pequenos) usam o próprio conteúdo como chave exata.
+
+    Args:
+        crop: Recorte BGR (ou em tons de cinza) do botão
+        hash_size: Lado da grade do hash (hash_size² bits)
+        tolerance: Diferença mínima de brilho (0-255) para o bit ser 1
+
+    Returns:
+        Hash em bytes, ou None se o recorte está vazio
+    """
+    if crop.size == 0:
+        return None
+
+    gray = _to_gray(crop)
+    height, width = gray.shape
+    rows, cols = hash_size, hash_size + 1
+    if height < rows or width < cols:
+        # Poucos pixels para reduzir: forma + bytes do recorte (não colide com o dHash)
+        shape = np.array(crop.shape, dtype=np.int32).tobytes()
+        return b"exact" + shape + np.ascontiguousarray(crop).tobytes()
+
+    # Redução por média de blocos (equivalente a INTER_AREA, sem OpenCV)
+    ys = (np.arange(rows) * height) // rows
+    xs = (np.arange(cols) * width) // cols
+    sums = np.add.reduceat(np.add.reduceat(gray, ys, axis=0), xs, axis=1)
+    counts = np.diff(np.append(ys, height))[:, None] * np.diff(np.append(xs, width))[None, :]
+    blocks = sums / counts
+
+    bits = blocks[:, 1:] > blocks[:, :-1] + tolerance
+    return np.packbits(bits).tobytes()
+
+
+class ButtonTextVerifier:
+    """
+    Verificador do rótulo do botão com cache de resultados
+
+    O OCR só roda para aparências de botão nunca vistas; as demais são
+    resolvidas por uma consulta O(1) ao cache LRU
+    """
+
+    def __init__(
+        self,
+        labels: Optional[Sequence[str]] = None,
+        cache_size: Optional[int] = None,
+    ):
+        """
+        Inicializa o verificador
+
+        Args:
+            labels: Rótulos aceitos (padrão: OCR_VERIFICATION)
+            cache_size: Número máximo de aparências guardadas no cache
+        """
+        self.labels = [normalize_text(label) for label in (labels or OCR_VERIFICATION["labels"])]
+        self.cache_size = cache_size or OCR_VERIFICATION["cache_size"]
+        self._cache: "OrderedDict[bytes, Tuple[bool, str]]" = OrderedDict()
+
+        self.available = pytesseract is not None
+        self.cache_hits = 0
+        self.ocr_calls = 0
+        self.ocr_time = 0.0
+        self.rejections = 0
+
+    def verify(self, img: np.ndarray, candidate: Dict[str, Any]) -> bool:
+        """
+        Confirma se o botão do candidato contém um dos rótulos configurados
+
+        Args:
+            img: Imagem BGR do frame
+            candidate: Candidato com a chave "bounds"
+
+        Returns:
+            True se o rótulo confere (ou se o OCR está indisponível e
+            allow_without_ocr está ativo)
+        """
+        x, y, w, h = candidate["bounds"]
+        crop = img[y : y + h, x : x + w]
+        key = perceptual_hash(crop, OCR_VERIFICATION["hash_size"])
+
+        cached = self._cache.get(key) if key is not None else None
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            matched, text = cached
+        else:
+            text = self._read_text(crop)
+            if text is None:
+                return OCR_VERIFICATION["allow_without_ocr"]
+
+            matched = self.matches_label(text)
+            if key is not None:
+                self._cache[key] = (matched, text)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        candidate["text"] = text
+        if not matched:
+            self.rejections += 1
+        return matched
+
+    def matches_label(self, text: str) -> bool:
+        """
+        Verifica se o texto lido contém algum dos rótulos aceitos
+
+        Args:
+            text: Texto reconhecido pelo OCR
+
+        Returns:
+            True se algum rótulo aparece como palavra(s) inteira(s) no texto
+        """
+        padded = f" {normalize_text(text)} "
+        return any(label and f" {label} " in padded for label in self.labels)
+
+    def _read_text(self, crop: np.ndarray) -> Optional[str]:
+        """
+        Executa o OCR no recorte do botão
+
+        Args:
+            crop: Recorte BGR do botão
+
+        Returns:
+            Texto reconhecido, ou None se o OCR está indisponível
+        """
+        if not self.available:
+            return None
+
+        start = time.perf_counter()
+        try:
+            text = pytesseract.image_to_string(
+                self._prepare_for_ocr(crop),
+                lang=OCR_VERIFICATION["language"],
+                config=OCR_VERIFICATION["tesseract_config"],
+            )
+        except Exception as e:
+            # Tesseract ausente ou com falha: desativa o OCR nesta sessão
+            logger.warning(f"OCR indisponível, verificação de texto desativada: {e}")
+            self.available = False
+            return None
+        finally:
+            self.ocr_time += time.perf_counter() - start
+
+        self.ocr_calls += 1
+        return text.strip()
+
+    @staticmethod
+    def _prepare_for_ocr(crop: np.ndarray) -> np.ndarray:
+        """
+        Binariza e amplia o recorte com texto escuro sobre fundo claro
+
+        Args:
+            crop: Recorte BGR do botão
+
+        Returns:
+            Imagem binária uint8 pronta para o Tesseract
+        """
+        gray = _to_gray(crop)
+        binary = np.where(gray > gray.mean(), 255, 0).astype(np.uint8)
+
+        # O fundo do botão é a maioria dos pixels; o Tesseract prefere fundo claro
+        if np.count_nonzero(binary) < binary.size / 2:
+            binary = 255 - binary
+
+        factor = OCR_VERIFICATION["upscale"]
+        return np.repeat(np.repeat(binary, factor, axis=0), factor, axis=1)
+
+    def clear(self) -> None:
+        """Limpa o cache de resultados"""
+        self._cache.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do verificador
+
+        Returns:
+            Dicionário com chamadas de OCR, acertos do cache e rejeições
+        """
+        lookups = self.cache_hits + self.ocr_calls
+        return {
+            "ocr_available": self.available,
+            "ocr_calls": self.ocr_calls,
+            "ocr_time": self.ocr_time,
+            "ocr_cache_hits": self.cache_hits,
+            "ocr_cache_hit_rate": self.cache_hits / lookups if lookups > 0 else 0.0,
+            "ocr_cache_size": len(self._cache),
+            "ocr_rejections": self.rejections,
+        }
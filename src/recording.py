@@ -0,0 +1,415 @@
+"""
+Gravação e Replay de Sessões de Captura
+Módulo responsável por gravar os frames vistos pelo detector em um contêiner
+comprimido (apenas os blocos alterados entre frames) e por reproduzi-los como
+fonte de captura, em tempo real ou o mais rápido possível
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .config import CAPTURE_RECORDING, DEBUG_CONFIG
+    from .logs import logger
+except ImportError:
+    from config import CAPTURE_RECORDING, DEBUG_CONFIG
+    from logs import logger
+
+# Contêiner: MAGIC, tamanho do JSON de metadados (u32), metadados e registros
+MAGIC = b"CAPREC01"
+
+# Registro: tipo, instante (s desde o início), largura, altura, tamanho dos dados
+RECORD_HEADER = struct.Struct("<BdIII")
+
+KEY_FRAME = 0  # Frame inteiro comprimido
+DELTA_FRAME = 1  # Índices dos blocos alterados + pixels desses blocos, comprimidos
+SAME_FRAME = 2  # Nenhum pixel mudou (sem dados)
+
+# Marcador que encerra a thread de escrita
+_STOP = object()
+
+
+def changed_tiles(previous: np.ndarray, frame: np.ndarray, tile_size: int) -> np.ndarray:
+    """
+    Índices (em ordem de linha) dos blocos com algum pixel diferente
+
+    Args:
+        previous: Frame anterior (mesma forma)
+        frame: Frame atual
+        tile_size: Lado dos blocos em pixels
+
+    Returns:
+        Array de índices dos blocos alterados na grade de blocos
+    """
+    height, width, channels = frame.shape
+    rows, cols = -(-height // tile_size), -(-width // tile_size)
+
+    # Comparação por byte (linha de pixels achatada): any sobre os canais é bem mais lento
+    diff = frame.reshape(height, -1) != previous.reshape(height, -1)
+    if rows * tile_size != height or cols * tile_size != width:
+        padded = np.zeros((rows * tile_size, cols * tile_size * channels), dtype=bool)
+        padded[:height, : width * channels] = diff
+        diff = padded
+    tiles = diff.reshape(rows, tile_size, cols, tile_size * channels).any(axis=(1, 3))
+    return np.flatnonzero(tiles).astype(np.uint32)
+
+
+def _tile_slices(index: int, cols: int, tile_size: int) -> Tuple[slice, slice]:
+    """Fatias (linhas, colunas) de um bloco da grade"""
+    row, col = divmod(int(index), cols)
+    return (
+        slice(row * tile_size, (row + 1) * tile_size),
+        slice(col * tile_size, (col + 1) * tile_size),
+    )
+
+
+class CaptureRecorder:
+    """
+    Gravador dos frames capturados
+
+    add copia o frame e o enfileira; a thread de escrita compara com o frame
+    anterior, comprime só os blocos alterados (um frame inteiro a cada
+    keyframe_interval frames ou quando a forma muda) e grava no contêiner.
+    Com a fila cheia o frame é descartado em vez de atrasar a detecção.
+    """
+
+    def __init__(
+        self,
+        path: str = "",
+        screen_resolution: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Cria o arquivo de gravação
+
+        Args:
+            path: Caminho do contêiner (padrão: arquivo com data/hora em output_dir)
+            screen_resolution: Resolução da tela durante a gravação
+        """
+        if not path:
+            os.makedirs(CAPTURE_RECORDING["output_dir"], exist_ok=True)
+            timestamp = datetime.now().strftime(DEBUG_CONFIG["timestamp_format"])
+            path = os.path.join(CAPTURE_RECORDING["output_dir"], f"capture_{timestamp}.rec")
+        self.path = path
+        self.tile_size = CAPTURE_RECORDING["tile_size"]
+
+        meta = {
+            "version": 1,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "screen_resolution": list(screen_resolution) if screen_resolution else None,
+            "tile_size": self.tile_size,
+        }
+        encoded = json.dumps(meta).encode("utf-8")
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+
+        self._start = time.monotonic()
+        self._previous: Optional[np.ndarray] = None
+        self._since_key = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=CAPTURE_RECORDING["queue_size"])
+        self._thread = threading.Thread(target=self._run, name="capture-recorder", daemon=True)
+        self._thread.start()
+
+        self.frames = 0
+        self.dropped_frames = 0
+        self.key_frames = 0
+        self.changed_tiles = 0
+        self.total_tiles = 0
+        self.bytes_written = self._file.tell()
+        logger.info(f"⏺️ Gravando capturas em {path}")
+
+    def add(self, frame: np.ndarray) -> None:
+        """
+        Enfileira uma cópia do frame capturado
+
+        Args:
+            frame: Imagem BGR (uint8, 3 canais)
+        """
+        if self._thread is None:
+            return
+        try:
+            self._queue.put_nowait((time.monotonic() - self._start, frame.copy()))
+        except queue.Full:
+            self.dropped_frames += 1
+
+    def _run(self) -> None:
+        """Laço da thread de escrita"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, threading.Event):
+                self._file.flush()
+                item.set()
+                continue
+            try:
+                self._write_frame(*item)
+            except Exception as e:
+                logger.error(f"Erro ao gravar captura: {e}")
+
+    def _write_frame(self, timestamp: float, frame: np.ndarray) -> None:
+        """Codifica e grava um frame"""
+        height, width = frame.shape[:2]
+        previous = self._previous
+        kind = KEY_FRAME
+        payload = b""
+
+        if (
+            previous is not None
+            and previous.shape == frame.shape
+            and self._since_key < CAPTURE_RECORDING["keyframe_interval"]
+        ):
+            indices = changed_tiles(previous, frame, self.tile_size)
+            cols = -(-width // self.tile_size)
+            self.total_tiles += -(-height // self.tile_size) * cols
+            self.changed_tiles += len(indices)
+
+            if len(indices) == 0:
+                kind = SAME_FRAME
+            else:
+                kind = DELTA_FRAME
+                parts = [struct.pack("<I", len(indices)), indices.tobytes()]
+                for index in indices:
+                    rows, columns = _tile_slices(index, cols, self.tile_size)
+                    parts.append(np.ascontiguousarray(frame[rows, columns]).tobytes())
+                payload = zlib.compress(b"".join(parts), CAPTURE_RECORDING["compression_level"])
+
+        if kind == KEY_FRAME:
+            payload = zlib.compress(frame.tobytes(), CAPTURE_RECORDING["compression_level"])
+            self.key_frames += 1
+            self._since_key = 0
+        else:
+            self._since_key += 1
+
+        self._file.write(RECORD_HEADER.pack(kind, timestamp, width, height, len(payload)))
+        self._file.write(payload)
+        self.bytes_written += RECORD_HEADER.size + len(payload)
+        self.frames += 1
+        self._previous = frame
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Espera a gravação dos frames já enfileirados
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            True se tudo foi gravado dentro do prazo
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Grava os frames pendentes e fecha o arquivo"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=10.0)
+        self._thread = None
+        self._file.close()
+        logger.info(f"⏹️ Gravação concluída: {self.frames} frames, {self.bytes_written} bytes")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas da gravação
+
+        Returns:
+            Dicionário com frames gravados e descartados, bytes e blocos alterados
+        """
+        return {
+            "recorded_frames": self.frames,
+            "recording_dropped_frames": self.dropped_frames,
+            "recording_key_frames": self.key_frames,
+            "recording_bytes": self.bytes_written,
+            "recording_changed_tiles": (
+                self.changed_tiles / self.total_tiles if self.total_tiles > 0 else 0.0
+            ),
+        }
+
+
+class CaptureReplay:
+    """
+    Fonte de captura que reproduz um contêiner gravado
+
+    Cada captura da tela inteira avança um frame; capturas de região (ex.:
+    verificação antes do clique) recortam o frame atual. Em tempo real, cada
+    frame só é entregue no instante em que foi gravado (relativo ao primeiro);
+    caso contrário, os frames são entregues sem espera.
+    """
+
+    def __init__(self, path: str, realtime: Optional[bool] = None):
+        """
+        Abre o contêiner
+
+        Args:
+            path: Caminho do contêiner gravado
+            realtime: Respeita os instantes gravados (padrão: CAPTURE_RECORDING)
+
+        Raises:
+            ValueError: Se o arquivo não é um contêiner de gravação
+        """
+        self.path = path
+        self.realtime = CAPTURE_RECORDING["realtime"] if realtime is None else realtime
+
+        self._file: BinaryIO = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"Arquivo de gravação inválido: {path}")
+        (meta_size,) = struct.unpack("<I", self._file.read(4))
+        self.meta: Dict[str, Any] = json.loads(self._file.read(meta_size))
+        self.tile_size = self.meta["tile_size"]
+
+        self.current: Optional[np.ndarray] = None
+        self.current_timestamp = 0.0
+        self.finished = False
+        self.frames = 0
+        self._start: Optional[float] = None
+
+    @property
+    def resolution(self) -> Optional[Tuple[int, int]]:
+        """Resolução da tela na gravação (ou do frame atual, se não registrada)"""
+        if self.meta.get("screen_resolution"):
+            return tuple(self.meta["screen_resolution"])
+        if self.current is not None:
+            return self.current.shape[1], self.current.shape[0]
+        return None
+
+    def read(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Entrega o próximo frame (ou um recorte do frame atual)
+
+        Args:
+            region: Região (x, y, w, h) a recortar do frame atual
+
+        Returns:
+            Imagem BGR
+
+        Raises:
+            EOFError: Quando a gravação terminou
+        """
+        if region is None or self.current is None:
+            self._advance()
+
+        if region is None:
+            return self.current
+        x, y, w, h = region
+        return self.current[max(0, y) : y + h, max(0, x) : x + w].copy()
+
+    def _advance(self) -> None:
+        """Decodifica o próximo frame, esperando o seu instante em tempo real"""
+        header = self._file.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            self.finished = True
+            raise EOFError(f"Fim da gravação: {self.path}")
+
+        kind, timestamp, width, height, size = RECORD_HEADER.unpack(header)
+        payload = self._file.read(size)
+
+        if kind == KEY_FRAME:
+            frame = np.frombuffer(zlib.decompress(payload), dtype=np.uint8)
+            frame = frame.reshape(height, width, 3).copy()
+        elif kind == DELTA_FRAME:
+            # Cópia: frames entregues antes não mudam
+            frame = self.current.copy()
+            self._apply_delta(frame, zlib.decompress(payload))
+        else:
+            frame = self.current
+
+        if self.realtime:
+            now = time.monotonic()
+            if self._start is None:
+                self._start = now - timestamp
+            delay = self._start + timestamp - now
+            if delay > 0:
+                time.sleep(delay)
+
+        self.current = frame
+        self.current_timestamp = timestamp
+        self.frames += 1
+
+    def _apply_delta(self, frame: np.ndarray, data: bytes) -> None:
+        """Escreve os blocos alterados no frame"""
+        (count,) = struct.unpack_from("<I", data)
+        indices = np.frombuffer(data, dtype=np.uint32, count=count, offset=4)
+        cols = -(-frame.shape[1] // self.tile_size)
+
+        offset = 4 + 4 * count
+        for index in indices:
+            rows, columns = _tile_slices(index, cols, self.tile_size)
+            tile = frame[rows, columns]
+            size = tile.size
+            tile[...] = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset).reshape(
+                tile.shape
+            )
+            offset += size
+
+    def close(self) -> None:
+        """Fecha o arquivo"""
+        self._file.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do replay
+
+        Returns:
+            Dicionário com frames reproduzidos e o instante gravado atual
+        """
+        return {
+            "replayed_frames": self.frames,
+            "replay_position": self.current_timestamp,
+            "replay_finished": self.finished,
+        }
+
+
+def replay_detections(
+    path: str, detector: Any = None, realtime: bool = False
+) -> List[Optional[Tuple[int, int, int, int]]]:
+    """
+    Executa detect_button sobre todos os frames de uma gravação
+
+    Útil para perfilar e comparar versões do detector na mesma entrada.
+
+    Args:
+        path: Caminho do contêiner gravado
+        detector: BlueButtonDetector a usar (padrão: um novo detector)
+        realtime: Respeita os instantes gravados
+
+    Returns:
+        Resultado de detect_button para cada frame, em ordem
+    """
+    try:
+        from .detector import BlueButtonDetector
+    except ImportError:
+        from detector import BlueButtonDetector
+
+    replay = CaptureReplay(path, realtime=realtime)
+    detector = detector or BlueButtonDetector()
+    previous_source, detector.frame_source = detector.frame_source, replay
+
+    results = []
+    try:
+        while True:
+            result = detector.detect_button()
+            if replay.finished:
+                break
+            results.append(result)
+    finally:
+        detector.frame_source = previous_source
+        replay.close()
+    return results
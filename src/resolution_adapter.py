@@ -5,7 +5,7 @@ Módulo responsável por adaptar parâmetros de detecção conforme a resoluçã
 
 import math
 import os
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 # Conditional imports for CI/test environments
 try:
@@ -23,10 +23,14 @@ except ImportError:
     pyautogui = mock.MagicMock()
     pyautogui.size = mock.MagicMock(return_value=(1920, 1080))
 
+import numpy as np
+
 try:
-    from .config import BUTTON_DETECTION, RESOLUTION_ADAPTATION
+    from .config import BUTTON_DETECTION, DETECTION_PROFILES, RESOLUTION_ADAPTATION
+    from .utils import logger, profiler
 except ImportError:
-    from config import BUTTON_DETECTION, RESOLUTION_ADAPTATION
+    from config import BUTTON_DETECTION, DETECTION_PROFILES, RESOLUTION_ADAPTATION
+    from utils import logger, profiler
 
 
 class ResolutionAdapter:
@@ -42,6 +46,7 @@ class ResolutionAdapter:
         self.current_resolution: Optional[Tuple[int, int]] = None
         self.scale_factor_x: float = 1.0
         self.scale_factor_y: float = 1.0
+        self.dpi_scaling: Optional[bool] = None
         self._update_resolution()
 
     def _update_resolution(self) -> None:
@@ -55,13 +60,20 @@ class ResolutionAdapter:
             if new_resolution != self.current_resolution:
                 self.current_resolution = new_resolution
                 self._calculate_scale_factors()
-                print(f"📐 Resolução detectada: {screen_width}x{screen_height}")
-                print(
-                    f"📏 Fatores de escala: X={self.scale_factor_x:.2f}, Y={self.scale_factor_y:.2f}"
+                logger.info(
+                    f"📐 Resolução detectada: {screen_width}x{screen_height}",
+                    width=screen_width,
+                    height=screen_height,
+                )
+                logger.info(
+                    f"📏 Fatores de escala: "
+                    f"X={self.scale_factor_x:.2f}, Y={self.scale_factor_y:.2f}",
+                    scale_x=self.scale_factor_x,
+                    scale_y=self.scale_factor_y,
                 )
 
         except Exception as e:
-            print(f"❌ Erro ao obter resolução da tela: {e}")
+            logger.error(f"❌ Erro ao obter resolução da tela: {e}")
             # Usar resolução padrão se falhar
             self.current_resolution = (1920, 1080)
             self.scale_factor_x = 1.0
@@ -72,18 +84,36 @@ class ResolutionAdapter:
         if not self.current_resolution:
             return
 
+        (
+            self.scale_factor_x,
+            self.scale_factor_y,
+            self.area_scale_factor,
+        ) = self._compute_scale_factors(self.current_resolution)
+
+    @staticmethod
+    def _compute_scale_factors(resolution: Tuple[int, int]) -> Tuple[float, float, float]:
+        """
+        Calcula os fatores de escala (x, y, área) de uma resolução
+
+        Args:
+            resolution: Resolução (width, height)
+
+        Returns:
+            Tupla (scale_x, scale_y, scale_area)
+        """
         ref_width = RESOLUTION_ADAPTATION["reference_width"]
         ref_height = RESOLUTION_ADAPTATION["reference_height"]
 
-        current_width, current_height = self.current_resolution
+        width, height = resolution
 
         # Calcular fatores de escala
-        self.scale_factor_x = current_width / ref_width
-        self.scale_factor_y = current_height / ref_height
+        scale_x = width / ref_width
+        scale_y = height / ref_height
 
         # Para área, usar a média geométrica dos fatores
-        self.area_scale_factor = math.sqrt(self.scale_factor_x * self.scale_factor_y)
+        return scale_x, scale_y, math.sqrt(scale_x * scale_y)
 
+    @profiler.profile()
     def get_adapted_config(self) -> Dict[str, Any]:
         """
         Retorna configurações adaptadas para a resolução atual
@@ -110,37 +140,41 @@ class ResolutionAdapter:
 
         return adapted_config
 
-    def _generate_adapted_config(self) -> Dict[str, Any]:
-        """Gera configuração adaptada para a resolução atual"""
-        config = {}
+    def get_config_for_resolution(self, width: int, height: int) -> Dict[str, Any]:
+        """
+        Gera configuração adaptada para uma resolução arbitrária
 
-        # Adaptar dimensões se habilitado
-        if RESOLUTION_ADAPTATION["scale_factors"]["dimensions"]:
-            config["min_width"] = int(BUTTON_DETECTION["base_min_width"] * self.scale_factor_x)
-            config["max_width"] = int(BUTTON_DETECTION["base_max_width"] * self.scale_factor_x)
-            config["min_height"] = int(BUTTON_DETECTION["base_min_height"] * self.scale_factor_y)
-            config["max_height"] = int(BUTTON_DETECTION["base_max_height"] * self.scale_factor_y)
-        else:
-            config["min_width"] = BUTTON_DETECTION["base_min_width"]
-            config["max_width"] = BUTTON_DETECTION["base_max_width"]
-            config["min_height"] = BUTTON_DETECTION["base_min_height"]
-            config["max_height"] = BUTTON_DETECTION["base_max_height"]
+        Não altera a resolução atual nem o cache (útil para benchmarks e replays).
 
-        # Adaptar área se habilitado
-        if RESOLUTION_ADAPTATION["scale_factors"]["area"]:
-            config["min_area"] = int(BUTTON_DETECTION["base_min_area"] * self.area_scale_factor)
-            config["max_area"] = int(BUTTON_DETECTION["base_max_area"] * self.area_scale_factor)
+        Args:
+            width: Largura da tela
+            height: Altura da tela
+
+        Returns:
+            Dicionário com parâmetros adaptados para a resolução
+        """
+        return self._generate_adapted_config((width, height))
+
+    @profiler.profile()
+    def _generate_adapted_config(
+        self, resolution: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
+        """Gera configuração adaptada para a resolução atual (ou a informada)"""
+        if resolution is None:
+            resolution = self.current_resolution
+            scale_x, scale_y, scale_area = (
+                self.scale_factor_x,
+                self.scale_factor_y,
+                self.area_scale_factor,
+            )
         else:
-            config["min_area"] = BUTTON_DETECTION["base_min_area"]
-            config["max_area"] = BUTTON_DETECTION["base_max_area"]
+            scale_x, scale_y, scale_area = self._compute_scale_factors(resolution)
 
-        # Proporções não mudam com resolução
-        config["min_aspect_ratio"] = BUTTON_DETECTION["min_aspect_ratio"]
-        config["max_aspect_ratio"] = BUTTON_DETECTION["max_aspect_ratio"]
+        config = self._scale_button_limits(BUTTON_DETECTION, scale_x, scale_y, scale_area)
 
         # Margem das bordas como percentual
-        if self.current_resolution:
-            width, height = self.current_resolution
+        if resolution:
+            width, height = resolution
             edge_margin_percent = BUTTON_DETECTION["edge_margin_percent"]
             config["edge_margin"] = int(min(width, height) * edge_margin_percent)
         else:
@@ -150,18 +184,104 @@ class ResolutionAdapter:
         config["score_weights"] = BUTTON_DETECTION["score_weights"].copy()
 
         # Adicionar metadados
-        config["resolution"] = self.current_resolution
+        config["resolution"] = resolution
         config["scale_factors"] = {
-            "x": self.scale_factor_x,
-            "y": self.scale_factor_y,
-            "area": self.area_scale_factor,
+            "x": scale_x,
+            "y": scale_y,
+            "area": scale_area,
         }
 
+        config["profiles"] = self._build_profiles(config, scale_x, scale_y, scale_area)
+
         return config
 
+    @staticmethod
+    def _scale_button_limits(
+        limits: Dict[str, Any], scale_x: float, scale_y: float, scale_area: float
+    ) -> Dict[str, Any]:
+        """
+        Adapta limites de dimensão, área e proporção de um botão
+
+        Args:
+            limits: Limites base (chaves de BUTTON_DETECTION, para 1920x1080)
+            scale_x, scale_y, scale_area: Fatores de escala da resolução
+
+        Returns:
+            Dicionário com os limites adaptados
+        """
+        config = {}
+
+        # Adaptar dimensões se habilitado
+        if RESOLUTION_ADAPTATION["scale_factors"]["dimensions"]:
+            config["min_width"] = int(limits["base_min_width"] * scale_x)
+            config["max_width"] = int(limits["base_max_width"] * scale_x)
+            config["min_height"] = int(limits["base_min_height"] * scale_y)
+            config["max_height"] = int(limits["base_max_height"] * scale_y)
+        else:
+            config["min_width"] = limits["base_min_width"]
+            config["max_width"] = limits["base_max_width"]
+            config["min_height"] = limits["base_min_height"]
+            config["max_height"] = limits["base_max_height"]
+
+        # Adaptar área se habilitado
+        if RESOLUTION_ADAPTATION["scale_factors"]["area"]:
+            config["min_area"] = int(limits["base_min_area"] * scale_area)
+            config["max_area"] = int(limits["base_max_area"] * scale_area)
+        else:
+            config["min_area"] = limits["base_min_area"]
+            config["max_area"] = limits["base_max_area"]
+
+        # Proporções não mudam com resolução
+        config["min_aspect_ratio"] = limits["min_aspect_ratio"]
+        config["max_aspect_ratio"] = limits["max_aspect_ratio"]
+
+        return config
+
+    def _build_profiles(
+        self, base_config: Dict[str, Any], scale_x: float, scale_y: float, scale_area: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Gera a configuração adaptada de cada perfil de detecção habilitado
+
+        Cada perfil herda a configuração base e sobrescreve os limites de forma,
+        os pesos e as faixas de cor (já convertidas para uint8).
+
+        Args:
+            base_config: Configuração adaptada sem perfis
+            scale_x, scale_y, scale_area: Fatores de escala da resolução
+
+        Returns:
+            Lista de perfis ordenada da maior para a menor prioridade
+        """
+        profiles = []
+        for name, profile in DETECTION_PROFILES.items():
+            if not profile.get("enabled", True):
+                continue
+
+            limits = {**BUTTON_DETECTION, **profile.get("button_detection", {})}
+            profile_config = {
+                **base_config,
+                **self._scale_button_limits(limits, scale_x, scale_y, scale_area),
+                "name": name,
+                "priority": profile.get("priority", 0),
+                "color_ranges": [
+                    (
+                        np.asarray(r["lower"], dtype=np.uint8),
+                        np.asarray(r["upper"], dtype=np.uint8),
+                    )
+                    for r in profile["color_ranges"]
+                ],
+                "min_color_ratio": profile["min_color_ratio"],
+                "score_weights": limits["score_weights"].copy(),
+            }
+            profiles.append(profile_config)
+
+        profiles.sort(key=lambda p: p["priority"], reverse=True)
+        return profiles
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Retorna configuração padrão quando não é possível detectar resolução"""
-        return {
+        config = {
             "min_width": BUTTON_DETECTION["base_min_width"],
             "max_width": BUTTON_DETECTION["base_max_width"],
             "min_height": BUTTON_DETECTION["base_min_height"],
@@ -175,6 +295,8 @@ class ResolutionAdapter:
             "resolution": (1920, 1080),
             "scale_factors": {"x": 1.0, "y": 1.0, "area": 1.0},
         }
+        config["profiles"] = self._build_profiles(config, 1.0, 1.0, 1.0)
+        return config
 
     def _update_cache(self, config: Dict[str, Any]) -> None:
         """Atualiza o cache de configurações"""
@@ -215,14 +337,19 @@ class ResolutionAdapter:
 
         return width_diff <= tolerance and height_diff <= tolerance
 
-    def get_resolution_info(self) -> Dict[str, Any]:
+    def get_resolution_info(self, refresh: bool = True) -> Dict[str, Any]:
         """
         Retorna informações sobre a resolução atual
 
+        Args:
+            refresh: Consulta a tela (tamanho e captura para detectar escala de
+                DPI); False usa os valores já conhecidos, sem tocar na tela
+
         Returns:
             Dicionário com informações da resolução
         """
-        self._update_resolution()
+        if refresh:
+            self._update_resolution()
 
         if not self.current_resolution:
             return {"error": "Não foi possível detectar a resolução"}
@@ -239,14 +366,20 @@ class ResolutionAdapter:
             "area_scale_factor": self.area_scale_factor,
             "is_reference": (width == ref_width and height == ref_height),
             "cache_size": len(self.config_cache),
-            "dpi_scaling": pyautogui.screenshot().size != (width, height),
+            "dpi_scaling": self._detect_dpi_scaling() if refresh else self.dpi_scaling,
         }
 
+    def _detect_dpi_scaling(self) -> bool:
+        """Compara o tamanho da captura com o da tela (diferem com escala de DPI)"""
+        self.dpi_scaling = pyautogui.screenshot().size != self.current_resolution
+        return self.dpi_scaling
+
     def clear_cache(self) -> None:
         """Limpa o cache de configurações"""
         self.config_cache.clear()
-        print("🗑️ Cache de configurações de resolução limpo")
+        logger.info("🗑️ Cache de configurações de resolução limpo")
 
+    @profiler.profile()
     def force_resolution_update(self) -> bool:
         """
         Força atualização da resolução (útil após mudanças manuais)
@@ -259,7 +392,7 @@ class ResolutionAdapter:
         self._update_resolution()
 
         if old_resolution != self.current_resolution:
-            print(f"🔄 Resolução atualizada: {old_resolution} → {self.current_resolution}")
+            logger.info(f"🔄 Resolução atualizada: {old_resolution} → {self.current_resolution}")
             return True
         return False
 
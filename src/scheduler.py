@@ -0,0 +1,149 @@
+"""
+Agendamento Preditivo do Monitoramento
+Módulo responsável por aprender o intervalo entre aparições do botão e
+reduzir a frequência de varredura enquanto o botão não deve aparecer
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .config import PREDICTIVE_SCHEDULING
+except ImportError:
+    from config import PREDICTIVE_SCHEDULING
+
+
+class AppearancePredictor:
+    """
+    Preditor da próxima aparição do botão a partir do histórico de cliques
+
+    A janela prevista vai dos quantis inferior ao superior dos intervalos
+    entre aparições, alargada por uma margem. Antes da janela a tela é
+    varrida a cada idle_interval; dentro dela e depois dela, no intervalo
+    normal. Uma aparição fora da janela mantém a varredura normal até que
+    uma aparição volte a cair dentro da janela.
+    """
+
+    def __init__(self, min_samples: int = 0, history_size: int = 0):
+        """
+        Inicializa o preditor
+
+        Args:
+            min_samples: Intervalos observados antes de começar a prever
+                (padrão: PREDICTIVE_SCHEDULING)
+            history_size: Número máximo de intervalos guardados
+        """
+        self.min_samples = min_samples or PREDICTIVE_SCHEDULING["min_samples"]
+        history_size = history_size or PREDICTIVE_SCHEDULING["history_size"]
+        self.intervals: Deque[float] = deque(maxlen=history_size)
+        self.new_session()
+
+    def new_session(self) -> None:
+        """Inicia uma sessão: mantém os intervalos aprendidos e zera as estatísticas"""
+        # Uma pausa entre sessões não é um intervalo entre aparições
+        self.last_appearance: Optional[float] = None
+        self.fallback = False
+
+        self.predictions = 0
+        self.correct_predictions = 0
+        self.early_misses = 0
+        self.late_misses = 0
+        self.scans = 0
+        self.scans_saved = 0.0
+        self.scan_cpu_time = 0.0
+
+    def predicted_window(self) -> Optional[Tuple[float, float]]:
+        """
+        Janela prevista para a próxima aparição
+
+        Returns:
+            Tupla (início, fim) em segundos desde a última aparição, ou None
+            se ainda não há intervalos suficientes
+        """
+        if len(self.intervals) < self.min_samples:
+            return None
+
+        low_q, high_q = PREDICTIVE_SCHEDULING["window_quantiles"]
+        low, high = np.quantile(np.asarray(self.intervals), (low_q, high_q))
+        margin = PREDICTIVE_SCHEDULING["window_margin"]
+        return float(low) * (1.0 - margin), float(high) * (1.0 + margin)
+
+    def record_appearance(self, now: float) -> None:
+        """
+        Registra uma aparição do botão (ciclo com clique)
+
+        Args:
+            now: Instante da detecção (time.time())
+        """
+        if self.last_appearance is not None:
+            elapsed = now - self.last_appearance
+            window = self.predicted_window()
+            if window is not None:
+                self.predictions += 1
+                if elapsed < window[0]:
+                    self.early_misses += 1
+                elif elapsed > window[1]:
+                    self.late_misses += 1
+                else:
+                    self.correct_predictions += 1
+                self.fallback = not window[0] <= elapsed <= window[1]
+            self.intervals.append(elapsed)
+
+        self.last_appearance = now
+
+    def record_scan(self, cpu_time: float) -> None:
+        """
+        Registra o tempo de CPU de um ciclo de varredura
+
+        Args:
+            cpu_time: Tempo de CPU gasto no ciclo, em segundos
+        """
+        self.scans += 1
+        self.scan_cpu_time += cpu_time
+
+    def next_interval(self, now: float, base_interval: float) -> float:
+        """
+        Calcula a espera até a próxima varredura
+
+        Args:
+            now: Instante atual (time.time())
+            base_interval: Intervalo normal de monitoramento
+
+        Returns:
+            Segundos até a próxima varredura
+        """
+        window = self.predicted_window()
+        if window is None or self.fallback or self.last_appearance is None:
+            return base_interval
+
+        # Antes da janela: varredura lenta, acordando quando ela abre
+        until_window = window[0] - (now - self.last_appearance)
+        if until_window <= base_interval:
+            return base_interval
+
+        interval = min(PREDICTIVE_SCHEDULING["idle_interval"], until_window)
+        self.scans_saved += interval / base_interval - 1.0
+        return interval
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do preditor
+
+        Returns:
+            Dicionário com a precisão das previsões e a economia de CPU estimada
+        """
+        window = self.predicted_window()
+        avg_scan_cpu = self.scan_cpu_time / self.scans if self.scans > 0 else 0.0
+        return {
+            "prediction_window": window,
+            "predictions": self.predictions,
+            "prediction_accuracy": (
+                self.correct_predictions / self.predictions * 100 if self.predictions > 0 else 0.0
+            ),
+            "early_misses": self.early_misses,
+            "late_misses": self.late_misses,
+            "scans_saved": int(self.scans_saved),
+            "cpu_saved": self.scans_saved * avg_scan_cpu,
+        }
@@ -0,0 +1,565 @@
+"""
+Área de Trabalho Simulada
+Módulo responsável por simular uma tela em que botões aparecem, se movem e
+somem em horários definidos, com um backend de entrada falso que registra os
+cliques, para medir a latência do aparecimento ao clique sem servidor X
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+try:
+    from . import config as settings_module
+    from .config import BUTTON_DETECTION
+except ImportError:
+    import config as settings_module
+    from config import BUTTON_DETECTION
+
+# Cores BGR da cena (botão "Continue" azul, fundo claro e painéis neutros)
+BUTTON_COLOR = (230, 130, 40)
+BACKGROUND_COLOR = (235, 235, 235)
+PANEL_COLOR = (205, 205, 210)
+
+# Margem mínima dos botões até a borda (a detecção ignora as bordas)
+EDGE_MARGIN = BUTTON_DETECTION["edge_margin_percent"] * 2
+
+
+class FailSafeException(Exception):
+    """Equivalente ao pyautogui.FailSafeException no backend falso"""
+
+
+class SimulatedButton:
+    """Botão da cena: aparece em appear_at e some após lifetime ou ao ser clicado"""
+
+    def __init__(
+        self,
+        appear_at: float,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        lifetime: Optional[float] = None,
+        velocity: Tuple[float, float] = (0.0, 0.0),
+        dismiss_on_click: bool = True,
+    ):
+        """
+        Define um botão
+
+        Args:
+            appear_at: Segundos após o início da simulação
+            x, y: Canto superior esquerdo ao aparecer
+            width, height: Tamanho em pixels
+            lifetime: Segundos visível sem clique (None = até ser clicado)
+            velocity: Deslocamento (px/s) em x e y
+            dismiss_on_click: Some ao ser clicado (como um botão "Continue")
+        """
+        self.appear_at = appear_at
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.lifetime = lifetime
+        self.velocity = velocity
+        self.dismiss_on_click = dismiss_on_click
+
+        self.clicked_at: Optional[float] = None
+        self.clicks = 0
+
+    def visible_at(self, t: float) -> bool:
+        """Indica se o botão está na tela no instante t"""
+        if t < self.appear_at:
+            return False
+        if self.clicked_at is not None and self.dismiss_on_click:
+            return False
+        return self.lifetime is None or t < self.appear_at + self.lifetime
+
+    def bounds_at(self, t: float, screen: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """
+        Caixa (x, y, w, h) no instante t, presa dentro da tela
+
+        Args:
+            t: Segundos após o início da simulação
+            screen: Resolução (largura, altura) da tela simulada
+        """
+        elapsed = max(0.0, t - self.appear_at)
+        x = int(self.x + self.velocity[0] * elapsed)
+        y = int(self.y + self.velocity[1] * elapsed)
+        x = min(max(x, 0), screen[0] - self.width)
+        y = min(max(y, 0), screen[1] - self.height)
+        return x, y, self.width, self.height
+
+
+class VirtualDesktop:
+    """
+    Tela simulada com relógio próprio
+
+    Os frames são desenhados sob demanda no instante da captura; cada clique é
+    comparado com os botões visíveis naquele instante (acerto, clique repetido
+    ou clique errado).
+    """
+
+    def __init__(
+        self,
+        buttons: Sequence[SimulatedButton],
+        width: int = 1920,
+        height: int = 1080,
+        panels: Sequence[Tuple[int, int, int, int]] = (),
+    ):
+        """
+        Cria a cena
+
+        Args:
+            buttons: Botões agendados
+            width, height: Resolução da tela simulada
+            panels: Retângulos (x, y, w, h) neutros fixos no fundo
+        """
+        self.buttons = list(buttons)
+        self.resolution = (width, height)
+
+        self._background = np.empty((height, width, 3), dtype=np.uint8)
+        self._background[:] = BACKGROUND_COLOR
+        for x, y, w, h in panels:
+            self._background[y : y + h, x : x + w] = PANEL_COLOR
+
+        self._lock = threading.Lock()
+        self._start: Optional[float] = None
+        self.clicks: List[Tuple[float, int, int, Optional[int]]] = []
+        self.wrong_clicks = 0
+        self.repeat_clicks = 0
+
+    def start(self) -> None:
+        """Inicia o relógio da simulação"""
+        self._start = time.monotonic()
+
+    def now(self) -> float:
+        """Segundos desde o início da simulação"""
+        if self._start is None:
+            self.start()
+        return time.monotonic() - self._start
+
+    def render(self, t: Optional[float] = None) -> np.ndarray:
+        """
+        Desenha a tela no instante t
+
+        Args:
+            t: Segundos após o início (padrão: agora)
+
+        Returns:
+            Imagem BGR
+        """
+        t = self.now() if t is None else t
+        frame = self._background.copy()
+        with self._lock:
+            for button in self.buttons:
+                if not button.visible_at(t):
+                    continue
+                x, y, w, h = button.bounds_at(t, self.resolution)
+                frame[y : y + h, x : x + w] = BUTTON_COLOR
+                # Faixa clara no meio, como o rótulo do botão
+                frame[y + h * 2 // 5 : y + h * 3 // 5, x + w // 4 : x + w * 3 // 4] = 255
+        return frame
+
+    def click(self, x: int, y: int) -> Optional[int]:
+        """
+        Registra um clique e o compara com os botões visíveis
+
+        Args:
+            x, y: Posição do clique
+
+        Returns:
+            Índice do botão atingido, ou None para um clique errado
+        """
+        t = self.now()
+        with self._lock:
+            hit = None
+            for index, button in enumerate(self.buttons):
+                if not button.visible_at(t):
+                    continue
+                bx, by, bw, bh = button.bounds_at(t, self.resolution)
+                if bx <= x < bx + bw and by <= y < by + bh:
+                    hit = index
+                    break
+
+            if hit is None:
+                self.wrong_clicks += 1
+            else:
+                button = self.buttons[hit]
+                if button.clicked_at is None:
+                    button.clicked_at = t
+                else:
+                    self.repeat_clicks += 1
+                button.clicks += 1
+            self.clicks.append((t, x, y, hit))
+        return hit
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        """
+        Resultado da simulação
+
+        Botões ainda visíveis e não clicados no fim não contam como perdidos.
+
+        Args:
+            duration: Duração da simulação em segundos
+
+        Returns:
+            Dicionário com botões, cliques, perdas e latência aparecimento→clique
+        """
+        appeared = [b for b in self.buttons if b.appear_at < duration]
+        clicked = [b for b in appeared if b.clicked_at is not None]
+        missed = [
+            b
+            for b in appeared
+            if b.clicked_at is None
+            and b.lifetime is not None
+            and b.appear_at + b.lifetime <= duration
+        ]
+
+        latencies = np.array([b.clicked_at - b.appear_at for b in clicked])
+        if latencies.size:
+            p50, p90, p99 = np.percentile(latencies, (50, 90, 99))
+            latency = {
+                "mean": float(latencies.mean()),
+                "p50": float(p50),
+                "p90": float(p90),
+                "p99": float(p99),
+                "max": float(latencies.max()),
+            }
+        else:
+            latency = {key: 0.0 for key in ("mean", "p50", "p90", "p99", "max")}
+
+        return {
+            "duration": duration,
+            "buttons": len(appeared),
+            "clicked": len(clicked),
+            "missed": len(missed),
+            "pending": len(appeared) - len(clicked) - len(missed),
+            "clicks": len(self.clicks),
+            "wrong_clicks": self.wrong_clicks,
+            "repeat_clicks": self.repeat_clicks,
+            "latency": latency,
+        }
+
+
+class FakeInput:
+    """
+    Substituto do módulo pyautogui ligado a uma VirtualDesktop
+
+    Oferece apenas o que o monitor, o detector e o adaptador de resolução usam.
+    """
+
+    FailSafeException = FailSafeException
+
+    def __init__(self, desktop: VirtualDesktop, capture_delay: float = 0.0):
+        """
+        Liga o backend à tela simulada
+
+        Args:
+            desktop: Tela simulada
+            capture_delay: Segundos gastos por captura (simula o custo real)
+        """
+        self.desktop = desktop
+        self.capture_delay = capture_delay
+        self.FAILSAFE = True
+        self.PAUSE = 0.0
+        width, height = desktop.resolution
+        self._position = (width // 2, height // 2)
+
+    def size(self) -> Tuple[int, int]:
+        """Resolução da tela simulada"""
+        return self.desktop.resolution
+
+    def position(self) -> Tuple[int, int]:
+        """Posição do mouse (a do último clique)"""
+        return self._position
+
+    def screenshot(self, region: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+        """Captura RGB da tela simulada (ou de uma região), como o pyautogui"""
+        if self.capture_delay > 0:
+            time.sleep(self.capture_delay)
+        frame = self.desktop.render()
+        if region is not None:
+            x, y, w, h = region
+            frame = frame[y : y + h, x : x + w]
+        return Image.fromarray(np.ascontiguousarray(frame[:, :, ::-1]))
+
+    def click(self, x: int, y: int) -> None:
+        """Clica na tela simulada"""
+        self._position = (x, y)
+        self.desktop.click(x, y)
+        # pyautogui espera PAUSE após cada ação
+        if self.PAUSE > 0:
+            time.sleep(self.PAUSE)
+
+
+def _load_gui_modules() -> Tuple[Any, Any, Any]:
+    """
+    Importa detector, monitor e adaptador de resolução sem servidor X
+
+    O pyautogui real falha já na importação sem DISPLAY (o mouseinfo lê a
+    variável), então um backend falso é registrado em sys.modules antes, se o
+    pyautogui ainda não foi importado.
+
+    Returns:
+        Módulos (detector, monitor, resolution_adapter)
+    """
+    if "pyautogui" not in sys.modules:
+        sys.modules["pyautogui"] = FakeInput(VirtualDesktop([]))
+
+    try:
+        from . import detector, monitor, resolution_adapter
+    except ImportError:
+        import detector
+        import monitor
+        import resolution_adapter
+    return detector, monitor, resolution_adapter
+
+
+@contextlib.contextmanager
+def patched_input(fake: FakeInput) -> Iterator[FakeInput]:
+    """Substitui o pyautogui do detector, do monitor e do adaptador de resolução"""
+    modules = _load_gui_modules()
+    originals = [module.pyautogui for module in modules]
+    for module in modules:
+        module.pyautogui = fake
+    try:
+        yield fake
+    finally:
+        for module, original in zip(modules, originals):
+            module.pyautogui = original
+
+
+@contextlib.contextmanager
+def config_overrides(settings: Dict[str, Dict[str, Any]]) -> Iterator[None]:
+    """
+    Altera dicionários de configuração durante o bloco
+
+    Args:
+        settings: {nome do dicionário em config: {chave: valor}}, ex.:
+            {"TRACKING_CONFIG": {"enabled": False}}
+    """
+    saved = []
+    for name, values in settings.items():
+        target = getattr(settings_module, name)
+        saved.append((target, copy.copy(target)))
+        target.update(values)
+    try:
+        yield
+    finally:
+        for target, original in saved:
+            target.clear()
+            target.update(original)
+
+
+def random_schedule(
+    duration: float,
+    rate: float = 0.5,
+    seed: int = 0,
+    width: int = 1920,
+    height: int = 1080,
+    lifetime: Tuple[float, float] = (2.0, 6.0),
+    moving_fraction: float = 0.2,
+    speed: float = 40.0,
+) -> List[SimulatedButton]:
+    """
+    Gera botões com chegadas de Poisson
+
+    Args:
+        duration: Segundos cobertos pelo agendamento
+        rate: Botões por segundo em média
+        seed: Semente (mesmo agendamento para comparar configurações)
+        width, height: Resolução da tela simulada
+        lifetime: Intervalo do tempo visível sem clique (segundos)
+        moving_fraction: Fração dos botões que se movem
+        speed: Velocidade dos botões móveis (px/s)
+
+    Returns:
+        Lista de SimulatedButton em ordem de aparecimento
+    """
+    rng = random.Random(seed)
+    scale = width / 1920
+    margin_x, margin_y = int(width * EDGE_MARGIN), int(height * EDGE_MARGIN)
+
+    buttons = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        w = int(rng.uniform(100, 220) * scale)
+        h = int(rng.uniform(32, 48) * scale)
+        velocity = (0.0, 0.0)
+        if rng.random() < moving_fraction:
+            angle = rng.uniform(0, 2 * np.pi)
+            velocity = (speed * np.cos(angle), speed * np.sin(angle))
+        buttons.append(
+            SimulatedButton(
+                t,
+                rng.randint(margin_x, width - margin_x - w),
+                rng.randint(margin_y, height - margin_y - h),
+                w,
+                h,
+                lifetime=rng.uniform(*lifetime),
+                velocity=velocity,
+            )
+        )
+        t += rng.expovariate(rate)
+    return buttons
+
+
+def run_simulation(
+    buttons: Sequence[SimulatedButton],
+    duration: float,
+    interval: float = 0.5,
+    settings: Optional[Dict[str, Dict[str, Any]]] = None,
+    width: int = 1920,
+    height: int = 1080,
+    capture_delay: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Executa o MonitoringManager real contra a tela simulada
+
+    Args:
+        buttons: Botões agendados (copiados; a lista original não muda)
+        duration: Segundos de monitoramento
+        interval: Intervalo entre verificações
+        settings: Alterações de configuração (ver config_overrides)
+        width, height: Resolução da tela simulada
+        capture_delay: Segundos gastos por captura simulada
+
+    Returns:
+        Relatório de VirtualDesktop.report com o intervalo, as alterações, o
+        tempo médio de detecção e a latência estimada pelo monitor
+    """
+    desktop = VirtualDesktop(copy.deepcopy(list(buttons)), width, height)
+    fake = FakeInput(desktop, capture_delay)
+
+    # Sem replay: a tela simulada é a fonte dos frames
+    overrides = {"CAPTURE_RECORDING": {"replay_file": None}, **(settings or {})}
+    with config_overrides(overrides), patched_input(fake):
+        manager = _load_gui_modules()[1].MonitoringManager()
+        desktop.start()
+        if not manager.start_monitoring(interval):
+            raise RuntimeError("Não foi possível iniciar o monitoramento simulado")
+        time.sleep(duration)
+        stats = manager.get_statistics()
+        manager.stop_monitoring()
+
+    report = desktop.report(duration)
+    report["interval"] = interval
+    report["settings"] = settings or {}
+    report["avg_detection_time"] = stats["avg_detection_time"]
+    # Estimativa do próprio monitor, para comparar com a latência real da cena
+    report["estimated_latency"] = stats["appear_to_click_latency"]
+    report["click_confirmation_rate"] = stats["click_confirmation_rate"]
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Imprime um relatório de run_simulation no terminal
+
+    Args:
+        report: Dicionário retornado por run_simulation
+    """
+    latency = report["latency"]
+    settings = json.dumps(report["settings"]) if report["settings"] else "padrão"
+    print(f"🧪 Intervalo {report['interval']:.2f}s | configuração {settings}")
+    print(
+        f"   Botões: {report['buttons']} | clicados {report['clicked']} | "
+        f"perdidos {report['missed']} | pendentes {report['pending']}"
+    )
+    print(
+        f"   Cliques: {report['clicks']} | errados {report['wrong_clicks']} | "
+        f"repetidos {report['repeat_clicks']}"
+    )
+    print(
+        f"   Aparecimento→clique: p50 {latency['p50'] * 1000:.0f}ms | "
+        f"p90 {latency['p90'] * 1000:.0f}ms | p99 {latency['p99'] * 1000:.0f}ms | "
+        f"máx {latency['max'] * 1000:.0f}ms"
+    )
+    estimated = report["estimated_latency"]
+    print(
+        f"   Estimativa do monitor: p50 {estimated['p50'] * 1000:.0f}ms | "
+        f"p90 {estimated['p90'] * 1000:.0f}ms"
+    )
+    print(f"   Detecção média: {report['avg_detection_time'] * 1000:.1f}ms")
+
+
+def _parse_setting(text: str) -> Tuple[str, str, Any]:
+    """Converte "DICIONARIO.chave=valor" (valor em JSON, ou texto)"""
+    target, value = text.split("=", 1)
+    name, key = target.split(".", 1)
+    try:
+        return name, key, json.loads(value)
+    except ValueError:
+        return name, key, value
+
+
+def run_simulate_command(args: Sequence[str]) -> int:
+    """
+    Comando `main.py simulate [--duration S] [--interval S ...] [--set D.chave=valor ...]`
+
+    Cada intervalo é executado com o mesmo agendamento de botões.
+
+    Args:
+        args: Argumentos após "simulate"
+
+    Returns:
+        Código de saída
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py simulate", description="Latência aparecimento→clique em tela simulada"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos por execução")
+    parser.add_argument(
+        "--interval", type=float, nargs="+", default=[0.5], help="intervalos a comparar"
+    )
+    parser.add_argument("--rate", type=float, default=0.5, help="botões por segundo")
+    parser.add_argument("--seed", type=int, default=0, help="semente do agendamento")
+    parser.add_argument("--width", type=int, default=1920, help="largura da tela simulada")
+    parser.add_argument("--height", type=int, default=1080, help="altura da tela simulada")
+    parser.add_argument(
+        "--capture-delay", type=float, default=0.0, help="segundos gastos por captura"
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="D.chave=valor",
+        help="altera uma configuração (ex.: TRACKING_CONFIG.enabled=false)",
+    )
+    options = parser.parse_args(list(args))
+
+    settings: Dict[str, Dict[str, Any]] = {}
+    try:
+        for text in options.set:
+            name, key, value = _parse_setting(text)
+            if not isinstance(getattr(settings_module, name, None), dict):
+                raise ValueError(f"configuração desconhecida: {name}")
+            settings.setdefault(name, {})[key] = value
+    except ValueError as e:
+        print(f"❌ Alteração inválida: {e}")
+        return 1
+
+    buttons = random_schedule(
+        options.duration, options.rate, options.seed, options.width, options.height
+    )
+    for interval in options.interval:
+        report = run_simulation(
+            buttons,
+            options.duration,
+            interval,
+            settings,
+            options.width,
+            options.height,
+            options.capture_delay,
+        )
+        print_report(report)
+    return 0
@@ -0,0 +1,219 @@
+"""
+Cache de Templates de Botões
+Módulo responsável por guardar a aparência de botões já detectados e
+reencontrá-los por correlação normalizada em uma janela de busca
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Conditional imports for CI/test environments
+try:
+    if os.environ.get("CI_ENVIRONMENT") or os.environ.get("HEADLESS_MODE"):
+        # Mock GUI libraries in CI/test environments
+        import unittest.mock as mock
+
+        cv2 = mock.MagicMock()
+    else:
+        import cv2
+except ImportError:
+    # Fallback mocking if imports fail
+    import unittest.mock as mock
+
+    cv2 = mock.MagicMock()
+
+import numpy as np
+
+try:
+    from .config import TEMPLATE_MATCHING
+    from .tiling import box_iou
+except ImportError:
+    from config import TEMPLATE_MATCHING
+    from tiling import box_iou
+
+
+class ButtonTemplate:
+    """
+    Aparência de um botão detectado (em tons de cinza), com cópias em escalas diferentes
+    """
+
+    def __init__(self, image: np.ndarray, candidate: Dict[str, Any], scales: Sequence[float]):
+        """
+        Cria o template a partir do recorte do botão
+
+        Args:
+            image: Recorte do botão em tons de cinza
+            candidate: Candidato que originou o template
+            scales: Escalas das cópias usadas no matching
+        """
+        self.candidate = candidate
+        self.bounds: Tuple[int, int, int, int] = candidate["bounds"]
+        self.hits = 0
+        self.scaled: List[Tuple[float, np.ndarray]] = []
+
+        height, width = image.shape[:2]
+        for scale in scales:
+            if scale == 1.0:
+                self.scaled.append((scale, image))
+                continue
+            size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+            self.scaled.append((scale, cv2.resize(image, size, interpolation=cv2.INTER_AREA)))
+
+
+class TemplateCache:
+    """
+    Cache limitado de templates por resolução
+
+    Mantém até max_templates_per_resolution templates para cada uma das
+    max_resolutions resoluções usadas mais recentemente
+    """
+
+    def __init__(
+        self,
+        max_resolutions: Optional[int] = None,
+        max_templates: Optional[int] = None,
+        scales: Optional[Sequence[float]] = None,
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            max_resolutions: Número de resoluções mantidas (padrão: TEMPLATE_MATCHING)
+            max_templates: Templates por resolução
+            scales: Escalas das cópias de cada template
+        """
+        self.max_resolutions = max_resolutions or TEMPLATE_MATCHING["max_resolutions"]
+        self.max_templates = max_templates or TEMPLATE_MATCHING["max_templates_per_resolution"]
+        self.scales = tuple(scales or TEMPLATE_MATCHING["scales"])
+        self._cache: "OrderedDict[Tuple[int, int], List[ButtonTemplate]]" = OrderedDict()
+
+    def get(self, resolution: Tuple[int, int]) -> List[ButtonTemplate]:
+        """
+        Retorna os templates de uma resolução, marcando-a como usada recentemente
+
+        Args:
+            resolution: Resolução (width, height)
+
+        Returns:
+            Lista de templates (vazia se não houver)
+        """
+        templates = self._cache.get(resolution)
+        if templates is None:
+            return []
+        self._cache.move_to_end(resolution)
+        return templates
+
+    def add(self, resolution: Tuple[int, int], img: np.ndarray, candidate: Dict[str, Any]) -> None:
+        """
+        Guarda o botão do candidato como template
+
+        Um template existente na mesma posição é substituído pela aparência atual;
+        recortes uniformes (sem texto ou borda) são ignorados.
+
+        Args:
+            resolution: Resolução do frame
+            img: Imagem BGR do frame
+            candidate: Candidato confiável detectado pelo pipeline completo
+        """
+        x, y, w, h = candidate["bounds"]
+        crop = img[y : y + h, x : x + w]
+
+        # Regiões uniformes não têm correlação normalizada definida
+        if crop.size == 0 or float(crop.std()) < 1.0:
+            return
+
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        template = ButtonTemplate(gray, candidate, self.scales)
+
+        templates = self._cache.setdefault(resolution, [])
+        self._cache.move_to_end(resolution)
+
+        templates[:] = [t for t in templates if box_iou(t.bounds, template.bounds) < 0.5]
+        templates.insert(0, template)
+        del templates[self.max_templates :]
+
+        while len(self._cache) > self.max_resolutions:
+            self._cache.popitem(last=False)
+
+    def match(
+        self,
+        resolution: Tuple[int, int],
+        img: np.ndarray,
+        threshold: Optional[float] = None,
+        margin_factor: Optional[float] = None,
+    ) -> Optional[Tuple[ButtonTemplate, Dict[str, Any]]]:
+        """
+        Procura os templates da resolução em janelas ao redor da última posição
+
+        O matching é feito em tons de cinza; a cor deve ser validada por quem chama,
+        que então chama confirm para mover o template (um match rejeitado não o move).
+
+        Args:
+            resolution: Resolução do frame
+            img: Imagem BGR do frame
+            threshold: Correlação mínima (padrão: TEMPLATE_MATCHING)
+            margin_factor: Margem da janela como fração do tamanho do botão
+
+        Returns:
+            Tupla (template, candidato) do melhor match acima do limiar, ou None
+        """
+        if threshold is None:
+            threshold = TEMPLATE_MATCHING["match_threshold"]
+        if margin_factor is None:
+            margin_factor = TEMPLATE_MATCHING["search_margin"]
+
+        frame_height, frame_width = img.shape[:2]
+        best: Optional[Tuple[float, ButtonTemplate, Tuple[int, int, int, int]]] = None
+
+        for template in self.get(resolution):
+            x, y, w, h = template.bounds
+            margin_x, margin_y = int(w * margin_factor), int(h * margin_factor)
+            x0, y0 = max(0, x - margin_x), max(0, y - margin_y)
+            x1, y1 = min(frame_width, x + w + margin_x), min(frame_height, y + h + margin_y)
+            window = cv2.cvtColor(img[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+
+            for _, scaled in template.scaled:
+                th, tw = scaled.shape[:2]
+                if th > window.shape[0] or tw > window.shape[1]:
+                    continue
+
+                result = cv2.matchTemplate(window, scaled, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+                if max_val >= threshold and (best is None or max_val > best[0]):
+                    best = (max_val, template, (x0 + max_loc[0], y0 + max_loc[1], tw, th))
+                if max_val >= threshold:
+                    # Escala 1.0 vem primeiro: não testar as demais se já casou
+                    break
+
+        if best is None:
+            return None
+
+        match_score, template, bounds = best
+        bx, by, bw, bh = bounds
+        return template, {
+            **template.candidate,
+            "center": (bx + bw // 2, by + bh // 2),
+            "bounds": bounds,
+            "area": bw * bh,
+            "match_score": match_score,
+        }
+
+    def confirm(self, template: ButtonTemplate, bounds: Tuple[int, int, int, int]) -> None:
+        """
+        Registra um match aceito por quem chamou, movendo o template para a nova posição
+
+        Args:
+            template: Template retornado por match
+            bounds: Posição do match (x, y, width, height)
+        """
+        template.bounds = bounds
+        template.hits += 1
+
+    def clear(self) -> None:
+        """Remove todos os templates"""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        """Número total de templates guardados"""
+        return sum(len(templates) for templates in self._cache.values())
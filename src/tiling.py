@@ -0,0 +1,168 @@
+"""
+Utilitários de Blocos (tiles) para Detecção
+Funções para dividir o frame em blocos sobrepostos e combinar caixas entre blocos
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+
+def compute_tiles(
+    width: int,
+    height: int,
+    tile_width: int,
+    tile_height: int,
+    overlap_x: int,
+    overlap_y: int,
+) -> List[Box]:
+    """
+    Divide um frame em blocos sobrepostos que cobrem toda a imagem
+
+    Qualquer objeto com largura <= overlap_x e altura <= overlap_y fica
+    inteiramente contido em pelo menos um bloco.
+
+    Args:
+        width, height: Dimensões do frame
+        tile_width, tile_height: Dimensões desejadas de cada bloco
+        overlap_x, overlap_y: Sobreposição entre blocos vizinhos
+
+    Returns:
+        Lista de blocos (x, y, w, h)
+    """
+    xs = _tile_starts(width, tile_width, overlap_x)
+    ys = _tile_starts(height, tile_height, overlap_y)
+
+    return [
+        (x, y, min(tile_width, width - x), min(tile_height, height - y)) for y in ys for x in xs
+    ]
+
+
+def _tile_starts(length: int, tile: int, overlap: int) -> List[int]:
+    """Calcula as posições iniciais dos blocos em um eixo"""
+    if tile >= length:
+        return [0]
+
+    stride = max(1, tile - overlap)
+    starts = list(range(0, length - tile, stride))
+    # Último bloco alinhado ao fim do frame
+    starts.append(length - tile)
+    return starts
+
+
+def map_tiles_to_cells(tiles: Sequence[Box], cells: Sequence[Box]) -> List[List[int]]:
+    """
+    Relaciona cada bloco às células da grade que ele intersecta
+
+    Args:
+        tiles: Blocos (x, y, w, h)
+        cells: Células (x, y, w, h)
+
+    Returns:
+        Para cada bloco, a lista de índices das células intersectadas
+    """
+    mapping = []
+    for tx, ty, tw, th in tiles:
+        mapping.append(
+            [
+                index
+                for index, (cx, cy, cw, ch) in enumerate(cells)
+                if cx < tx + tw and tx < cx + cw and cy < ty + th and ty < cy + ch
+            ]
+        )
+    return mapping
+
+
+def touches_inner_border(bounds: Box, tile: Box, frame_size: Tuple[int, int], margin: int) -> bool:
+    """
+    Verifica se uma caixa encosta em uma borda interna do bloco
+
+    Caixas nessa situação podem estar cortadas (ou alteradas pela morfologia)
+    e são descartadas, pois o bloco vizinho contém o objeto completo.
+    Bordas que coincidem com a borda do frame não contam.
+
+    Args:
+        bounds: Caixa (x, y, w, h) em coordenadas do frame
+        tile: Bloco (x, y, w, h) em coordenadas do frame
+        frame_size: Dimensões do frame (width, height)
+        margin: Distância mínima da borda interna
+
+    Returns:
+        True se a caixa deve ser descartada neste bloco
+    """
+    x, y, w, h = bounds
+    tx, ty, tw, th = tile
+    frame_width, frame_height = frame_size
+
+    if tx > 0 and x < tx + margin:
+        return True
+    if ty > 0 and y < ty + margin:
+        return True
+    if tx + tw < frame_width and x + w > tx + tw - margin:
+        return True
+    if ty + th < frame_height and y + h > ty + th - margin:
+        return True
+    return False
+
+
+def box_iou(a: Box, b: Box) -> float:
+    """
+    Calcula a interseção sobre união (IoU) de duas caixas (x, y, w, h)
+
+    Args:
+        a, b: Caixas a comparar
+
+    Returns:
+        IoU entre 0.0 e 1.0
+    """
+    inter_w = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    inter_h = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+
+    inter = inter_w * inter_h
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def non_max_suppression(
+    boxes: Sequence[Box], scores: Sequence[float], iou_threshold: float
+) -> List[int]:
+    """
+    Supressão de não-máximos sobre caixas (x, y, w, h)
+
+    Args:
+        boxes: Caixas candidatas
+        scores: Score de cada caixa (maior é melhor)
+        iou_threshold: IoU a partir do qual uma caixa é considerada duplicada
+
+    Returns:
+        Índices das caixas mantidas, em ordem decrescente de score
+    """
+    if len(boxes) == 0:
+        return []
+
+    arr = np.asarray(boxes, dtype=np.float64)
+    x1, y1 = arr[:, 0], arr[:, 1]
+    x2, y2 = x1 + arr[:, 2], y1 + arr[:, 3]
+    areas = arr[:, 2] * arr[:, 3]
+
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")
+    keep = []
+
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+
+        inter_w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+        order = rest[iou < iou_threshold]
+
+    return keep
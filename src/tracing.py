@@ -0,0 +1,168 @@
+"""
+Rastreamento de Ciclos em Formato Chrome Trace
+Módulo responsável por guardar os trechos medidos pelo profiler em um anel
+e exportá-los como JSON de trace events (Perfetto / about://tracing)
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from .config import DEBUG_CONFIG, TRACING
+    from .logs import logger
+except ImportError:
+    from config import DEBUG_CONFIG, TRACING
+    from logs import logger
+
+
+class TraceRecorder:
+    """
+    Anel de trechos (operação, thread, início, duração) em nanossegundos
+
+    O registro é um append em um deque limitado (atômico no CPython, sem
+    lock); os trechos mais antigos são descartados quando o anel enche.
+    """
+
+    def __init__(self, buffer_size: int = 0):
+        """
+        Inicializa o gravador
+
+        Args:
+            buffer_size: Número máximo de trechos guardados (padrão: TRACING)
+        """
+        self._spans: Deque[Tuple[str, int, int, int]] = deque(
+            maxlen=buffer_size or TRACING["buffer_size"]
+        )
+        self._thread_names: Dict[int, str] = {}
+        self._origin_ns = time.perf_counter_ns()
+        self.exports = 0
+
+    def add(self, name: str, start_ns: int, duration_ns: int) -> None:
+        """
+        Registra um trecho concluído na thread atual
+
+        Args:
+            name: Nome da operação
+            start_ns: Início (time.perf_counter_ns())
+            duration_ns: Duração em nanossegundos
+        """
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        self._spans.append((name, tid, start_ns, duration_ns))
+
+    def to_trace_events(self) -> List[Dict[str, Any]]:
+        """
+        Converte os trechos guardados em trace events
+
+        Returns:
+            Lista de eventos "X" (completos) e metadados com o nome das threads
+        """
+        spans = self._spans.copy()
+        pid = os.getpid()
+
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        for name, tid, start_ns, duration_ns in spans:
+            events.append(
+                {
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": (start_ns - self._origin_ns) / 1000,
+                    "dur": duration_ns / 1000,
+                }
+            )
+        return events
+
+    def export(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Grava o anel atual em um arquivo JSON
+
+        Args:
+            path: Caminho do arquivo (padrão: trace com data/hora em export_dir)
+
+        Returns:
+            Caminho do arquivo gravado, ou None em caso de erro
+        """
+        if path is None:
+            timestamp = datetime.now().strftime(DEBUG_CONFIG["timestamp_format"])
+            path = os.path.join(TRACING["export_dir"], f"trace_{timestamp}.json")
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": self.to_trace_events(), "displayTimeUnit": "ms"}, f)
+        except Exception as e:
+            logger.error(f"Erro ao exportar trace: {e}")
+            return None
+
+        self.exports += 1
+        logger.info(f"🧭 Trace exportado: {path}")
+        return path
+
+    def install_signal_handler(self) -> bool:
+        """
+        Exporta o trace ao receber o sinal configurado (ex.: kill -USR1 <pid>)
+
+        Deve ser chamado na thread principal.
+
+        Returns:
+            True se o handler foi instalado (False em plataformas sem o sinal)
+        """
+        signum = getattr(signal, TRACING["signal"], None)
+        if signum is None:
+            return False
+
+        try:
+            signal.signal(signum, lambda *_: self.export())
+        except ValueError:
+            # Fora da thread principal
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Descarta os trechos guardados"""
+        self._spans.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do gravador
+
+        Returns:
+            Dicionário com trechos guardados, capacidade e exportações
+        """
+        return {
+            "trace_spans": len(self._spans),
+            "trace_capacity": self._spans.maxlen,
+            "trace_exports": self.exports,
+        }
+
+
+# Instância global (None com o rastreamento desativado)
+_tracer: Optional[TraceRecorder] = None
+
+
+def get_tracer() -> Optional[TraceRecorder]:
+    """
+    Retorna o gravador global, criado se TRACING estiver ativo
+
+    Returns:
+        Instância do TraceRecorder ou None
+    """
+    global _tracer
+    if _tracer is None and TRACING["enabled"]:
+        _tracer = TraceRecorder()
+    return _tracer
@@ -0,0 +1,209 @@
+"""
+Rastreamento de Botões entre Frames
+Módulo responsável por associar candidatos de frames consecutivos a rastros
+com identificadores estáveis
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from .config import TRACKING_CONFIG
+    from .tiling import box_iou
+except ImportError:
+    from config import TRACKING_CONFIG
+    from tiling import box_iou
+
+
+class Track:
+    """
+    Rastro de um botão ao longo de frames consecutivos
+    """
+
+    def __init__(self, track_id: int, candidate: Dict[str, Any]):
+        """
+        Cria um rastro a partir do primeiro candidato associado
+
+        Args:
+            track_id: Identificador estável do rastro
+            candidate: Candidato (dicionário com bounds, center e score)
+        """
+        self.track_id = track_id
+        self.candidate = candidate
+        self.hits = 1
+        self.misses = 0
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """Caixa (x, y, w, h) da última associação"""
+        return self.candidate["bounds"]
+
+
+class ButtonTracker:
+    """
+    Rastreador leve de botões baseado em IoU
+
+    Associa os candidatos de cada frame aos rastros existentes, mantém
+    identificadores estáveis e só libera um botão após N frames consecutivos
+    """
+
+    def __init__(
+        self,
+        iou_threshold: Optional[float] = None,
+        max_missed_frames: Optional[int] = None,
+        confirm_frames: Optional[int] = None,
+    ):
+        """
+        Inicializa o rastreador
+
+        Args:
+            iou_threshold: IoU mínimo para associação (padrão: TRACKING_CONFIG)
+            max_missed_frames: Frames sem associação antes de descartar um rastro
+            confirm_frames: Frames consecutivos necessários para confirmar um rastro
+        """
+        self.iou_threshold = (
+            TRACKING_CONFIG["iou_threshold"] if iou_threshold is None else iou_threshold
+        )
+        self.max_missed_frames = (
+            TRACKING_CONFIG["max_missed_frames"] if max_missed_frames is None else max_missed_frames
+        )
+        self.confirm_frames = (
+            TRACKING_CONFIG["confirm_frames"] if confirm_frames is None else confirm_frames
+        )
+
+        self.tracks: List[Track] = []
+        self.locked_track: Optional[Track] = None
+        self._next_id = 1
+
+    def update(self, candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Associa os candidatos do frame atual aos rastros
+
+        Args:
+            candidates: Candidatos válidos do frame
+
+        Returns:
+            Candidato do melhor rastro confirmado (com a chave "track_id"),
+            ou None se nenhum rastro está confirmado neste frame
+        """
+        matched_tracks, matched_candidates = self._associate(candidates)
+
+        # Rastros sem associação perdem a sequência de confirmação
+        for track_index, track in enumerate(self.tracks):
+            if track_index not in matched_tracks:
+                track.hits = 0
+                track.misses += 1
+
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_missed_frames]
+
+        # Novos rastros para candidatos não associados
+        for candidate_index, candidate in enumerate(candidates):
+            if candidate_index not in matched_candidates:
+                self.tracks.append(Track(self._next_id, candidate))
+                self._next_id += 1
+
+        confirmed = [t for t in self.tracks if t.misses == 0 and t.hits >= self.confirm_frames]
+        if not confirmed:
+            self.locked_track = None
+            return None
+
+        # Maior prioridade de perfil primeiro, depois maior score
+        self.locked_track = max(
+            confirmed, key=lambda t: (t.candidate.get("priority", 0), t.candidate["score"])
+        )
+        return {**self.locked_track.candidate, "track_id": self.locked_track.track_id}
+
+    def _associate(self, candidates: List[Dict[str, Any]]) -> Tuple[Set[int], Set[int]]:
+        """
+        Associa candidatos aos rastros de forma gulosa, pelos pares de maior IoU
+
+        Os rastros associados recebem o candidato e avançam na confirmação.
+
+        Args:
+            candidates: Candidatos válidos do frame
+
+        Returns:
+            Tupla (índices de rastros associados, índices de candidatos associados)
+        """
+        pairs = []
+        for track_index, track in enumerate(self.tracks):
+            for candidate_index, candidate in enumerate(candidates):
+                iou = box_iou(track.bounds, candidate["bounds"])
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, track_index, candidate_index))
+        pairs.sort(reverse=True)
+
+        matched_tracks: Set[int] = set()
+        matched_candidates: Set[int] = set()
+        for _, track_index, candidate_index in pairs:
+            if track_index in matched_tracks or candidate_index in matched_candidates:
+                continue
+            matched_tracks.add(track_index)
+            matched_candidates.add(candidate_index)
+
+            track = self.tracks[track_index]
+            track.candidate = candidates[candidate_index]
+            track.hits += 1
+            track.misses = 0
+        return matched_tracks, matched_candidates
+
+    def search_region(
+        self,
+        track: Track,
+        frame_size: Tuple[int, int],
+        margin_factor: Optional[float] = None,
+        min_margin: int = 0,
+    ) -> Tuple[int, int, int, int]:
+        """
+        Calcula a região de verificação local ao redor de um rastro
+
+        Args:
+            track: Rastro a verificar
+            frame_size: Dimensões do frame (width, height)
+            margin_factor: Margem como fração do tamanho do botão
+            min_margin: Margem mínima em pixels
+
+        Returns:
+            Região (x, y, w, h) limitada ao frame
+        """
+        if margin_factor is None:
+            margin_factor = TRACKING_CONFIG["search_margin"]
+
+        x, y, w, h = track.bounds
+        frame_width, frame_height = frame_size
+        margin = max(min_margin, int(max(w, h) * margin_factor))
+
+        x0 = max(0, x - margin)
+        y0 = max(0, y - margin)
+        x1 = min(frame_width, x + w + margin)
+        y1 = min(frame_height, y + h + margin)
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def matches_track(self, track: Track, candidates: List[Dict[str, Any]]) -> bool:
+        """
+        Verifica se algum candidato continua o rastro
+
+        Args:
+            track: Rastro a verificar
+            candidates: Candidatos encontrados
+
+        Returns:
+            True se algum candidato atinge o IoU mínimo com o rastro
+        """
+        return any(box_iou(track.bounds, c["bounds"]) >= self.iou_threshold for c in candidates)
+
+    def reset(self) -> None:
+        """Descarta todos os rastros (ex.: após um clique)"""
+        self.tracks = []
+        self.locked_track = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do rastreador
+
+        Returns:
+            Dicionário com número de rastros e rastro travado
+        """
+        return {
+            "active_tracks": len(self.tracks),
+            "locked_track_id": self.locked_track.track_id if self.locked_track else None,
+        }
@@ -3,7 +3,7 @@ Interface Gráfica Moderna do Auto Clicker Pro
 Módulo responsável pela criação e gerenciamento da interface do usuário
 """
 
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
 try:
     from .test_helpers import safe_import
@@ -15,9 +15,9 @@ tk = safe_import('tkinter')
 ttk = safe_import('tkinter.ttk')
 
 try:
-    from .config import MESSAGES, UI_CONFIG
+    from .config import MESSAGES, TRACING, UI_CONFIG
 except ImportError:
-    from config import MESSAGES, UI_CONFIG
+    from config import MESSAGES, TRACING, UI_CONFIG
 
 
 class ModernUI:
@@ -50,6 +50,12 @@ class ModernUI:
         self.interval_value_label: Optional[tk.Label] = None
         self.success_rate_label: Optional[tk.Label] = None
         self.avg_time_label: Optional[tk.Label] = None
+        self.cpu_usage_label: Optional[tk.Label] = None
+        self.appear_click_label: Optional[tk.Label] = None
+        self.click_confirmation_label: Optional[tk.Label] = None
+
+        # Último valor exibido em cada label (redesenho só quando muda)
+        self._displayed: Dict[str, Dict[str, Any]] = {}
 
         # Botões de controle
         self.start_btn: Optional[tk.Button] = None
@@ -59,6 +65,7 @@ class ModernUI:
         self.start_callback: Optional[Callable] = None
         self.stop_callback: Optional[Callable] = None
         self.interval_change_callback: Optional[Callable] = None
+        self.trace_export_callback: Optional[Callable] = None
 
         # Attempt to build the full UI. In unit test environments the
         # provided `root` may be a mock object (or the environment may be
@@ -359,6 +366,10 @@ class ModernUI:
         # Modo debug
         self._create_debug_setting(content)
 
+        # Exportação do trace (apenas com o rastreamento ativo)
+        if TRACING["enabled"]:
+            self._create_trace_setting(content)
+
     def _create_interval_setting(self, parent: tk.Widget) -> None:
         """Cria a configuração de intervalo"""
         interval_frame = tk.Frame(parent, bg=self.colors["card_bg"])
@@ -420,9 +431,25 @@ class ModernUI:
         )
         debug_check.pack(anchor="w")
 
+    def _create_trace_setting(self, parent: tk.Widget) -> None:
+        """Cria o botão de exportação do trace"""
+        tk.Button(
+            parent,
+            text="🧭 Exportar Trace",
+            font=(UI_CONFIG["font_family"], self.fonts["small"]),
+            bg=self.colors["primary"],
+            fg="white",
+            relief="flat",
+            borderwidth=0,
+            padx=10,
+            pady=6,
+            cursor="hand2",
+            command=self._on_trace_export_clicked,
+        ).pack(anchor="w", pady=(10, 0))
+
     def _create_stats_card(self, parent: tk.Widget) -> None:
         """Cria o card de estatísticas"""
-        content = self._create_card(parent, "📈 Estatísticas", height=130)
+        content = self._create_card(parent, "📈 Estatísticas", height=220)
 
         # Taxa de sucesso
         self._create_stat_row(
@@ -434,6 +461,36 @@ class ModernUI:
             content, "Tempo Médio:", "avg_time_label", "N/A", self.colors["primary"], top_margin=15
         )
 
+        # Uso de CPU / orçamento do governador
+        self._create_stat_row(
+            content,
+            "CPU (uso/orçamento):",
+            "cpu_usage_label",
+            "N/A",
+            self.colors["warning"],
+            top_margin=15,
+        )
+
+        # Latência do aparecimento do botão ao clique (p50/p90)
+        self._create_stat_row(
+            content,
+            "Aparecer→Clique (p50/p90):",
+            "appear_click_label",
+            "N/A",
+            self.colors["primary"],
+            top_margin=15,
+        )
+
+        # Cliques em que o botão sumiu depois
+        self._create_stat_row(
+            content,
+            "Cliques Confirmados:",
+            "click_confirmation_label",
+            "N/A",
+            self.colors["success"],
+            top_margin=15,
+        )
+
     def _create_stat_row(
         self,
         parent: tk.Widget,
@@ -520,44 +577,71 @@ class ModernUI:
         if self.interval_change_callback:
             self.interval_change_callback(float(value))
 
+    def _on_trace_export_clicked(self) -> None:
+        """Callback para botão de exportação do trace"""
+        if self.trace_export_callback:
+            self.trace_export_callback()
+
     # Métodos públicos para atualização da interface
     def set_callbacks(
         self,
         start_callback: Callable,
         stop_callback: Callable,
         interval_callback: Optional[Callable] = None,
+        trace_export_callback: Optional[Callable] = None,
     ) -> None:
         """Define os callbacks da interface"""
         self.start_callback = start_callback
         self.stop_callback = stop_callback
         self.interval_change_callback = interval_callback
+        self.trace_export_callback = trace_export_callback
+
+    def _set_label(self, attr_name: str, **options: Any) -> None:
+        """
+        Reconfigura um label apenas se o valor exibido mudou
+
+        Args:
+            attr_name: Nome do atributo do label
+            **options: Opções de config() (ex.: text, fg)
+        """
+        label = getattr(self, attr_name)
+        if not label or self._displayed.get(attr_name) == options:
+            return
+        label.config(**options)
+        self._displayed[attr_name] = options
 
     def update_status(self, status: str, color: str) -> None:
         """Atualiza o indicador de status"""
-        if self.status_indicator:
-            self.status_indicator.config(fg=color)
-        if self.status_text:
-            self.status_text.config(text=status)
+        self._set_label("status_indicator", fg=color)
+        self._set_label("status_text", text=status)
 
     def update_click_counter(self, count: int) -> None:
         """Atualiza o contador de cliques"""
-        if self.click_counter_label:
-            self.click_counter_label.config(text=str(count))
+        self._set_label("click_counter_label", text=str(count))
 
     def update_session_time(self, time_str: str) -> None:
         """Atualiza o tempo de sessão"""
-        if self.session_time_label:
-            self.session_time_label.config(text=time_str)
+        self._set_label("session_time_label", text=time_str)
 
     def update_success_rate(self, rate: float) -> None:
         """Atualiza a taxa de sucesso"""
-        if self.success_rate_label:
-            self.success_rate_label.config(text=f"{rate:.1f}%")
+        self._set_label("success_rate_label", text=f"{rate:.1f}%")
 
     def update_avg_time(self, time: float) -> None:
         """Atualiza o tempo médio"""
-        if self.avg_time_label:
-            self.avg_time_label.config(text=f"{time:.2f}s")
+        self._set_label("avg_time_label", text=f"{time:.2f}s")
+
+    def update_cpu_usage(self, usage: float, budget: float) -> None:
+        """Atualiza o uso de CPU e o orçamento do governador"""
+        self._set_label("cpu_usage_label", text=f"{usage:.1f}% / {budget:.0f}%")
+
+    def update_appear_to_click(self, p50: float, p90: float) -> None:
+        """Atualiza a latência do aparecimento ao clique"""
+        self._set_label("appear_click_label", text=f"{p50:.2f}s / {p90:.2f}s")
+
+    def update_click_confirmation(self, rate: float) -> None:
+        """Atualiza a taxa de cliques confirmados"""
+        self._set_label("click_confirmation_label", text=f"{rate:.1f}%")
 
     def set_monitoring_state(self, is_monitoring: bool) -> None:
         """Define o estado dos botões de controle"""
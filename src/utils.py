@@ -3,22 +3,83 @@ Utilitários do Auto Clicker Pro
 Funções auxiliares e ferramentas de desenvolvimento
 """
 
+import functools
 import json
 import os
+import threading
 import time
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .config import PROFILING, TRACING
+    from .latency import LogHistogram
+    from .logs import Logger, logger  # noqa: F401 - Logger reexportado
+    from .tracing import TraceRecorder, get_tracer
+except ImportError:
+    from config import PROFILING, TRACING
+    from latency import LogHistogram
+    from logs import Logger, logger  # noqa: F401 - Logger reexportado
+    from tracing import TraceRecorder, get_tracer
+
+# Contexto vazio reutilizado pelo profiler desativado (nenhuma alocação por uso)
+_NULL_CONTEXT = nullcontext()
+
+
+class _Timer:
+    """Context manager de uma medição (criado apenas com o profiler ativo)"""
+
+    __slots__ = ("_profiler", "_operation")
+
+    def __init__(self, profiler: "PerformanceProfiler", operation: str):
+        self._profiler = profiler
+        self._operation = operation
+
+    def __enter__(self) -> "_Timer":
+        self._profiler.start_timer(self._operation)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._profiler.end_timer(self._operation)
 
 
 class PerformanceProfiler:
     """
-    Profiler simples para medir performance de operações
+    Profiler de operações com baixo custo e seguro entre threads
+
+    Cada thread tem sua pilha de timers (operações aninhadas e threads
+    concorrentes não se sobrescrevem). As durações, medidas com
+    perf_counter_ns, vão para histogramas logarítmicos de tamanho fixo por
+    operação. Desativado, measure() devolve um contexto vazio compartilhado e
+    profile() devolve a própria função, sem custo algum. Com um gravador de
+    trace, cada medição também vira um trecho da linha do tempo.
     """
 
-    def __init__(self):
-        """Inicializa o profiler"""
-        self.timings: Dict[str, list] = {}
-        self.active_timers: Dict[str, float] = {}
+    def __init__(self, enabled: bool = True, tracer: Optional[TraceRecorder] = None):
+        """
+        Inicializa o profiler
+
+        Args:
+            enabled: Se as medições são registradas
+            tracer: Gravador que recebe cada trecho medido (opcional)
+        """
+        self.enabled = enabled
+        self.tracer = tracer
+        self.histogram = LogHistogram()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _stack(self) -> List[Tuple[str, int]]:
+        """Pilha de timers (operação, início em ns) da thread atual"""
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
 
     def start_timer(self, operation: str) -> None:
         """
@@ -27,7 +88,8 @@ class PerformanceProfiler:
         Args:
             operation: Nome da operação
         """
-        self.active_timers[operation] = time.time()
+        if self.enabled:
+            self._stack().append((operation, time.perf_counter_ns()))
 
     def end_timer(self, operation: str) -> Optional[float]:
         """
@@ -39,20 +101,95 @@ class PerformanceProfiler:
         Returns:
             Tempo decorrido em segundos ou None se timer não foi iniciado
         """
-        if operation not in self.active_timers:
-            return None
+        end = time.perf_counter_ns()
+        stack = self._stack()
+
+        # Timer mais interno da operação nesta thread
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == operation:
+                start = stack.pop(index)[1]
+                self._record(operation, start, end)
+                return (end - start) / 1e9
+        return None
+
+    def measure(self, operation: str) -> ContextManager:
+        """
+        Mede um bloco de código
 
-        elapsed = time.time() - self.active_timers[operation]
+        Args:
+            operation: Nome da operação
 
-        # Armazenar timing
-        if operation not in self.timings:
-            self.timings[operation] = []
-        self.timings[operation].append(elapsed)
+        Returns:
+            Context manager (``with profiler.measure("detector.capture"): ...``)
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Timer(self, operation)
 
-        # Limpar timer ativo
-        del self.active_timers[operation]
+    def profile(self, operation: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """
+        Decorador que mede cada chamada da função
+
+        A decisão é tomada ao decorar: com o profiler desativado a função é
+        devolvida sem invólucro.
+
+        Args:
+            operation: Nome da operação (padrão: nome qualificado da função)
+
+        Returns:
+            Decorador
+        """
 
-        return elapsed
+        def decorator(func: Callable) -> Callable:
+            if not self.enabled:
+                return func
+
+            name = operation or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                stack = self._stack()
+                start = time.perf_counter_ns()
+                stack.append((name, start))
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    stack.pop()
+                    self._record(name, start, time.perf_counter_ns())
+
+            return wrapper
+
+        return decorator
+
+    def current_operation(self) -> Optional[str]:
+        """Operação mais interna em andamento na thread atual"""
+        stack = self._stack()
+        return stack[-1][0] if stack else None
+
+    def _record(self, operation: str, start_ns: int, end_ns: int) -> None:
+        """Registra uma duração no histograma da operação (e no trace, se houver)"""
+        elapsed_ns = end_ns - start_ns
+        if self.tracer is not None:
+            self.tracer.add(operation, start_ns, elapsed_ns)
+
+        bucket = self.histogram.bucket_of(elapsed_ns / 1e9)
+        with self._lock:
+            stats = self._stats.get(operation)
+            if stats is None:
+                stats = {
+                    "count": 0,
+                    "total_ns": 0,
+                    "min_ns": elapsed_ns,
+                    "max_ns": elapsed_ns,
+                    "buckets": np.zeros(self.histogram.size, dtype=np.int64),
+                }
+                self._stats[operation] = stats
+
+            stats["count"] += 1
+            stats["total_ns"] += elapsed_ns
+            stats["min_ns"] = min(stats["min_ns"], elapsed_ns)
+            stats["max_ns"] = max(stats["max_ns"], elapsed_ns)
+            stats["buckets"][bucket] += 1
 
     def get_statistics(self, operation: str) -> Dict[str, float]:
         """
@@ -62,19 +199,27 @@ class PerformanceProfiler:
             operation: Nome da operação
 
         Returns:
-            Dicionário com estatísticas (min, max, avg, count)
+            Dicionário com estatísticas em segundos (min, max, avg, count,
+            total, p50, p90, p99)
         """
-        if operation not in self.timings or not self.timings[operation]:
-            return {}
-
-        times = self.timings[operation]
-        return {
-            "min": min(times),
-            "max": max(times),
-            "avg": sum(times) / len(times),
-            "count": len(times),
-            "total": sum(times),
+        with self._lock:
+            stats = self._stats.get(operation)
+            if stats is None:
+                return {}
+            count, total_ns = stats["count"], stats["total_ns"]
+            min_ns, max_ns = stats["min_ns"], stats["max_ns"]
+            buckets = stats["buckets"].copy()
+
+        result = {
+            "min": min_ns / 1e9,
+            "max": max_ns / 1e9,
+            "avg": total_ns / count / 1e9,
+            "count": count,
+            "total": total_ns / 1e9,
         }
+        for q in (50, 90, 99):
+            result[f"p{q}"] = self.histogram.percentile(buckets, q, max_ns / 1e9)
+        return result
 
     def get_all_statistics(self) -> Dict[str, Dict[str, float]]:
         """
@@ -83,7 +228,14 @@ class PerformanceProfiler:
         Returns:
             Dicionário com estatísticas de todas as operações
         """
-        return {op: self.get_statistics(op) for op in self.timings.keys()}
+        with self._lock:
+            operations = list(self._stats)
+        return {op: self.get_statistics(op) for op in operations}
+
+    def reset(self) -> None:
+        """Descarta as estatísticas acumuladas"""
+        with self._lock:
+            self._stats.clear()
 
 
 class ConfigManager:
@@ -109,7 +261,7 @@ class ConfigManager:
                 with open(self.config_file, "r", encoding="utf-8") as f:
                     self.config = json.load(f)
         except Exception as e:
-            print(f"Erro ao carregar configurações: {e}")
+            logger.error(f"Erro ao carregar configurações: {e}")
             self.config = {}
 
     def save_config(self) -> bool:
@@ -124,7 +276,7 @@ class ConfigManager:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
             return True
         except Exception as e:
-            print(f"Erro ao salvar configurações: {e}")
+            logger.error(f"Erro ao salvar configurações: {e}")
             return False
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -160,67 +312,6 @@ class ConfigManager:
         self.config.update(new_config)
 
 
-class Logger:
-    """
-    Sistema de logging simples
-    """
-
-    def __init__(self, log_file: str = "auto_clicker.log", max_size: int = 1024 * 1024):
-        """
-        Inicializa o logger
-
-        Args:
-            log_file: Arquivo de log
-            max_size: Tamanho máximo do arquivo em bytes
-        """
-        self.log_file = log_file
-        self.max_size = max_size
-
-        # Verificar se precisa rotacionar log
-        self._rotate_if_needed()
-
-    def _rotate_if_needed(self) -> None:
-        """Rotaciona o log se necessário"""
-        try:
-            if os.path.exists(self.log_file):
-                if os.path.getsize(self.log_file) > self.max_size:
-                    # Criar backup
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    backup_name = f"{self.log_file}.{timestamp}"
-                    os.rename(self.log_file, backup_name)
-        except Exception as e:
-            print(f"Erro ao rotacionar log: {e}")
-
-    def _write_log(self, level: str, message: str) -> None:
-        """
-        Escreve mensagem no log
-
-        Args:
-            level: Nível do log (INFO, WARNING, ERROR)
-            message: Mensagem a escrever
-        """
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_line = f"[{timestamp}] {level}: {message}\n"
-
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_line)
-        except Exception as e:
-            print(f"Erro ao escrever log: {e}")
-
-    def info(self, message: str) -> None:
-        """Log de informação"""
-        self._write_log("INFO", message)
-
-    def warning(self, message: str) -> None:
-        """Log de aviso"""
-        self._write_log("WARNING", message)
-
-    def error(self, message: str) -> None:
-        """Log de erro"""
-        self._write_log("ERROR", message)
-
-
 def format_time(seconds: float) -> str:
     """
     Formata tempo em segundos para formato legível
@@ -289,15 +380,15 @@ def ensure_directory(path: str) -> bool:
         os.makedirs(path, exist_ok=True)
         return True
     except Exception as e:
-        print(f"Erro ao criar diretório {path}: {e}")
+        logger.error(f"Erro ao criar diretório {path}: {e}")
         return False
 
 
 # Instância global do profiler para uso em toda a aplicação
-profiler = PerformanceProfiler()
-
-# Instância global do logger
-logger = Logger()
+# (ativo também para alimentar o trace quando TRACING está ligado)
+profiler = PerformanceProfiler(
+    enabled=PROFILING["enabled"] or TRACING["enabled"], tracer=get_tracer()
+)
 
 # Instância global do gerenciador de configurações
 config_manager = ConfigManager()
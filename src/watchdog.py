@@ -0,0 +1,195 @@
+"""
+Watchdog dos Ciclos de Monitoramento
+Módulo responsável por impor o tempo limite de cada ciclo (cycle_deadline),
+contar os ciclos que o ultrapassam e pedir a reinicialização da detecção
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .config import PERFORMANCE_CONFIG
+    from .logs import logger
+except ImportError:
+    from config import PERFORMANCE_CONFIG
+    from logs import logger
+
+
+class CycleWatchdog:
+    """
+    Watchdog que vigia o prazo do ciclo em andamento em uma thread própria
+
+    Um ciclo travado (captura que não retorna, contornos demais) é detectado
+    enquanto ainda está rodando, e cada novo período de timeout em que ele
+    continua travado conta outro estouro. Após restart_after estouros seguidos,
+    o callback de reinicialização é chamado uma vez e a contagem recomeça.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 0.0,
+        restart_after: int = 0,
+        on_restart: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Inicializa o watchdog
+
+        Args:
+            timeout: Prazo de cada ciclo em segundos (padrão: PERFORMANCE_CONFIG)
+            restart_after: Estouros seguidos até pedir a reinicialização
+            on_restart: Callback que reinicia captura e detector
+        """
+        self.timeout = timeout or PERFORMANCE_CONFIG["cycle_deadline"]
+        self.restart_after = restart_after or PERFORMANCE_CONFIG["restart_after_overruns"]
+        self.on_restart = on_restart
+
+        self._lock = threading.Lock()
+        self._deadline: Optional[float] = None
+        self._cycle_start = 0.0
+        self._flagged = False
+
+        self.overruns = 0
+        self.consecutive_overruns = 0
+        self.restarts = 0
+        self.last_success_time: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread de vigilância"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="cycle-watchdog",
+            daemon=PERFORMANCE_CONFIG["daemon_threads"],
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Para a thread de vigilância"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def begin_cycle(self) -> None:
+        """Marca o início de um ciclo e arma o prazo"""
+        with self._lock:
+            self._cycle_start = time.monotonic()
+            self._deadline = self._cycle_start + self.timeout
+            self._flagged = False
+
+    def end_cycle(self, success: bool) -> None:
+        """
+        Marca o fim do ciclo em andamento
+
+        Args:
+            success: Se o ciclo terminou sem erro
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._deadline is None:
+                return
+
+            # Ciclo lento que terminou antes da próxima verificação da thread
+            overran = self._flagged or now > self._deadline
+            restart = not self._flagged and overran and self._record_overrun(now)
+            self._deadline = None
+
+            if success and not overran:
+                self.last_success_time = time.time()
+                self.consecutive_overruns = 0
+
+        if restart:
+            self._request_restart()
+
+    def check(self, now: Optional[float] = None) -> bool:
+        """
+        Verifica se o ciclo em andamento passou do prazo
+
+        Args:
+            now: Instante monotônico atual (padrão: time.monotonic())
+
+        Returns:
+            True se um novo estouro foi registrado
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._deadline is None or now <= self._deadline:
+                return False
+
+            # Ciclo ainda travado: o próximo período conta como outro estouro
+            self._flagged = True
+            self._deadline += self.timeout
+            restart = self._record_overrun(now)
+
+        if restart:
+            self._request_restart()
+        return True
+
+    def _record_overrun(self, now: float) -> bool:
+        """Conta um estouro (com o lock adquirido) e indica se deve reiniciar"""
+        self.overruns += 1
+        self.consecutive_overruns += 1
+        elapsed = now - self._cycle_start
+        logger.warning(
+            f"⏱️ Ciclo de monitoramento acima do tempo limite: "
+            f"{elapsed:.1f}s > {self.timeout:.1f}s "
+            f"({self.consecutive_overruns} seguidos)",
+            elapsed=elapsed,
+            timeout=self.timeout,
+            consecutive_overruns=self.consecutive_overruns,
+        )
+
+        if self.consecutive_overruns < self.restart_after:
+            return False
+        self.consecutive_overruns = 0
+        self.restarts += 1
+        return True
+
+    def _request_restart(self) -> None:
+        """Chama o callback de reinicialização fora do lock"""
+        if self.on_restart is None:
+            return
+        try:
+            self.on_restart()
+        except Exception as e:
+            logger.error(f"Erro ao reiniciar a detecção: {e}")
+
+    def _run(self) -> None:
+        """Laço da thread de vigilância"""
+        check_interval = min(1.0, self.timeout / 4)
+        while not self._stop_event.wait(check_interval):
+            self.check()
+
+    def seconds_since_success(self) -> Optional[float]:
+        """
+        Tempo desde o último ciclo bem-sucedido (para health checks)
+
+        Returns:
+            Segundos desde o último ciclo sem erro dentro do prazo, ou None se
+            ainda não houve nenhum
+        """
+        if self.last_success_time is None:
+            return None
+        return time.time() - self.last_success_time
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do watchdog
+
+        Returns:
+            Dicionário com estouros, reinicializações e último ciclo bem-sucedido
+        """
+        return {
+            "cycle_timeout": self.timeout,
+            "cycle_overruns": self.overruns,
+            "pipeline_restarts": self.restarts,
+            "last_successful_cycle": self.last_success_time,
+            "seconds_since_success": self.seconds_since_success(),
+        }
@@ -0,0 +1,443 @@
+"""
+Workers de Detecção Multi-processo
+Módulo responsável por executar o detector em processos separados, lendo frames
+de um anel em memória compartilhada (sem serialização das imagens)
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .config import PERFORMANCE_CONFIG
+    from .logs import logger
+except ImportError:
+    from config import PERFORMANCE_CONFIG
+    from logs import logger
+
+
+class SharedFrameRing:
+    """
+    Anel de frames BGR em um único bloco de memória compartilhada
+
+    Todos os slots têm a mesma forma; o lado de captura escreve diretamente
+    em um slot e os workers leem a mesma memória através de views NumPy
+    """
+
+    def __init__(
+        self,
+        frame_shape: Tuple[int, int, int],
+        slots: int,
+        name: Optional[str] = None,
+    ):
+        """
+        Cria ou anexa o anel de frames
+
+        Args:
+            frame_shape: Forma de cada frame (height, width, channels)
+            slots: Número de slots do anel
+            name: Nome de um bloco existente para anexar (None cria um novo)
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+        self.frame_size = int(np.prod(self.frame_shape))
+        self._owner = name is None
+
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.frame_size * slots)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self._frames = np.ndarray((slots, *self.frame_shape), dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        """Nome do bloco de memória compartilhada"""
+        return self.shm.name
+
+    def slot(self, index: int) -> np.ndarray:
+        """
+        Retorna a view de um slot do anel
+
+        Args:
+            index: Índice do slot
+
+        Returns:
+            View NumPy (sem cópia) do frame armazenado no slot
+        """
+        return self._frames[index]
+
+    def close(self) -> None:
+        """Libera o mapeamento e remove o bloco se este processo o criou"""
+        # Views precisam ser descartadas antes de fechar o buffer
+        self._frames = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Ainda existe uma view em uso; o mapeamento é liberado pelo GC
+            pass
+        if self._owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _create_worker_detector(debug_mode: bool) -> Any:
+    """
+    Cria o detector de um processo de detecção, sem estado entre frames
+
+    Cada worker vê só parte dos frames e nunca recebe register_click; rastros,
+    templates e modelo de fundo locais continuariam apontando para um botão já
+    clicado e divergiriam de um worker para outro. Esse estado fica no detector
+    do processo principal, que recebe os cliques.
+
+    Args:
+        debug_mode: Se o detector deve salvar imagens de debug
+
+    Returns:
+        BlueButtonDetector sem rastreador, cache de templates nem modelo de fundo
+    """
+    try:
+        from .detector import BlueButtonDetector
+    except ImportError:
+        from detector import BlueButtonDetector
+
+    detector = BlueButtonDetector(debug_mode=debug_mode)
+    detector.tracker = None
+    detector.template_cache = None
+    detector.background_model = None
+    return detector
+
+
+def _detection_worker(
+    ring_name: str,
+    frame_shape: Tuple[int, int, int],
+    slots: int,
+    task_queue: Any,
+    result_queue: Any,
+    debug_mode: bool,
+) -> None:
+    """
+    Loop principal de um processo de detecção
+
+    Recebe tarefas (slot, seq, timestamp, config), executa o detector sobre o
+    frame do slot e devolve (slot, seq, timestamp, resultado, tempo, erro) pela
+    fila de resultados; o slot volta a ficar livre quando o resultado é
+    coletado e os erros são registrados no log pelo processo principal.
+    """
+    ring = SharedFrameRing(frame_shape, slots, name=ring_name)
+    detector = _create_worker_detector(debug_mode)
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            slot, seq, timestamp, config = task
+            start = time.perf_counter()
+            error = None
+            try:
+                result = detector.detect_in_image(ring.slot(slot), config)
+            except Exception as e:
+                error = str(e)
+                result = None
+            elapsed = time.perf_counter() - start
+
+            result_queue.put((slot, seq, timestamp, result, elapsed, error))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+
+
+class DetectionWorkerPool:
+    """
+    Pool de processos de detecção alimentado por um anel de memória compartilhada
+
+    O lado de captura adquire um slot livre, escreve o frame nele e publica
+    apenas o índice do slot; os resultados voltam por uma fila leve. Se um
+    worker morre (OOM, falha no OpenCV), os slots que ele segurava não voltam
+    nunca, então o pool inteiro é reiniciado com o anel livre.
+    """
+
+    def __init__(self, num_workers: int, slots: Optional[int] = None, debug_mode: bool = False):
+        """
+        Inicializa o pool (os processos só são criados em start)
+
+        Args:
+            num_workers: Número de processos de detecção
+            slots: Número de slots do anel (padrão: PERFORMANCE_CONFIG)
+            debug_mode: Se os detectores dos workers devem salvar imagens de debug
+        """
+        self.num_workers = max(1, num_workers)
+        self.slots = max(slots or PERFORMANCE_CONFIG["frame_ring_slots"], self.num_workers)
+        self.debug_mode = debug_mode
+
+        self.ring: Optional[SharedFrameRing] = None
+        self.processes: List[Any] = []
+        self._context = mp.get_context("spawn")
+        self._task_queue: Any = None
+        self._result_queue: Any = None
+        self._free_slots: List[int] = []
+
+        self._next_seq = 0
+        self.in_flight = 0
+
+        # Estatísticas
+        self.submitted_frames = 0
+        self.dropped_frames = 0
+        self.completed_frames = 0
+        self.worker_errors = 0
+        self.worker_restarts = 0
+
+    @property
+    def is_running(self) -> bool:
+        """Indica se os processos de detecção estão ativos"""
+        return bool(self.processes)
+
+    @property
+    def frame_shape(self) -> Optional[Tuple[int, int, int]]:
+        """Forma dos frames do anel atual (None se o pool não foi iniciado)"""
+        return self.ring.frame_shape if self.ring is not None else None
+
+    def start(self, frame_shape: Tuple[int, int, int]) -> None:
+        """
+        Cria o anel de frames e inicia os processos de detecção
+
+        Args:
+            frame_shape: Forma dos frames que serão capturados
+        """
+        if self.is_running:
+            self.stop()
+
+        self.ring = SharedFrameRing(frame_shape, self.slots)
+        self._task_queue = self._context.Queue()
+        self._result_queue = self._context.Queue()
+        self._free_slots = list(range(self.slots))
+
+        for _ in range(self.num_workers):
+            process = self._context.Process(
+                target=_detection_worker,
+                args=(
+                    self.ring.name,
+                    self.ring.frame_shape,
+                    self.slots,
+                    self._task_queue,
+                    self._result_queue,
+                    self.debug_mode,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+        self.in_flight = 0
+
+    def acquire_slot(self, frame_shape: Tuple[int, int, int]) -> Optional[int]:
+        """
+        Obtém um slot livre para escrita de um frame
+
+        Reinicia o pool se a forma do frame mudou (ex.: mudança de resolução).
+
+        Args:
+            frame_shape: Forma do frame que será escrito
+
+        Returns:
+            Índice do slot ou None se todos estão ocupados (frame descartado)
+        """
+        if not self.is_running or self.ring is None or self.ring.frame_shape != tuple(frame_shape):
+            self.start(frame_shape)
+
+        if not self._free_slots:
+            self.dropped_frames += 1
+            return None
+        return self._free_slots.pop()
+
+    def release_slot(self, slot: int) -> None:
+        """
+        Devolve ao anel um slot adquirido que não será publicado
+
+        Args:
+            slot: Índice obtido em acquire_slot
+        """
+        self._free_slots.append(slot)
+
+    def slot_view(self, slot: int) -> np.ndarray:
+        """
+        Retorna o buffer de escrita de um slot
+
+        Args:
+            slot: Índice obtido em acquire_slot
+        """
+        return self.ring.slot(slot)
+
+    def commit(self, slot: int, timestamp: float, config: Dict[str, Any]) -> int:
+        """
+        Publica um frame escrito no slot para os workers
+
+        Args:
+            slot: Índice do slot escrito
+            timestamp: Momento da captura do frame
+            config: Configuração adaptada para a resolução do frame
+
+        Returns:
+            Número de sequência atribuído ao frame
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        self._task_queue.put((slot, seq, timestamp, config))
+        self.in_flight += 1
+        self.submitted_frames += 1
+        return seq
+
+    def submit(self, frame: np.ndarray, timestamp: float, config: Dict[str, Any]) -> bool:
+        """
+        Copia um frame já capturado para o anel e o publica
+
+        Args:
+            frame: Imagem BGR
+            timestamp: Momento da captura
+            config: Configuração adaptada
+
+        Returns:
+            True se o frame foi enviado, False se foi descartado
+        """
+        slot = self.acquire_slot(frame.shape)
+        if slot is None:
+            return False
+        np.copyto(self.slot_view(slot), frame)
+        self.commit(slot, timestamp, config)
+        return True
+
+    def poll_results(
+        self, timeout: float = 0.0
+    ) -> List[Tuple[int, float, Optional[Tuple[int, int, int, int]], float]]:
+        """
+        Coleta resultados disponíveis
+
+        Args:
+            timeout: Tempo máximo de espera pelo primeiro resultado (0 = não bloqueia)
+
+        Returns:
+            Lista de tuplas (seq, timestamp, resultado, tempo_de_detecção)
+        """
+        raw_results = []
+        if not self.is_running:
+            return []
+
+        try:
+            if timeout > 0:
+                raw_results.append(self._wait_result(timeout))
+            while True:
+                raw_results.append(self._result_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        results = []
+        for slot, seq, timestamp, result, elapsed, error in raw_results:
+            self._free_slots.append(slot)
+            if error is not None:
+                self.worker_errors += 1
+                logger.error(f"Erro no worker de detecção: {error}")
+            results.append((seq, timestamp, result, elapsed))
+
+        self.in_flight = max(0, self.in_flight - len(results))
+        self.completed_frames += len(results)
+
+        if not self._workers_alive():
+            self._restart_workers()
+        return results
+
+    def _wait_result(self, timeout: float) -> Tuple[Any, ...]:
+        """
+        Espera o primeiro resultado verificando se os workers seguem vivos
+
+        Um worker morto nunca responde; a espera termina assim que isso é
+        percebido, em vez de bloquear o prazo inteiro.
+
+        Raises:
+            queue.Empty: Prazo esgotado ou worker morto
+        """
+        deadline = time.monotonic() + timeout
+        interval = PERFORMANCE_CONFIG["worker_liveness_interval"]
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise queue.Empty
+            try:
+                return self._result_queue.get(timeout=min(remaining, interval))
+            except queue.Empty:
+                if not self._workers_alive():
+                    raise
+
+    def _workers_alive(self) -> bool:
+        """Indica se todos os processos de detecção seguem ativos"""
+        return all(process.is_alive() for process in self.processes)
+
+    def _restart_workers(self) -> None:
+        """Reinicia o pool após a morte de um worker, liberando todos os slots"""
+        dead = [process for process in self.processes if not process.is_alive()]
+        codes = ", ".join(str(process.exitcode) for process in dead)
+        logger.warning(
+            f"⚠️ {len(dead)} worker(s) de detecção encerrado(s) (código {codes}); "
+            f"reiniciando o pool e descartando {self.in_flight} frame(s) em processamento"
+        )
+        self.dropped_frames += self.in_flight
+        self.worker_restarts += 1
+        self.start(self.ring.frame_shape)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """
+        Encerra os processos e libera a memória compartilhada
+
+        Args:
+            timeout: Tempo máximo de espera por processo
+        """
+        if self._task_queue is not None:
+            for _ in self.processes:
+                self._task_queue.put(None)
+
+        for process in self.processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=timeout)
+
+        self.processes = []
+
+        for q in (self._task_queue, self._result_queue):
+            if q is not None:
+                q.close()
+                q.join_thread()
+        self._task_queue = self._result_queue = None
+        self._free_slots = []
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+        self.in_flight = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do pool
+
+        Returns:
+            Dicionário com contadores de frames
+        """
+        return {
+            "workers": self.num_workers,
+            "ring_slots": self.slots,
+            "submitted_frames": self.submitted_frames,
+            "completed_frames": self.completed_frames,
+            "dropped_frames": self.dropped_frames,
+            "in_flight": self.in_flight,
+            "worker_errors": self.worker_errors,
+            "worker_restarts": self.worker_restarts,
+        }
@@ -0,0 +1,1664 @@
+"""
+Testes de performance do Auto Clicker Pro
+Testes unitários para os componentes de aceleração da detecção e do monitoramento
+"""
+
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+# Adicionar src ao path para importações
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+class TestDetectionWorkers(unittest.TestCase):
+    """Testes para os workers de detecção multi-processo"""
+
+    def test_shared_frame_ring(self):
+        """Testa se frames escritos no anel são visíveis por outro mapeamento"""
+        from workers import SharedFrameRing
+
+        ring = SharedFrameRing((4, 6, 3), slots=2)
+        try:
+            attached = SharedFrameRing((4, 6, 3), slots=2, name=ring.name)
+            ring.slot(1)[:] = 7
+            self.assertEqual(int(attached.slot(1).sum()), 7 * 4 * 6 * 3)
+            self.assertEqual(int(attached.slot(0).sum()), 0)
+            attached.close()
+        finally:
+            ring.close()
+
+    def test_pool_round_trip(self):
+        """Testa envio de um frame e retorno do resultado pelo pool"""
+        from workers import DetectionWorkerPool
+
+        pool = DetectionWorkerPool(1, slots=2)
+        try:
+            frame = np.zeros((40, 60, 3), dtype=np.uint8)
+            self.assertTrue(pool.submit(frame, time.time(), {}))
+            results = pool.poll_results(timeout=30.0)
+
+            self.assertEqual(len(results), 1)
+            seq, _, _, elapsed = results[0]
+            self.assertEqual(seq, 0)
+            self.assertGreaterEqual(elapsed, 0.0)
+            self.assertEqual(pool.in_flight, 0)
+        finally:
+            pool.stop()
+
+    def test_worker_detector_keeps_no_state_after_click(self):
+        """Testa que o detector do worker não reporta o botão já clicado"""
+        from unittest.mock import patch
+
+        import cv2 as real_cv2
+
+        import detector as detector_module
+        from workers import _create_worker_detector
+
+        # Estado entre frames ligado no processo principal
+        with patch.object(detector_module, "cv2", real_cv2), patch.dict(
+            detector_module.TRACKING_CONFIG, {"enabled": True}
+        ), patch.dict(detector_module.TEMPLATE_MATCHING, {"enabled": True}), patch.dict(
+            detector_module.BACKGROUND_MODEL, {"enabled": True, "model_file": ""}
+        ):
+            detector = _create_worker_detector(debug_mode=False)
+            config = detector.resolution_adapter.get_config_for_resolution(1920, 1080)
+
+            frame = np.full((1080, 1920, 3), 235, dtype=np.uint8)
+            frame[500:540, 940:1060] = (230, 130, 40)
+            self.assertIsNotNone(detector.detect_in_image(frame, config))
+
+            # O botão sumiu após o clique feito pelo processo principal
+            frame[500:540, 940:1060] = 235
+            self.assertIsNone(detector.detect_in_image(frame, config))
+
+        self.assertIsNone(detector.tracker)
+        self.assertIsNone(detector.template_cache)
+        self.assertIsNone(detector.background_model)
+
+    def test_pool_restarts_dead_worker(self):
+        """Testa se a morte de um worker libera os slots sem bloquear o prazo"""
+        from workers import DetectionWorkerPool
+
+        pool = DetectionWorkerPool(1, slots=2)
+        try:
+            frame = np.zeros((40, 60, 3), dtype=np.uint8)
+            self.assertTrue(pool.submit(frame, time.time(), {}))
+            self.assertEqual(len(pool.poll_results(timeout=30.0)), 1)
+
+            # Worker morto antes de pegar a tarefa: o slot nunca voltaria
+            pool.processes[0].kill()
+            pool.processes[0].join()
+            pool.commit(pool.acquire_slot(frame.shape), time.time(), {})
+
+            start = time.monotonic()
+            self.assertEqual(pool.poll_results(timeout=30.0), [])
+            self.assertLess(time.monotonic() - start, 5.0)
+            self.assertEqual(pool.worker_restarts, 1)
+            self.assertEqual(pool.in_flight, 0)
+            self.assertEqual(pool.dropped_frames, 1)
+
+            # O pool reiniciado volta a processar frames
+            self.assertTrue(pool.submit(frame, time.time(), {}))
+            self.assertEqual(len(pool.poll_results(timeout=30.0)), 1)
+        finally:
+            pool.stop()
+
+
+class TestTiling(unittest.TestCase):
+    """Testes para a divisão em blocos e combinação de caixas"""
+
+    def test_tiles_contain_any_small_object(self):
+        """Testa se todo objeto menor que a sobreposição cabe inteiro em um bloco"""
+        from tiling import compute_tiles
+
+        tiles = compute_tiles(1000, 500, 300, 200, 120, 60)
+        self.assertEqual(tiles[-1][0] + tiles[-1][2], 1000)
+        self.assertEqual(tiles[-1][1] + tiles[-1][3], 500)
+
+        for x in range(0, 1000 - 120, 7):
+            for y in range(0, 500 - 60, 11):
+                contained = any(
+                    tx <= x and x + 120 <= tx + tw and ty <= y and y + 60 <= ty + th
+                    for tx, ty, tw, th in tiles
+                )
+                self.assertTrue(contained, f"objeto em ({x}, {y}) não coberto")
+
+    def test_inner_border_ignores_frame_edges(self):
+        """Testa se apenas bordas internas do bloco descartam caixas"""
+        from tiling import touches_inner_border
+
+        tile = (0, 0, 100, 100)
+        self.assertFalse(touches_inner_border((0, 0, 10, 10), tile, (200, 200), 3))
+        self.assertTrue(touches_inner_border((90, 10, 9, 10), tile, (200, 200), 3))
+        self.assertFalse(touches_inner_border((90, 10, 9, 10), tile, (100, 200), 3))
+
+    def test_tiles_to_cells_mapping(self):
+        """Testa o mapeamento de blocos para as células de checksum"""
+        from tiling import compute_tiles, map_tiles_to_cells
+
+        tiles = compute_tiles(400, 200, 200, 200, 100, 0)
+        cells = compute_tiles(400, 200, 100, 100, 0, 0)
+        mapping = map_tiles_to_cells(tiles, cells)
+
+        self.assertEqual(len(mapping), len(tiles))
+        self.assertEqual(mapping[0], [0, 1, 4, 5])
+        # Toda célula pertence a pelo menos um bloco
+        self.assertEqual(set().union(*mapping), set(range(len(cells))))
+
+    def test_incremental_matches_full_pass(self):
+        """Testa que reutilizar blocos inalterados dá os contornos de uma varredura nova"""
+        from unittest.mock import patch
+
+        import cv2 as real_cv2
+
+        import detector as detector_module
+
+        # Em CI o cv2 do detector é um MagicMock; os contornos precisam do real
+        patcher = patch.object(detector_module, "cv2", real_cv2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        incremental = detector_module.BlueButtonDetector()
+        config = incremental.resolution_adapter.get_config_for_resolution(1920, 1080)
+
+        def frame_with(*positions):
+            frame = np.full((1080, 1920, 3), 235, dtype=np.uint8)
+            for x, y in positions:
+                frame[y : y + 40, x : x + 120] = (230, 130, 40)
+            return frame
+
+        def boxes(contours):
+            return {
+                profile: sorted(real_cv2.boundingRect(c) for c in found)
+                for profile, found in contours.items()
+                if found
+            }
+
+        blank = frame_with()
+        tiles = incremental._get_incremental_layout(blank, config)["tiles"]
+        # Botão atravessando a borda direita do primeiro bloco
+        border_x = tiles[0][0] + tiles[0][2] - 60
+        frames = [
+            blank,
+            frame_with((300, 300)),  # aparece
+            frame_with((300, 300)),  # inalterado (todos os blocos reutilizados)
+            frame_with((340, 310)),  # move
+            frame_with((border_x, 310)),  # cruza a borda de um bloco
+            frame_with((border_x, 310), (1500, 800)),  # segundo botão
+            frame_with((1500, 800)),  # o primeiro some
+            blank,  # todos somem
+        ]
+
+        for index, frame in enumerate(frames):
+            # Varredura única: detector novo, sem blocos em cache
+            full_pass = detector_module.BlueButtonDetector()
+            expected = boxes(full_pass._find_candidates_incremental(frame, config))
+            actual = boxes(incremental._find_candidates_incremental(frame, config))
+            self.assertEqual(actual, expected, f"frame {index}")
+            if index == 5:
+                self.assertEqual(sum(len(found) for found in actual.values()), 2)
+
+        processed = incremental.incremental_tiles_processed
+        self.assertLess(processed, incremental.incremental_tiles_total)
+
+    def test_non_max_suppression(self):
+        """Testa remoção de caixas duplicadas"""
+        from tiling import non_max_suppression
+
+        boxes = [(10, 10, 50, 20), (10, 10, 50, 20), (200, 200, 40, 20), (20, 10, 50, 20)]
+        keep = non_max_suppression(boxes, [1.0, 0.9, 0.5, 0.8], 0.9)
+        self.assertEqual(keep, [0, 3, 2])
+        self.assertEqual(non_max_suppression([], [], 0.5), [])
+
+
+class TestTracking(unittest.TestCase):
+    """Testes para o rastreamento de botões entre frames"""
+
+    @staticmethod
+    def _candidate(x, y, w=100, h=30, score=0.5):
+        return {"bounds": (x, y, w, h), "center": (x + w // 2, y + h // 2), "score": score}
+
+    def test_confirmation_and_stable_ids(self):
+        """Testa confirmação após N frames e manutenção do identificador"""
+        from tracking import ButtonTracker
+
+        tracker = ButtonTracker(iou_threshold=0.3, max_missed_frames=1, confirm_frames=3)
+
+        self.assertIsNone(tracker.update([self._candidate(100, 100)]))
+        self.assertIsNone(tracker.update([self._candidate(104, 100)]))
+        confirmed = tracker.update([self._candidate(108, 101)])
+
+        self.assertIsNotNone(confirmed)
+        self.assertEqual(confirmed["bounds"], (108, 101, 100, 30))
+        track_id = confirmed["track_id"]
+
+        # Um segundo botão distante recebe um novo rastro
+        result = tracker.update([self._candidate(112, 101), self._candidate(600, 400, score=0.9)])
+        self.assertEqual(result["track_id"], track_id)
+        self.assertEqual(len(tracker.tracks), 2)
+
+    def test_lost_track_is_dropped(self):
+        """Testa descarte de rastros sem associação"""
+        from tracking import ButtonTracker
+
+        tracker = ButtonTracker(iou_threshold=0.3, max_missed_frames=1, confirm_frames=1)
+        self.assertIsNotNone(tracker.update([self._candidate(100, 100)]))
+
+        self.assertIsNone(tracker.update([]))
+        self.assertIsNone(tracker.locked_track)
+        self.assertEqual(len(tracker.tracks), 1)
+
+        tracker.update([])
+        self.assertEqual(tracker.tracks, [])
+
+    def test_search_region_is_clamped(self):
+        """Testa se a região de verificação local fica dentro do frame"""
+        from tracking import ButtonTracker, Track
+
+        tracker = ButtonTracker()
+        track = Track(1, self._candidate(10, 10))
+        self.assertEqual(tracker.search_region(track, (1920, 1080), 0.5), (0, 0, 160, 90))
+
+    def test_profile_priority_wins_over_score(self):
+        """Testa se o rastro travado segue a prioridade do perfil antes do score"""
+        from tracking import ButtonTracker
+
+        tracker = ButtonTracker(confirm_frames=1)
+        blue = {**self._candidate(100, 100, score=0.5), "priority": 3}
+        grey = {**self._candidate(600, 400, score=0.9), "priority": 1}
+        self.assertEqual(tracker.update([grey, blue])["bounds"], blue["bounds"])
+
+
+class TestDetectionProfiles(unittest.TestCase):
+    """Testes para os perfis de detecção por cor"""
+
+    def test_profiles_are_adapted_and_sorted(self):
+        """Testa geração dos perfis habilitados com limites adaptados"""
+        from unittest.mock import patch
+
+        import resolution_adapter
+        from config import DETECTION_PROFILES
+
+        profiles = {name: {**p, "enabled": True} for name, p in DETECTION_PROFILES.items()}
+        with patch.object(resolution_adapter, "DETECTION_PROFILES", profiles):
+            adapter = resolution_adapter.ResolutionAdapter()
+            config = adapter.get_config_for_resolution(3840, 2160)
+
+        names = [p["name"] for p in config["profiles"]]
+        self.assertEqual(names, ["blue", "green", "grey"])
+
+        blue, _, grey = config["profiles"]
+        self.assertEqual(blue["max_width"], config["max_width"])
+        self.assertEqual(grey["min_aspect_ratio"], 1.5)
+        self.assertEqual(grey["max_width"], config["max_width"])
+        self.assertEqual(blue["color_ranges"][0][0].dtype, np.uint8)
+
+    def test_disabled_profiles_are_skipped(self):
+        """Testa se apenas o perfil azul é gerado com a configuração padrão"""
+        from resolution_adapter import ResolutionAdapter
+
+        config = ResolutionAdapter().get_config_for_resolution(1920, 1080)
+        self.assertEqual([p["name"] for p in config["profiles"]], ["blue"])
+
+
+class TestMultiTarget(unittest.TestCase):
+    """Testes para a sequência de cliques em vários botões"""
+
+    TARGETS = [
+        {"center": (100, 500), "bounds": (50, 480, 100, 40), "score": 0.9, "priority": 1},
+        {"center": (300, 100), "bounds": (250, 80, 100, 40), "score": 0.5, "priority": 3},
+        {"center": (500, 300), "bounds": (450, 280, 100, 40), "score": 0.7, "priority": 3},
+    ]
+
+    def test_target_order(self):
+        """Testa as ordens de clique configuráveis"""
+        from monitor import MonitoringManager
+
+        def centers(order):
+            return [t["center"] for t in MonitoringManager._order_targets(self.TARGETS, order)]
+
+        self.assertEqual(centers("score"), [(100, 500), (500, 300), (300, 100)])
+        self.assertEqual(centers("top_to_bottom"), [(300, 100), (500, 300), (100, 500)])
+        self.assertEqual(centers("priority"), [(500, 300), (300, 100), (100, 500)])
+
+    def test_failed_verification_skips_target(self):
+        """Testa se alvos que sumiram após o primeiro clique não são clicados"""
+        from unittest.mock import Mock, patch
+
+        import monitor
+
+        manager = monitor.MonitoringManager()
+        manager.is_monitoring = True
+        manager.detector = Mock()
+        manager.detector.verify_candidate.side_effect = [False, True]
+
+        with patch.object(monitor, "pyautogui") as mock_gui, patch.object(monitor.time, "sleep"):
+            mock_gui.position.return_value = (500, 500)
+            manager._handle_targets_found(self.TARGETS)
+
+        clicked = [c.args for c in mock_gui.click.call_args_list]
+        self.assertEqual(clicked, [(500, 300), (100, 500)])
+        self.assertEqual(manager.click_count, 2)
+
+
+class TestTextVerification(unittest.TestCase):
+    """Testes para a verificação do rótulo por OCR com cache"""
+
+    @staticmethod
+    def _frame(text_x=40):
+        frame = np.full((100, 200, 3), 240, dtype=np.uint8)
+        frame[30:70, 20:180] = (200, 120, 30)
+        frame[45:55, text_x : text_x + 80] = 255
+        return frame
+
+    def test_label_matching(self):
+        """Testa comparação de rótulos sem acentos, caixa ou pontuação"""
+        from ocr import ButtonTextVerifier
+
+        verifier = ButtonTextVerifier(labels=["Continue", "Continuar"])
+        self.assertTrue(verifier.matches_label("CONTINUAR ›"))
+        self.assertTrue(verifier.matches_label("  continue\n"))
+        self.assertFalse(verifier.matches_label("Discontinue"))
+        self.assertFalse(verifier.matches_label("Cancelar"))
+
+    def test_perceptual_hash(self):
+        """Testa estabilidade do hash a ruído leve e sensibilidade ao conteúdo"""
+        from ocr import perceptual_hash
+
+        crop = self._frame()[30:70, 20:180]
+        noise = np.random.default_rng(0).integers(-1, 2, crop.shape)
+        noisy = np.clip(crop.astype(int) + noise, 0, 255).astype(np.uint8)
+
+        self.assertEqual(perceptual_hash(crop), perceptual_hash(noisy))
+        self.assertNotEqual(perceptual_hash(crop), perceptual_hash(self._frame(80)[30:70, 20:180]))
+        self.assertEqual(perceptual_hash(crop[:5, :5]), perceptual_hash(crop[:5, :5].copy()))
+        self.assertNotEqual(perceptual_hash(crop[:5, :5]), perceptual_hash(crop[:5, :6]))
+        self.assertIsNone(perceptual_hash(crop[:0]))
+
+    def test_ocr_runs_once_per_appearance(self):
+        """Testa se aparências repetidas são resolvidas pelo cache"""
+        from unittest.mock import Mock, patch
+
+        import ocr
+
+        candidate = {"bounds": (20, 30, 160, 40)}
+        mock_tesseract = Mock()
+        mock_tesseract.image_to_string.return_value = "Continue\n"
+
+        with patch.object(ocr, "pytesseract", mock_tesseract):
+            verifier = ocr.ButtonTextVerifier(labels=["Continue"])
+            self.assertTrue(verifier.verify(self._frame(), dict(candidate)))
+            self.assertTrue(verifier.verify(self._frame(), dict(candidate)))
+
+            mock_tesseract.image_to_string.return_value = "Cancel"
+            self.assertFalse(verifier.verify(self._frame(80), dict(candidate)))
+
+        self.assertEqual(mock_tesseract.image_to_string.call_count, 2)
+        stats = verifier.get_statistics()
+        self.assertEqual(stats["ocr_cache_hits"], 1)
+        self.assertEqual(stats["ocr_rejections"], 1)
+
+    def test_small_crop_is_cached(self):
+        """Testa se recortes menores que a grade do hash também usam o cache"""
+        from unittest.mock import Mock, patch
+
+        import ocr
+
+        # Rótulo pequeno: 12x14 pixels, abaixo da grade 16x17 do dHash
+        candidate = {"bounds": (30, 40, 14, 12)}
+        mock_tesseract = Mock()
+        mock_tesseract.image_to_string.return_value = "OK"
+
+        with patch.object(ocr, "pytesseract", mock_tesseract):
+            verifier = ocr.ButtonTextVerifier(labels=["OK"])
+            self.assertTrue(verifier.verify(self._frame(), dict(candidate)))
+            self.assertTrue(verifier.verify(self._frame(), dict(candidate)))
+
+        self.assertEqual(mock_tesseract.image_to_string.call_count, 1)
+        self.assertEqual(verifier.get_statistics()["ocr_cache_hits"], 1)
+
+    def test_missing_tesseract_does_not_block(self):
+        """Testa se a falha do OCR desativa a verificação sem bloquear cliques"""
+        from unittest.mock import Mock, patch
+
+        import ocr
+
+        mock_tesseract = Mock()
+        mock_tesseract.image_to_string.side_effect = RuntimeError("tesseract not found")
+
+        with patch.object(ocr, "pytesseract", mock_tesseract):
+            verifier = ocr.ButtonTextVerifier()
+            self.assertTrue(verifier.verify(self._frame(), {"bounds": (20, 30, 160, 40)}))
+            self.assertFalse(verifier.available)
+
+
+class TestBackgroundModel(unittest.TestCase):
+    """Testes para o modelo de fundo de regiões coloridas estáticas"""
+
+    def setUp(self):
+        from unittest.mock import patch
+
+        import background
+
+        def integral(mask):
+            return np.pad(mask.astype(np.int64).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+
+        patcher = patch.object(background, "cv2")
+        patcher.start().integral.side_effect = integral
+        self.addCleanup(patcher.stop)
+
+        self.mask = np.zeros((64, 96), dtype=np.uint8)
+        self.mask[8:24, 16:48] = 255
+
+    def test_static_region_is_learned_and_released(self):
+        """Testa aprendizado após N frames e liberação imediata ao mudar"""
+        from background import BackgroundModel
+
+        model = BackgroundModel(cell_size=8, learn_frames=3)
+        for _ in range(3):
+            self.assertTrue(model.apply("blue", self.mask).any())
+        self.assertFalse(model.apply("blue", self.mask).any())
+
+        # Só as células alteradas voltam a ser analisadas
+        changed = self.mask.copy()
+        changed[10:14, 20:30] = 0
+        result = model.apply("blue", changed)
+        self.assertTrue(np.array_equal(result[8:16, 16:32], changed[8:16, 16:32]))
+        self.assertFalse(result[16:24].any())
+
+    def test_clicked_region_is_never_learned(self):
+        """Testa se células de botões clicados não viram fundo"""
+        from background import BackgroundModel
+
+        model = BackgroundModel(cell_size=8, learn_frames=2)
+        model.apply("blue", self.mask)
+        model.protect((16, 8, 32, 16))
+        for _ in range(5):
+            result = model.apply("blue", self.mask)
+        self.assertTrue(np.array_equal(result, self.mask))
+
+    def test_save_and_load(self):
+        """Testa persistência do modelo entre sessões"""
+        import tempfile
+
+        from background import BackgroundModel
+
+        model = BackgroundModel(cell_size=8, learn_frames=2)
+        for _ in range(3):
+            model.apply("blue", self.mask)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "background.npz")
+            self.assertTrue(model.save(path))
+
+            loaded = BackgroundModel(cell_size=8, learn_frames=2)
+            self.assertTrue(loaded.load(path))
+            self.assertFalse(loaded.apply("blue", self.mask).any())
+            self.assertFalse(BackgroundModel(cell_size=16).load(path))
+
+    def test_model_is_kept_per_frame_shape(self):
+        """Testa que alternar a escala do frame não descarta o aprendizado"""
+        import tempfile
+
+        from background import BackgroundModel
+
+        half = self.mask[::2, ::2]
+        model = BackgroundModel(cell_size=8, learn_frames=2)
+        for _ in range(3):
+            model.apply("blue", self.mask)
+            model.apply("blue", half)
+
+        # Cada escala manteve o próprio aprendizado
+        self.assertFalse(model.apply("blue", self.mask).any())
+        self.assertFalse(model.apply("blue", half).any())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "background.npz")
+            self.assertTrue(model.save(path))
+            loaded = BackgroundModel(cell_size=8, learn_frames=2)
+            self.assertTrue(loaded.load(path))
+            self.assertEqual(loaded.frame_shape, half.shape)
+            self.assertFalse(loaded.apply("blue", self.mask).any())
+
+        # Clique na escala atual protege o botão também na outra escala
+        model.apply("blue", self.mask)
+        model.protect((16, 8, 32, 16))
+        self.assertTrue(np.array_equal(model.apply("blue", half), half))
+
+        # Só as formas usadas mais recentemente são mantidas
+        small = BackgroundModel(cell_size=8, learn_frames=2, max_shapes=1)
+        for _ in range(3):
+            small.apply("blue", self.mask)
+        small.apply("blue", half)
+        self.assertTrue(small.apply("blue", self.mask).any())
+
+
+class TestHitPrior(unittest.TestCase):
+    """Testes para o mapa de calor de cliques"""
+
+    def test_hits_are_normalized_to_reference_resolution(self):
+        """Testa se cliques em resoluções diferentes caem na mesma célula"""
+        from heatmap import HitHeatmap
+
+        heatmap = HitHeatmap(cell_size=120, decay=0.5)
+        heatmap.record_hit(1000, 500, {"x": 1.0, "y": 1.0})
+        heatmap.record_hit(2000, 1000, {"x": 2.0, "y": 2.0})
+        self.assertEqual(heatmap.heat[4, 8], 1.5)
+        self.assertEqual(heatmap.get_statistics()["heatmap_cells"], 1)
+
+    def test_hot_regions_order_and_clamping(self):
+        """Testa regiões da mais quente para a mais fria, limitadas à tela"""
+        from heatmap import HitHeatmap
+
+        heatmap = HitHeatmap(cell_size=120, decay=1.0)
+        heatmap.record_hit(10, 10, {"x": 1.0, "y": 1.0})
+        for _ in range(2):
+            heatmap.record_hit(1000, 500, {"x": 1.0, "y": 1.0})
+
+        regions = heatmap.hot_regions((1920, 1080), {"x": 1.0, "y": 1.0}, (50, 30), 3, 0.5)
+        self.assertEqual(regions, [(910, 450, 220, 180), (0, 0, 170, 150)])
+
+    def test_save_and_load(self):
+        """Testa persistência do mapa entre sessões"""
+        import tempfile
+
+        from heatmap import HitHeatmap
+
+        heatmap = HitHeatmap(cell_size=120, decay=0.9)
+        heatmap.record_hit(300, 300, {"x": 1.0, "y": 1.0})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "heatmap.json")
+            self.assertTrue(heatmap.save(path))
+
+            loaded = HitHeatmap(cell_size=120)
+            self.assertTrue(loaded.load(path))
+            self.assertTrue(np.array_equal(loaded.heat, heatmap.heat))
+            self.assertFalse(HitHeatmap(cell_size=60).load(path))
+
+    def _prior_manager(self):
+        """Monitor com mapa de calor e detector real sobre um frame fixo com um botão"""
+        from unittest.mock import patch
+
+        import cv2 as real_cv2
+
+        import detector as detector_module
+        import monitor
+        from heatmap import HitHeatmap
+
+        # Em CI o cv2 do detector é um MagicMock; a busca precisa do real
+        patcher = patch.object(detector_module, "cv2", real_cv2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        frame = np.full((1080, 1920, 3), 235, dtype=np.uint8)
+        frame[500:540, 940:1060] = (230, 130, 40)
+
+        manager = monitor.MonitoringManager()
+        manager.detector = detector_module.BlueButtonDetector()
+        config = manager.detector.resolution_adapter.get_config_for_resolution(1920, 1080)
+        for name, value in (("get_adapted_config", config), ("capture_frame", frame)):
+            patcher = patch.object(manager.detector, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        manager.heatmap = HitHeatmap(cell_size=120, decay=1.0)
+        manager.heatmap.record_hit(1000, 520, config["scale_factors"])
+        return manager
+
+    def test_uncertain_region_hit_counts_one_detection(self):
+        """Testa que a busca nas regiões seguida da varredura conta um ciclo só"""
+        from unittest.mock import patch
+
+        import monitor
+
+        manager = self._prior_manager()
+        # Nenhum acerto é confiante: a região é buscada e a tela inteira varrida
+        with patch.dict(monitor.HIT_PRIOR, {"confident_score": 2.0}):
+            self.assertIsNotNone(manager._detect_with_prior())
+
+        detector = manager.detector
+        self.assertEqual(detector.region_scans, 1)
+        self.assertEqual(manager.full_sweeps, 1)
+        self.assertEqual(detector.detection_count, 1)
+        self.assertEqual(detector.successful_detections, 1)
+        self.assertEqual(sum(detector.profile_detections.values()), 1)
+
+    def test_confident_region_hit_goes_through_tracker(self):
+        """Testa que o acerto nas regiões espera a confirmação do rastreador"""
+        from unittest.mock import patch
+
+        import monitor
+        from tracking import ButtonTracker
+
+        manager = self._prior_manager()
+        manager.detector.tracker = ButtonTracker(confirm_frames=2)
+        with patch.dict(monitor.HIT_PRIOR, {"confident_score": 0.0}):
+            self.assertIsNone(manager._detect_with_prior())
+            center_x, center_y, width, height = manager._detect_with_prior()
+
+        self.assertEqual((width, height), (120, 40))
+        self.assertEqual(manager.prior_hits, 2)
+        self.assertEqual(manager.full_sweeps, 0)
+        self.assertEqual(manager.detector.detection_count, 2)
+        self.assertEqual(manager.detector.successful_detections, 1)
+        self.assertIn("track_id", manager.detector.last_detection)
+
+
+class TestPredictiveScheduling(unittest.TestCase):
+    """Testes para o agendamento preditivo por intervalo entre aparições"""
+
+    def _trained(self):
+        from scheduler import AppearancePredictor
+
+        predictor = AppearancePredictor(min_samples=5, history_size=50)
+        for i in range(6):
+            predictor.record_appearance(1000.0 + 50.0 * i)
+        return predictor
+
+    def test_scans_slowly_until_window_opens(self):
+        """Testa varredura lenta antes da janela e normal dentro dela"""
+        predictor = self._trained()
+        start, end = predictor.predicted_window()
+        self.assertLess(start, 50.0)
+        self.assertGreater(end, 50.0)
+
+        last = predictor.last_appearance
+        self.assertEqual(predictor.next_interval(last + 1.0, 0.5), 5.0)
+        self.assertAlmostEqual(predictor.next_interval(last + start - 2.0, 0.5), 2.0)
+        self.assertEqual(predictor.next_interval(last + start + 1.0, 0.5), 0.5)
+        self.assertGreater(predictor.get_statistics()["scans_saved"], 0)
+
+    def test_wrong_prediction_falls_back_to_normal_polling(self):
+        """Testa volta ao intervalo normal após uma aparição fora da janela"""
+        predictor = self._trained()
+        predictor.record_appearance(predictor.last_appearance + 50.0)
+        predictor.record_appearance(predictor.last_appearance + 10.0)
+
+        self.assertTrue(predictor.fallback)
+        self.assertEqual(predictor.next_interval(predictor.last_appearance + 1.0, 0.5), 0.5)
+        stats = predictor.get_statistics()
+        self.assertEqual((stats["predictions"], stats["early_misses"]), (2, 1))
+        self.assertEqual(stats["prediction_accuracy"], 50.0)
+
+
+class TestCpuGovernor(unittest.TestCase):
+    """Testes para o governador de orçamento de CPU"""
+
+    def test_interval_stretches_to_fit_budget(self):
+        """Testa se o intervalo é o menor que respeita o orçamento"""
+        from governor import CpuGovernor
+
+        governor = CpuGovernor(budget_percent=20.0, scales=(1.0,))
+        governor.record_cycle(cpu_time=0.1, wall_time=0.1)
+        # 0.1 s de CPU a 20% exige um período de 0.5 s (0.1 s de ciclo + 0.4 s de espera)
+        self.assertAlmostEqual(governor.next_interval(0.1), 0.4)
+        self.assertEqual(governor.next_interval(1.0), 1.0)
+
+    def test_scale_steps_down_and_back_up(self):
+        """Testa a troca de escala quando o intervalo passaria da tolerância"""
+        from governor import CpuGovernor
+
+        governor = CpuGovernor(budget_percent=20.0, scales=(1.0, 0.5))
+        governor.record_cycle(cpu_time=0.2, wall_time=0.2)
+        governor.next_interval(0.2)
+        self.assertEqual(governor.scale, 0.5)
+
+        # Custo baixo na escala menor: a escala nativa volta a caber no orçamento
+        for _ in range(20):
+            governor.record_cycle(cpu_time=0.005, wall_time=0.05)
+        governor.next_interval(0.2)
+        self.assertEqual(governor.scale, 1.0)
+        self.assertEqual(governor.get_statistics()["scale_changes"], 2)
+
+
+class TestCycleWatchdog(unittest.TestCase):
+    """Testes para o watchdog do prazo dos ciclos"""
+
+    def test_overrun_detected_while_cycle_runs(self):
+        """Testa estouro detectado antes do ciclo terminar"""
+        from watchdog import CycleWatchdog
+
+        watchdog = CycleWatchdog(timeout=1.0, restart_after=5)
+        watchdog.begin_cycle()
+        self.assertFalse(watchdog.check(time.monotonic()))
+        self.assertTrue(watchdog.check(time.monotonic() + 1.5))
+        self.assertFalse(watchdog.check(time.monotonic() + 1.8))
+
+        watchdog.end_cycle(True)
+        stats = watchdog.get_statistics()
+        self.assertEqual(stats["cycle_overruns"], 1)
+        self.assertIsNone(stats["last_successful_cycle"])
+
+        watchdog.begin_cycle()
+        watchdog.end_cycle(True)
+        self.assertIsNotNone(watchdog.get_statistics()["last_successful_cycle"])
+        self.assertEqual(watchdog.consecutive_overruns, 0)
+
+    def test_restart_after_repeated_overruns(self):
+        """Testa reinicialização após estouros seguidos"""
+        from unittest.mock import MagicMock
+
+        from watchdog import CycleWatchdog
+
+        on_restart = MagicMock()
+        watchdog = CycleWatchdog(timeout=1.0, restart_after=2, on_restart=on_restart)
+        for _ in range(2):
+            watchdog.begin_cycle()
+            watchdog.check(time.monotonic() + 2.0)
+        on_restart.assert_called_once()
+        self.assertEqual(watchdog.get_statistics()["pipeline_restarts"], 1)
+
+    def test_restart_while_single_cycle_stays_stuck(self):
+        """Testa reinicialização de um ciclo que nunca termina"""
+        from unittest.mock import MagicMock
+
+        from watchdog import CycleWatchdog
+
+        on_restart = MagicMock()
+        watchdog = CycleWatchdog(timeout=1.0, restart_after=3, on_restart=on_restart)
+        watchdog.begin_cycle()
+        start = time.monotonic()
+        for step in range(1, 100):
+            watchdog.check(start + step * 0.25)
+
+        # ~24 períodos de timeout travado: 8 reinicializações de 3 estouros
+        stats = watchdog.get_statistics()
+        self.assertGreaterEqual(stats["cycle_overruns"], 23)
+        self.assertGreaterEqual(on_restart.call_count, 7)
+        self.assertEqual(stats["pipeline_restarts"], on_restart.call_count)
+
+        # O fim tardio do ciclo não conta mais um estouro
+        overruns = stats["cycle_overruns"]
+        watchdog.end_cycle(True)
+        self.assertEqual(watchdog.get_statistics()["cycle_overruns"], overruns)
+
+    def test_abandoned_thread_does_not_click(self):
+        """Testa que a thread substituída pelo watchdog não clica ao destravar"""
+        import threading
+        from unittest.mock import MagicMock, patch
+
+        import monitor
+
+        manager = monitor.MonitoringManager()
+        manager.is_monitoring = True
+        manager.detector = MagicMock()
+        manager.detector.detect_button.return_value = (100, 100, 80, 30)
+        manager.monitor_thread = threading.Thread(target=lambda: None)
+
+        with patch.object(monitor, "MULTI_TARGET", {"enabled": False}), patch.object(
+            manager, "_handle_button_found"
+        ) as handle, patch.object(manager, "_check_emergency_stop", return_value=False):
+            self.assertFalse(manager._monitoring_cycle())
+        handle.assert_not_called()
+
+
+class TestCoalescedUiUpdates(unittest.TestCase):
+    """Testes para as atualizações da UI agrupadas por timer"""
+
+    def test_flush_delivers_latest_state_once(self):
+        """Testa entrega apenas do último valor e só quando ele muda"""
+        from unittest.mock import MagicMock
+
+        import monitor
+
+        manager = monitor.MonitoringManager()
+        status, clicks, stats = MagicMock(), MagicMock(), MagicMock()
+        manager.set_callbacks(status, clicks, stats)
+
+        for count in range(1, 6):
+            manager.click_count = count
+            manager._update_click_counter()
+        manager._update_status("Monitorando...", "#F18F01")
+        manager.flush_ui_updates()
+        manager.flush_ui_updates()
+
+        clicks.assert_called_once_with(5)
+        status.assert_called_once_with("Monitorando...", "#F18F01")
+        stats.assert_not_called()
+
+    def test_stats_built_once_per_flush(self):
+        """Testa que os snapshots de estatísticas só são montados no timer da UI"""
+        from unittest.mock import MagicMock, Mock, patch
+
+        import monitor
+
+        manager = monitor.MonitoringManager()
+        stats = MagicMock()
+        manager.set_callbacks(MagicMock(), MagicMock(), stats)
+        manager.detector = Mock(detection_count=0, successful_detections=0)
+        manager.detector.get_statistics.return_value = {
+            "success_rate": 0.0,
+            "total_detections": 0,
+            "successful_detections": 0,
+        }
+
+        with patch.object(
+            manager.detection_latency, "snapshot", wraps=manager.detection_latency.snapshot
+        ) as snapshot:
+            for count in range(1, 6):
+                manager.click_count = count
+                manager._update_statistics()
+            snapshot.assert_not_called()
+
+            manager.flush_ui_updates()
+            manager.flush_ui_updates()
+            self.assertEqual(snapshot.call_count, 1)
+
+        stats.assert_called_once()
+        self.assertEqual(stats.call_args.args[0]["click_count"], 5)
+
+    def test_label_redrawn_only_when_text_changes(self):
+        """Testa que o label só é reconfigurado quando o texto exibido muda"""
+        from unittest.mock import MagicMock
+
+        from ui import ModernUI
+
+        ui = ModernUI(MagicMock())
+        ui.avg_time_label = MagicMock()
+        for value in (0.101, 0.102, 0.3):
+            ui.update_avg_time(value)
+        self.assertEqual(ui.avg_time_label.config.call_count, 2)
+
+
+class TestLatencyStats(unittest.TestCase):
+    """Testes para as estatísticas de latência em memória fixa"""
+
+    def test_percentiles_within_bucket_error(self):
+        """Testa percentis do histograma contra os exatos"""
+        from latency import LatencyStats
+
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(mean=np.log(0.02), sigma=0.8, size=5000)
+        stats = LatencyStats()
+        for value in values:
+            stats.record(float(value), now=100.0)
+
+        snapshot = stats.snapshot(now=100.0)
+        for q in (50, 90, 99):
+            exact = np.percentile(values, q)
+            self.assertAlmostEqual(snapshot[f"p{q}"] / exact, 1.0, delta=0.07)
+        self.assertEqual(snapshot["max"], values.max())
+        self.assertAlmostEqual(snapshot["mean"], values.mean())
+
+    def test_sliding_windows(self):
+        """Testa amostras antigas saindo da janela curta e ficando na longa"""
+        from latency import LatencyStats
+
+        stats = LatencyStats(windows={"1m": 60, "15m": 900}, slot_seconds=10)
+        for _ in range(30):
+            stats.record(0.5, now=1000.0)
+        for _ in range(10):
+            stats.record(0.01, now=1300.0)
+
+        windows = stats.snapshot(now=1305.0)["windows"]
+        self.assertEqual(windows["1m"]["count"], 10)
+        self.assertEqual(windows["1m"]["max"], 0.01)
+        self.assertEqual(windows["15m"]["count"], 40)
+        self.assertEqual(windows["15m"]["max"], 0.5)
+
+    def test_concurrent_records(self):
+        """Testa contagens consistentes com várias threads gravando"""
+        import threading
+
+        from latency import LatencyStats
+
+        stats = LatencyStats()
+        threads = [
+            threading.Thread(target=lambda: [stats.record(0.01) for _ in range(2000)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["count"], 8000)
+        self.assertEqual(snapshot["windows"]["1m"]["count"], 8000)
+
+
+class TestProfiler(unittest.TestCase):
+    """Testes para o profiler de operações"""
+
+    def test_context_manager_and_decorator(self):
+        """Testa medições aninhadas por context manager e decorador"""
+        from utils import PerformanceProfiler
+
+        profiler = PerformanceProfiler()
+
+        @profiler.profile("outer")
+        def outer():
+            with profiler.measure("inner"):
+                self.assertEqual(profiler.current_operation(), "inner")
+            return 42
+
+        for _ in range(3):
+            self.assertEqual(outer(), 42)
+
+        stats = profiler.get_all_statistics()
+        self.assertEqual((stats["outer"]["count"], stats["inner"]["count"]), (3, 3))
+        self.assertGreaterEqual(stats["outer"]["total"], stats["inner"]["total"])
+        self.assertIn("p99", stats["outer"])
+        self.assertIsNone(profiler.current_operation())
+
+    def test_threads_do_not_share_timers(self):
+        """Testa timers da mesma operação em threads concorrentes"""
+        import threading
+
+        from utils import PerformanceProfiler
+
+        profiler = PerformanceProfiler()
+        barrier = threading.Barrier(2)
+
+        def worker(delay):
+            profiler.start_timer("op")
+            barrier.wait()
+            time.sleep(delay)
+            results.append(profiler.end_timer("op"))
+
+        results = []
+        threads = [threading.Thread(target=worker, args=(d,)) for d in (0.01, 0.05)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 2)
+        self.assertGreater(max(results), 0.045)
+        self.assertEqual(profiler.get_statistics("op")["count"], 2)
+
+    def test_disabled_profiler_has_no_wrappers(self):
+        """Testa que o profiler desativado não envolve funções nem registra"""
+        from utils import PerformanceProfiler
+
+        profiler = PerformanceProfiler(enabled=False)
+
+        def func():
+            return 1
+
+        self.assertIs(profiler.profile()(func), func)
+        self.assertIs(profiler.measure("a"), profiler.measure("b"))
+        profiler.start_timer("op")
+        self.assertIsNone(profiler.end_timer("op"))
+        self.assertEqual(profiler.get_all_statistics(), {})
+
+
+class TestTracing(unittest.TestCase):
+    """Testes para a exportação de trace dos ciclos"""
+
+    def test_export_nested_spans(self):
+        """Testa trechos aninhados exportados como trace events"""
+        import json
+        import tempfile
+
+        from tracing import TraceRecorder
+        from utils import PerformanceProfiler
+
+        tracer = TraceRecorder(buffer_size=4)
+        profiler = PerformanceProfiler(tracer=tracer)
+
+        with profiler.measure("cycle"):
+            with profiler.measure("detect"):
+                pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = tracer.export(os.path.join(tmp, "trace.json"))
+            with open(path, encoding="utf-8") as f:
+                events = json.load(f)["traceEvents"]
+
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        self.assertEqual(set(spans), {"cycle", "detect"})
+        self.assertGreaterEqual(spans["detect"]["ts"], spans["cycle"]["ts"])
+        self.assertLessEqual(spans["detect"]["dur"], spans["cycle"]["dur"])
+        self.assertTrue(any(e["ph"] == "M" and e["name"] == "thread_name" for e in events))
+
+    def test_ring_buffer_is_bounded(self):
+        """Testa que o anel descarta os trechos mais antigos"""
+        from tracing import TraceRecorder
+
+        tracer = TraceRecorder(buffer_size=3)
+        for i in range(10):
+            tracer.add(f"op{i}", i, 1)
+
+        self.assertEqual(tracer.get_statistics()["trace_spans"], 3)
+        names = [e["name"] for e in tracer.to_trace_events() if e["ph"] == "X"]
+        self.assertEqual(names, ["op7", "op8", "op9"])
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    """Testes para o endpoint de métricas Prometheus"""
+
+    def test_metrics_text_without_screen_access(self):
+        """Testa contadores, histograma e resolução sem capturar a tela"""
+        from unittest.mock import MagicMock, patch
+
+        import monitor
+        import resolution_adapter
+
+        manager = monitor.MonitoringManager()
+        manager.detector = MagicMock()
+        manager.detector.get_statistics.return_value = {"total_detections": 4}
+        manager.detector.resolution_adapter = resolution_adapter.ResolutionAdapter()
+        manager.click_count = 3
+        for value in (0.004, 0.02, 0.02, 0.3):
+            manager.detection_latency.record(value)
+
+        with patch.object(resolution_adapter, "pyautogui") as gui:
+            text = manager.get_metrics_text()
+            gui.screenshot.assert_not_called()
+            gui.size.assert_not_called()
+
+        self.assertIn("continuador_clicks_total 3.0", text)
+        self.assertIn("continuador_detections_total 4.0", text)
+        self.assertIn('continuador_detection_duration_seconds_bucket{le="0.025"} 3.0', text)
+        self.assertIn('continuador_detection_duration_seconds_bucket{le="+Inf"} 4.0', text)
+        self.assertIn('current="1920x1080"', text)
+
+    def test_http_scrape(self):
+        """Testa um scrape HTTP em porta livre"""
+        from urllib.request import urlopen
+
+        from metrics_server import MetricsServer
+
+        server = MetricsServer(lambda: "continuador_up 1.0\n", host="127.0.0.1", port=0)
+        self.assertTrue(server.start())
+        try:
+            with urlopen(server.address, timeout=5) as response:
+                self.assertEqual(response.read().decode(), "continuador_up 1.0\n")
+                self.assertIn("version=0.0.4", response.headers["Content-Type"])
+        finally:
+            server.stop()
+
+
+class TestStructuredLogger(unittest.TestCase):
+    """Testes para o log estruturado assíncrono"""
+
+    def test_json_lines_and_rotation(self):
+        """Testa registros JSON gravados em segundo plano e rotação por tamanho"""
+        import json
+        import tempfile
+
+        from logs import Logger
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "test.log")
+            logger = Logger(path, level="INFO", max_size=2000, backup_count=2, console=False)
+            for i in range(100):
+                logger.info(f"mensagem {i}", index=i)
+                if i % 10 == 9:
+                    self.assertTrue(logger.flush())
+            logger.close()
+
+            self.assertGreater(logger.rotations, 0)
+            self.assertTrue(os.path.exists(path + ".1"))
+            self.assertFalse(os.path.exists(path + ".3"))
+
+            with open(path, encoding="utf-8") as f:
+                last = [json.loads(line) for line in f][-1]
+            self.assertEqual(last["msg"], "mensagem 99")
+            self.assertEqual((last["level"], last["index"]), ("INFO", 99))
+
+    def test_disabled_level_is_not_queued(self):
+        """Testa que níveis abaixo do configurado não chegam à fila"""
+        from logs import Logger
+
+        logger = Logger("unused.log", level="WARNING", console=False)
+        logger.debug("debug")
+        logger.info("info")
+
+        self.assertIsNone(logger._thread)
+        self.assertTrue(logger._queue.empty())
+
+    def test_zero_backups_are_honoured(self):
+        """Testa que backup_count=0 descarta o arquivo cheio em vez de usar o padrão"""
+        import tempfile
+
+        from logs import Logger
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "test.log")
+            logger = Logger(path, level="INFO", max_size=500, backup_count=0, console=False)
+            self.assertEqual(logger.backup_count, 0)
+            for i in range(50):
+                logger.info(f"mensagem {i}")
+                self.assertTrue(logger.flush())
+            logger.close()
+
+            self.assertGreater(logger.rotations, 0)
+            self.assertFalse(os.path.exists(path + ".1"))
+
+    def test_log_after_close_writes_without_thread(self):
+        """Testa que registros após close são gravados sem reiniciar a thread"""
+        import json
+        import tempfile
+
+        from logs import Logger
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "test.log")
+            logger = Logger(path, level="INFO", console=False)
+            logger.info("antes")
+            logger.close()
+            logger.warning("depois")
+
+            self.assertIsNone(logger._thread)
+            with open(path, encoding="utf-8") as f:
+                messages = [json.loads(line)["msg"] for line in f]
+        self.assertEqual(messages, ["antes", "depois"])
+
+
+class TestSessionHistory(unittest.TestCase):
+    """Testes para o histórico de sessões em SQLite"""
+
+    def test_batched_writes_and_summary(self):
+        """Testa ciclos e cliques gravados em segundo plano e os agregados"""
+        import tempfile
+
+        from history import SessionHistory, summarize
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.db")
+            history = SessionHistory(path)
+            history.start_session("1920x1080")
+
+            start = time.time() - 3600
+            pattern = [1, 0, 0, 1, 0, 0, 0, 1, 0]
+            for i, found in enumerate(pattern):
+                box = (10, 20, 100, 40) if found else None
+                history.record_cycle(start + i, 0.01 * (i + 1), found, box, 0.9, "blue")
+                if found:
+                    history.record_click(start + i, box, 0.9, "blue")
+            history.end_session()
+            self.assertTrue(history.flush())
+            history.close()
+
+            summary = summarize(path)
+
+        self.assertEqual((summary["sessions"], summary["cycles"], summary["clicks"]), (1, 9, 3))
+        self.assertEqual(summary["found_cycles"], 3)
+        self.assertEqual(summary["miss_streaks"], 3)
+        self.assertEqual(summary["longest_miss_streak"], 3)
+        self.assertAlmostEqual(summary["latency"]["p50"], 0.05)
+        self.assertGreater(summary["clicks_per_hour"], 0)
+
+
+class TestCycleMetrics(unittest.TestCase):
+    """Testes para as métricas por ciclo em arquivo mapeado"""
+
+    def test_append_grows_in_chunks_and_reopens(self):
+        """Testa crescimento em blocos, reabertura e leitura sem cópia"""
+        import tempfile
+
+        from cycle_metrics import CycleMetricsFile, load_cycle_metrics
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cycles.bin")
+            metrics = CycleMetricsFile(path, chunk_records=8)
+            for i in range(10):
+                metrics.append(float(i), 0.02, capture=0.005, detect=0.01, candidates=i)
+            self.assertEqual(metrics.capacity, 16)
+            metrics.close()
+
+            metrics = CycleMetricsFile(path, chunk_records=8)
+            metrics.append(10.0, 0.05, clicks=1, score=0.9)
+            metrics.close()
+
+            records = load_cycle_metrics(path)
+            self.assertIsInstance(records, np.memmap)
+            self.assertEqual(len(records), 11)
+            self.assertEqual(records["candidates"][9], 9)
+            self.assertEqual(records["clicks"].sum(), 1)
+            del records
+
+    def test_rolling_percentile_and_breakdown(self):
+        """Testa percentis móveis e participação das etapas"""
+        from cycle_metrics import CYCLE_DTYPE, rolling_percentile, stage_breakdown
+
+        values = np.arange(10, dtype=np.float64)
+        np.testing.assert_allclose(rolling_percentile(values, 3, 50, block_size=4), values[1:-1])
+
+        records = np.zeros(4, dtype=CYCLE_DTYPE)
+        records["cycle"] = 0.1
+        records["capture"] = 0.04
+        records["detect"] = 0.05
+        records["click"] = np.nan
+        breakdown = stage_breakdown(records)
+        self.assertAlmostEqual(breakdown["capture"]["share"], 0.4, places=5)
+        self.assertAlmostEqual(breakdown["other"]["share"], 0.1, places=5)
+        self.assertEqual(breakdown["click"]["mean"], 0.0)
+
+    def test_monitor_cycle_stages(self):
+        """Testa que capturas do pós-clique não contam como captura e a espera real"""
+        from unittest.mock import Mock, patch
+
+        from monitor import MonitoringManager
+
+        manager = MonitoringManager()
+        manager.is_monitoring = True
+        manager.cycle_metrics = Mock()
+        manager.detector = Mock(capture_seconds=0.0, last_candidate_count=1)
+        manager.detector.last_detection = {"score": 0.9}
+        manager._last_wait = 0.3
+
+        def detect():
+            time.sleep(0.02)
+            manager.detector.capture_seconds += 0.01
+            return (100, 100, 120, 40)
+
+        def click(button_info):
+            # Verificação pós-clique captura a região do botão
+            manager.detector.capture_seconds += 0.5
+
+        manager.detector.detect_button.side_effect = detect
+        with patch.object(manager, "_check_emergency_stop", return_value=False), patch.object(
+            manager, "_handle_button_found", side_effect=click
+        ):
+            self.assertTrue(manager._monitoring_cycle())
+
+        row = manager.cycle_metrics.append.call_args.kwargs
+        self.assertAlmostEqual(row["capture"], 0.01)
+        self.assertGreater(row["detect"], 0.0)
+        self.assertEqual(row["interval"], 0.3)
+
+
+class TestCaptureRecording(unittest.TestCase):
+    """Testes para a gravação e o replay de capturas"""
+
+    def _frames(self):
+        """Frames sintéticos: um botão que aparece e some sobre um fundo fixo"""
+        base = np.full((300, 410, 3), 235, dtype=np.uint8)
+        frames = [base.copy() for _ in range(5)]
+        frames[1][140:160, 170:230] = (230, 130, 40)
+        frames[2][140:160, 170:230] = (230, 130, 40)
+        frames[3][0:5, 400:410] = 0
+        return frames
+
+    def test_round_trip_with_deltas(self):
+        """Testa que o replay devolve os frames gravados, com deltas menores"""
+        import tempfile
+
+        from recording import CaptureRecorder, CaptureReplay
+
+        frames = self._frames()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.rec")
+            recorder = CaptureRecorder(path, screen_resolution=(410, 300))
+            for frame in frames:
+                recorder.add(frame)
+            recorder.close()
+            self.assertEqual(recorder.frames, 5)
+            self.assertEqual(recorder.key_frames, 1)
+            self.assertLess(recorder.changed_tiles, recorder.total_tiles)
+
+            replay = CaptureReplay(path, realtime=False)
+            self.assertEqual(replay.resolution, (410, 300))
+            for frame in frames:
+                np.testing.assert_array_equal(replay.read(), frame)
+            crop = replay.read(region=(400, 0, 10, 5))
+            np.testing.assert_array_equal(crop, frames[4][0:5, 400:410])
+            with self.assertRaises(EOFError):
+                replay.read()
+            self.assertTrue(replay.finished)
+            replay.close()
+
+    def test_detector_replays_recording(self):
+        """Testa o detector alimentado pelo replay no lugar da tela"""
+        import tempfile
+
+        from detector import BlueButtonDetector
+        from recording import CaptureRecorder, CaptureReplay, replay_detections
+
+        frames = self._frames()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.rec")
+            recorder = CaptureRecorder(path, screen_resolution=(410, 300))
+            for frame in frames:
+                recorder.add(frame)
+            recorder.close()
+
+            replay = CaptureReplay(path, realtime=False)
+            detector = BlueButtonDetector(frame_source=replay)
+            self.assertEqual(detector.get_adapted_config()["resolution"], (410, 300))
+            np.testing.assert_array_equal(detector.capture_frame(), frames[0])
+            np.testing.assert_array_equal(detector.capture_frame(), frames[1])
+            replay.close()
+
+            detector = BlueButtonDetector()
+            self.assertEqual(len(replay_detections(path, detector)), 5)
+            self.assertIsNone(detector.frame_source)
+
+
+class TestPresenceCheck(unittest.TestCase):
+    """Testes para a pré-verificação por amostragem esparsa"""
+
+    def setUp(self):
+        from unittest.mock import patch
+
+        import cv2 as real_cv2
+
+        import detector as detector_module
+
+        # Em CI o cv2 do detector é um MagicMock; a amostragem precisa do real
+        patcher = patch.object(detector_module, "cv2", real_cv2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.detector = detector_module.BlueButtonDetector()
+        self.config = self.detector.resolution_adapter.get_config_for_resolution(1920, 1080)
+
+    def test_minimum_size_button_passes_anywhere(self):
+        """Testa que um botão do tamanho mínimo é amostrado em qualquer posição"""
+        profile = self.config["profiles"][0]
+        width, height = profile["min_width"], profile["min_height"]
+
+        # Todas as posições dentro de um período da grade (e mais um)
+        for offset_x in range(0, width + 1, 3):
+            for offset_y in range(0, height + 1, 3):
+                frame = np.full((1080, 1920, 3), 235, dtype=np.uint8)
+                x, y = 500 + offset_x, 300 + offset_y
+                frame[y : y + height, x : x + width] = (230, 130, 40)
+                self.assertTrue(
+                    self.detector._passes_presence_check(frame, self.config),
+                    f"botão {width}x{height} em ({x}, {y}) rejeitado",
+                )
+        self.assertEqual(self.detector.precheck_rejects, 0)
+
+    def test_blank_frame_rejected_and_counted(self):
+        """Testa a rejeição de um frame sem cor de perfil e as estatísticas"""
+        frame = np.full((1080, 1920, 3), 235, dtype=np.uint8)
+
+        self.assertFalse(self.detector._passes_presence_check(frame, self.config))
+        self.assertEqual(self.detector.precheck_rejects, 1)
+        self.assertGreater(self.detector.precheck_time, 0.0)
+        # Sem média do pipeline completo ainda não há economia estimada
+        self.assertEqual(self.detector.precheck_time_saved, 0.0)
+
+        self.detector._update_pipeline_time(10.0)
+        self.assertFalse(self.detector._passes_presence_check(frame, self.config))
+        self.assertEqual(self.detector.precheck_rejects, 2)
+        self.assertGreater(self.detector.precheck_time_saved, 9.0)
+
+        stats = self.detector.get_statistics()
+        self.assertEqual(stats["precheck_rejects"], 2)
+
+
+class TestSimulation(unittest.TestCase):
+    """Testes para a tela simulada e o backend de entrada falso"""
+
+    def test_clicks_and_report(self):
+        """Testa acertos, cliques errados, botões perdidos e latência"""
+        from unittest.mock import patch
+
+        from simulation import FakeInput, SimulatedButton, VirtualDesktop
+
+        buttons = [
+            SimulatedButton(0.0, 100, 100, 120, 40),
+            SimulatedButton(0.0, 300, 100, 120, 40, lifetime=1.0),
+            SimulatedButton(0.5, 100, 300, 120, 40, velocity=(100.0, 0.0)),
+        ]
+        desktop = VirtualDesktop(buttons, 640, 480)
+        fake = FakeInput(desktop)
+
+        frame = desktop.render(0.0)
+        self.assertEqual(tuple(frame[105, 105]), (230, 130, 40))
+        self.assertEqual(tuple(frame[305, 105]), (235, 235, 235))
+        region = np.asarray(fake.screenshot(region=(100, 100, 10, 10)))
+        self.assertEqual(region.shape, (10, 10, 3))
+        self.assertEqual(tuple(region[0, 0]), (40, 130, 230))
+
+        with patch.object(desktop, "now", return_value=0.3):
+            fake.click(150, 120)
+            fake.click(150, 120)
+            fake.click(5, 5)
+        with patch.object(desktop, "now", return_value=1.5):
+            # Botão móvel: 100 px à direita após 1 s
+            fake.click(230, 320)
+
+        report = desktop.report(duration=2.0)
+        self.assertEqual(report["buttons"], 3)
+        self.assertEqual(report["clicked"], 2)
+        self.assertEqual(report["missed"], 1)
+        self.assertEqual(report["wrong_clicks"], 2)
+        self.assertAlmostEqual(report["latency"]["max"], 1.0)
+        self.assertEqual(fake.position(), (230, 320))
+
+    def test_schedule_and_overrides(self):
+        """Testa agendamento reprodutível e restauração das configurações"""
+        from config import TRACKING_CONFIG
+        from simulation import config_overrides, random_schedule
+
+        first = random_schedule(60, rate=1.0, seed=3, width=1280, height=720)
+        second = random_schedule(60, rate=1.0, seed=3, width=1280, height=720)
+        self.assertGreater(len(first), 20)
+        self.assertEqual(
+            [(b.appear_at, b.x, b.y) for b in first], [(b.appear_at, b.x, b.y) for b in second]
+        )
+        for button in first:
+            self.assertLessEqual(button.x + button.width, 1280)
+            self.assertLessEqual(button.y + button.height, 720)
+
+        original = dict(TRACKING_CONFIG)
+        with config_overrides({"TRACKING_CONFIG": {"enabled": not original["enabled"]}}):
+            self.assertNotEqual(TRACKING_CONFIG["enabled"], original["enabled"])
+        self.assertEqual(TRACKING_CONFIG, original)
+
+    def test_run_simulation_end_to_end(self):
+        """Testa o MonitoringManager real clicando no botão da tela simulada"""
+        from unittest.mock import patch
+
+        import cv2 as real_cv2
+
+        import background
+        import detector
+        import templates
+        from simulation import SimulatedButton, run_simulation
+
+        # Em CI o cv2 dos módulos é um MagicMock; a detecção precisa do real
+        for module in (detector, background, templates):
+            patcher = patch.object(module, "cv2", real_cv2)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        report = run_simulation(
+            # Botão proporcional à tela pequena (a área mínima escala com a resolução)
+            [SimulatedButton(0.1, 200, 200, 60, 20)],
+            duration=1.5,
+            interval=0.1,
+            settings={"MONITORING_CONFIG": {"post_click_delay": 0.1}},
+            width=640,
+            height=480,
+        )
+        self.assertEqual(report["clicked"], 1)
+        self.assertEqual(report["wrong_clicks"], 0)
+        self.assertGreater(report["avg_detection_time"], 0)
+
+
+class TestClickMetrics(unittest.TestCase):
+    """Testes para a latência até o clique e a verificação após o clique"""
+
+    def test_appear_to_click_latency(self):
+        """Testa a latência só no primeiro clique de cada aparecimento"""
+        from monitor import MonitoringManager
+
+        manager = MonitoringManager()
+        manager._observe_frame(10.0, False)
+        manager._observe_frame(10.5, True)
+        manager._record_click_latency(11.0)
+
+        # Mesmo botão ainda visível: clique repetido não conta
+        manager._observe_frame(11.5, True)
+        manager._record_click_latency(11.6)
+        # Resultado atrasado de um worker não reabre a sequência
+        manager._observe_frame(11.2, False)
+
+        manager._observe_frame(12.0, False)
+        manager._observe_frame(12.5, True)
+        manager._record_click_latency(12.75)
+
+        # Clique confirmado: o botão do frame seguinte é um novo aparecimento
+        manager._end_visibility()
+        manager._observe_frame(13.5, True)
+        manager._record_click_latency(13.6)
+
+        self.assertEqual(manager.first_seen_latency.count, 3)
+        self.assertAlmostEqual(manager.first_seen_latency.total, 0.75 + 0.1)
+        self.assertAlmostEqual(manager.appear_latency.total, 0.75 + 0.5 + 0.6)
+
+    def test_predictor_counts_each_appearance_once(self):
+        """Testa que um botão visível por vários ciclos é uma aparição só"""
+        from monitor import MonitoringManager
+        from scheduler import AppearancePredictor
+
+        manager = MonitoringManager()
+        manager.predictor = AppearancePredictor()
+        for t in (10.0, 10.5, 11.0, 11.5):
+            manager._observe_frame(t, True)
+        manager._observe_frame(12.0, False)
+        manager._observe_frame(40.0, True)
+        manager._observe_frame(40.5, True)
+        # Clique confirmado: o botão seguinte é uma nova aparição
+        manager._end_visibility()
+        manager._observe_frame(70.0, True)
+
+        self.assertEqual(list(manager.predictor.intervals), [30.0, 30.0])
+
+    def test_click_verification(self):
+        """Testa a contagem de cliques em que o botão continuou visível"""
+        from unittest.mock import Mock, patch
+
+        import monitor
+
+        manager = monitor.MonitoringManager()
+        manager.detector = Mock()
+        manager.detector.last_detection = {"score": 0.9, "profile": "blue"}
+        manager.detector.button_present.side_effect = [False, True]
+
+        with patch.object(monitor, "pyautogui") as mock_gui, patch.object(monitor.time, "sleep"):
+            mock_gui.position.return_value = (500, 500)
+            manager._handle_button_found((200, 100, 120, 40))
+            manager._handle_button_found((200, 100, 120, 40))
+
+        manager.detector.button_present.assert_called_with((140, 80, 120, 40), "blue")
+        stats = manager._click_statistics()
+        self.assertEqual(stats["click_verifications"], 2)
+        self.assertEqual(stats["click_verification_failures"], 1)
+        self.assertEqual(stats["click_confirmation_rate"], 50.0)
+
+        manager.detector = None
+        text = manager.get_metrics_text()
+        self.assertIn("continuador_click_verification_failures_total 1.0", text)
+        self.assertIn('continuador_appear_to_click_seconds_bucket{le="+Inf"} 0', text)
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Testes para o cache de templates de botões"""
+
+    def setUp(self):
+        from unittest.mock import patch
+
+        import cv2 as real_cv2
+
+        import detector
+        import templates
+
+        # Em CI o cv2 dos módulos é um MagicMock; o matching precisa do real
+        for module in (detector, templates):
+            patcher = patch.object(module, "cv2", real_cv2)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _frame(x, y, color=(230, 130, 40)):
+        """Frame 400x300 com um botão 80x30 com "texto" branco em (x, y)"""
+        frame = np.full((300, 400, 3), 235, dtype=np.uint8)
+        frame[y : y + 30, x : x + 80] = color
+        frame[y + 10 : y + 20, x + 15 : x + 65 : 10] = 255
+        return frame
+
+    def test_hit_moves_template_only_on_confirm(self):
+        """Testa o match deslocado e a atualização da posição após a confirmação"""
+        from templates import TemplateCache
+
+        cache = TemplateCache(max_resolutions=2, max_templates=2, scales=(1.0,))
+        cache.add((400, 300), self._frame(100, 100), {"bounds": (100, 100, 80, 30)})
+        self.assertEqual(len(cache), 1)
+
+        template, candidate = cache.match((400, 300), self._frame(106, 103))
+        self.assertEqual(candidate["bounds"], (106, 103, 80, 30))
+        self.assertEqual(candidate["center"], (146, 118))
+        self.assertGreater(candidate["match_score"], 0.99)
+        # Sem confirmação o template fica onde estava
+        self.assertEqual(template.bounds, (100, 100, 80, 30))
+
+        cache.confirm(template, candidate["bounds"])
+        self.assertEqual(template.bounds, (106, 103, 80, 30))
+        self.assertEqual(template.hits, 1)
+
+        # Botão fora da janela de busca, ou outra resolução: sem match
+        self.assertIsNone(cache.match((400, 300), self._frame(250, 200)))
+        self.assertIsNone(cache.match((800, 600), self._frame(106, 103)))
+
+    def test_rejected_match_keeps_template(self):
+        """Testa que um match com a cor errada é rejeitado sem mover o template"""
+        import detector as detector_module
+        from templates import TemplateCache
+
+        detector = detector_module.BlueButtonDetector()
+        detector.template_cache = TemplateCache(scales=(1.0,))
+        config = detector.get_adapted_config()
+        config["resolution"] = (400, 300)
+        profile = config["profiles"][0]["name"]
+
+        frame = self._frame(100, 100)
+        detector.template_cache.add(
+            (400, 300), frame, {"bounds": (100, 100, 80, 30), "profile": profile, "score": 0.9}
+        )
+
+        # Mesma aparência em cinza: casa no matching, falha na cor do perfil
+        cv2 = detector_module.cv2
+        gray = cv2.cvtColor(self._frame(106, 103), cv2.COLOR_BGR2GRAY)
+        grey_frame = np.dstack([gray] * 3)
+        self.assertIsNone(detector._match_templates(grey_frame, config, None))
+        template = detector.template_cache.get((400, 300))[0]
+        self.assertEqual(template.bounds, (100, 100, 80, 30))
+        self.assertEqual((detector.template_hits, detector.template_misses), (0, 1))
+
+        candidates = detector._match_templates(self._frame(106, 103), config, None)
+        self.assertEqual(candidates[0]["bounds"], (106, 103, 80, 30))
+        self.assertEqual(template.bounds, (106, 103, 80, 30))
+        self.assertEqual(detector.template_hits, 1)
+
+    def test_lru_eviction_by_resolution(self):
+        """Testa o descarte da resolução usada há mais tempo"""
+        from templates import TemplateCache
+
+        cache = TemplateCache(max_resolutions=2, max_templates=2, scales=(1.0,))
+        frame = self._frame(100, 100)
+        cache.add((400, 300), frame, {"bounds": (100, 100, 80, 30)})
+        cache.add((800, 600), frame, {"bounds": (100, 100, 80, 30)})
+        cache.get((400, 300))
+        cache.add((1024, 768), frame, {"bounds": (100, 100, 80, 30)})
+
+        self.assertEqual(len(cache.get((400, 300))), 1)
+        self.assertEqual(cache.get((800, 600)), [])
+        self.assertEqual(len(cache.get((1024, 768))), 1)
+
+        # Mesma posição substitui; posições novas respeitam o limite por resolução
+        cache.add((400, 300), frame, {"bounds": (102, 100, 80, 30)})
+        self.assertEqual(len(cache.get((400, 300))), 1)
+        cache.add((400, 300), self._frame(200, 200), {"bounds": (200, 200, 80, 30)})
+        cache.add((400, 300), self._frame(10, 10), {"bounds": (10, 10, 80, 30)})
+        self.assertEqual([t.bounds[0] for t in cache.get((400, 300))], [10, 200])
+
+        # Recorte uniforme (sem texto ou borda) não vira template
+        cache.add((400, 300), frame, {"bounds": (300, 250, 80, 30)})
+        self.assertEqual(len(cache.get((400, 300))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()